@@ -0,0 +1,135 @@
+import datetime
+from array import array
+from collections.abc import Iterable, Sequence
+from Dish import Dish
+from DishBase import DishBase
+
+# Общие объекты времени для всех блюд: индекс — количество минут
+# (заполняется при создании первого хранилища, чтобы не замедлять импорт)
+_TIMES = []
+
+class ColumnarDishStore(Sequence):
+    """
+    Компактное хранилище блюд по столбцам
+
+    Названия хранятся в таблице уникальных строк, а для каждого блюда
+    держатся только номер названия, цена (float64) и время приготовления
+    в минутах (uint16). Объекты Dish создаются при обращении к строке.
+    Секунды времени приготовления не сохраняются: формат меню их не содержит.
+    """
+
+    def __init__(self, dishes: Iterable[DishBase] = ()):
+        """
+        Инициализация хранилища
+
+        Args:
+            dishes (Iterable[DishBase]): Начальные блюда
+        """
+        if not _TIMES:
+            _TIMES.extend(datetime.time(minutes // 60, minutes % 60) for minutes in range(24 * 60))
+        self._names = []
+        self._name_ids = {}
+        self._name_refs = array('I')
+        self._prices = array('d')
+        self._minutes = array('H')
+        self.extend(dishes)
+
+    @classmethod
+    def from_columns(cls, names: list[str], name_refs: array, prices: array, minutes: array) -> "ColumnarDishStore":
+        """
+        Создание хранилища из готовых столбцов без копирования
+
+        Args:
+            names (list[str]): Таблица уникальных названий
+            name_refs (array): Номера названий блюд (uint32)
+            prices (array): Цены блюд (float64)
+            minutes (array): Время приготовления в минутах (uint16)
+
+        Returns:
+            ColumnarDishStore: Хранилище
+        """
+        store = cls()
+        store._names = names
+        store._name_ids = {name: name_id for name_id, name in enumerate(names)}
+        store._name_refs = name_refs
+        store._prices = prices
+        store._minutes = minutes
+        return store
+
+    def __reduce__(self):
+        """Передача между процессами только столбцами"""
+        return self.from_columns, self.columns()
+
+    def columns(self) -> tuple[list[str], array, array, array]:
+        """
+        Получение столбцов хранилища без копирования
+
+        Returns:
+            tuple[list[str], array, array, array]: Названия, номера названий, цены, минуты
+        """
+        return self._names, self._name_refs, self._prices, self._minutes
+
+    def __len__(self) -> int:
+        """Получение количества блюд"""
+        return len(self._prices)
+
+    def __getitem__(self, index):
+        """Создание блюда (или списка блюд для среза) из столбцов"""
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return Dish(self._names[self._name_refs[index]], self._prices[index], _TIMES[self._minutes[index]])
+
+    def __delitem__(self, index: int) -> None:
+        """Удаление блюда по индексу"""
+        del self._name_refs[index]
+        del self._prices[index]
+        del self._minutes[index]
+
+    def compact(self, keep: Sequence[int]) -> None:
+        """
+        Оставить только блюда с указанными индексами
+
+        Args:
+            keep (Sequence[int]): Индексы сохраняемых блюд по возрастанию
+        """
+        self._name_refs = array('I', map(self._name_refs.__getitem__, keep))
+        self._prices = array('d', map(self._prices.__getitem__, keep))
+        self._minutes = array('H', map(self._minutes.__getitem__, keep))
+
+    def append_row(self, name: str, price: float, prep_time: datetime.time) -> None:
+        """
+        Добавление блюда по значениям полей без создания объекта Dish
+
+        Args:
+            name (str): Название блюда
+            price (float): Цена блюда
+            prep_time (datetime.time): Время приготовления
+        """
+        name_id = self._name_ids.get(name)
+        if name_id is None:
+            name_id = self._name_ids[name] = len(self._names)
+            self._names.append(name)
+        self._name_refs.append(name_id)
+        self._prices.append(price)
+        self._minutes.append(prep_time.hour * 60 + prep_time.minute)
+
+    def append(self, dish: DishBase) -> None:
+        """Добавление блюда"""
+        self.append_row(dish.name, dish.price, dish.prep_time)
+
+    def extend(self, dishes: Iterable[DishBase]) -> None:
+        """Добавление нескольких блюд (другое ColumnarDishStore добавляется по столбцам)"""
+        if isinstance(dishes, ColumnarDishStore):
+            name_ids = []
+            for name in dishes._names:
+                name_id = self._name_ids.get(name)
+                if name_id is None:
+                    name_id = self._name_ids[name] = len(self._names)
+                    self._names.append(name)
+                name_ids.append(name_id)
+            self._name_refs.extend(array('I', map(name_ids.__getitem__, dishes._name_refs)))
+            self._prices.extend(dishes._prices)
+            self._minutes.extend(dishes._minutes)
+            return
+        for dish in dishes:
+            self.append_row(dish.name, dish.price, dish.prep_time)
@@ -4,6 +4,8 @@ from DishBase import DishBase
 class Dish(DishBase):
     """Класс для представления блюда в меню"""
     
+    __slots__ = ()
+    
     def __init__(self, name: str, price: float, prep_time: time):
         """
         Инициализация блюда
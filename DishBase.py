@@ -3,6 +3,9 @@ from datetime import time
 class DishBase:
     """Базовый класс для блюд в меню"""
     
+    # Без __dict__ у каждого экземпляра: в больших меню это основная часть памяти блюда
+    __slots__ = ("__name", "__price", "__prep_time")
+    
     def __init__(self, name: str, price: float, prep_time: time):
         """
         Инициализация блюда
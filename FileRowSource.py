@@ -0,0 +1,38 @@
+from collections.abc import Sequence
+from DishBase import DishBase
+from MappedDishStore import MappedDishStore
+from MenuParser import FastMenuParser, MenuParser, ParseErrorHandler
+from MenuRowSource import MenuRowSource
+
+class FileRowSource(MenuRowSource):
+    """
+    Источник строк из текстового файла меню без загрузки в память
+
+    Индекс смещений строк (MappedDishStore с lazy=True) дополняется
+    блоками по мере прокрутки, блюда разбираются только для запрошенных
+    страниц. Строки с ошибками пропускаются и передаются в on_error.
+    """
+
+    def __init__(self, filename: str, parser: MenuParser|None = None, on_error: ParseErrorHandler|None = None):
+        """
+        Открытие файла без построения индекса
+
+        Args:
+            filename (str): Путь к файлу меню
+            parser (MenuParser|None): Парсер строк (по умолчанию FastMenuParser)
+            on_error (ParseErrorHandler|None): Обработчик строк с ошибками (по умолчанию они пропускаются молча)
+        """
+        self.store = MappedDishStore(filename, parser or FastMenuParser(),
+                                     on_error or (lambda line_number, line, error: None), lazy=True)
+
+    def count_more(self, known: int, limit: int) -> int:
+        """Количество строк файла после первых known (индекс дополняется по необходимости)"""
+        return max(0, min(self.store.index_more(known + limit) - known, limit))
+
+    def rows(self, start: int, count: int) -> Sequence[DishBase]:
+        """Блюда строк файла start..start + count - 1"""
+        return self.store[start:start + count]
+
+    def close(self) -> None:
+        """Закрытие файла"""
+        self.store.close()
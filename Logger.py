@@ -0,0 +1,249 @@
+import atexit
+import datetime
+import os.path
+import queue
+import re
+import sys
+import threading
+import time
+from MenuMetrics import MenuMetrics
+
+# Логгер записывает сообщения пакетами по количеству или по времени (в секундах)
+LOG_FLUSH_COUNT = 1000
+LOG_FLUSH_INTERVAL = 1.0
+# Сколько секунд flush и close ждут фоновый поток записи
+LOG_WAIT_TIMEOUT = 10.0
+# Ротация логов: размер файла (в байтах), число копий и срок хранения (в днях)
+LOG_MAX_BYTES = 10 << 20
+LOG_BACKUP_COUNT = 5
+LOG_RETENTION_DAYS = 30
+
+class Logger:
+    """
+    Класс для управления логированием ошибок
+    
+    Сообщения складываются в очередь и записываются фоновым потоком
+    пакетами: по накоплении LOG_FLUSH_COUNT сообщений или раз в
+    LOG_FLUSH_INTERVAL секунд. При завершении программы очередь
+    гарантированно сбрасывается на диск. Ошибка записи пакета (например,
+    удалённая папка логов) выводится в stderr, а поток продолжает работу:
+    папка создаётся заново при записи следующего пакета.
+    
+    По умолчанию сообщения пишутся в файл текущего дня (ДД-ММ-ГГГГ.log).
+    Файл, превысивший max_bytes, переименовывается в <имя>.1 (предыдущие
+    копии сдвигаются, хранится не больше backup_count). Лог-файлы прошлых
+    дней старше retention_days удаляются, а при compress=True прошлые дни
+    и переименованные копии сжимаются gzip.
+    
+    Если задан metrics (MenuMetrics), учитываются число сообщений
+    (logger.messages), время записи пакетов (logger.write), их объём и
+    число неудачных записей (logger.errors).
+    """
+    
+    DATED_LOG = re.compile(r"(\d\d-\d\d-\d{4})\.log(\.\d+)?(\.gz)?")
+    
+    def __init__(self, log_dir: str = 'logs', flush_count: int = LOG_FLUSH_COUNT,
+                 flush_interval: float = LOG_FLUSH_INTERVAL, max_bytes: int = LOG_MAX_BYTES,
+                 backup_count: int = LOG_BACKUP_COUNT, retention_days: int = LOG_RETENTION_DAYS,
+                 compress: bool = False, metrics: MenuMetrics|None = None):
+        """
+        Инициализация папки для логов
+        
+        Args:
+            log_dir (str): Папка для лог-файлов
+            flush_count (int): Количество накопленных сообщений, после которого они записываются
+            flush_interval (float): Максимальная задержка записи сообщения (в секундах)
+            max_bytes (int): Размер файла, после которого он переименовывается (0 — без ограничения)
+            backup_count (int): Сколько переименованных копий одного файла хранить
+            retention_days (int): Сколько дней хранить лог-файлы по датам (0 — без ограничения)
+            compress (bool): Сжимать gzip переименованные копии и файлы прошлых дней
+            metrics (MenuMetrics|None): Сбор метрик (None — без замеров)
+        """
+        self.log_dir = log_dir
+        self.flush_count = flush_count
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.retention_days = retention_days
+        self.compress = compress
+        self.metrics = metrics
+        self._current_day = None
+        if not os.path.exists(log_dir):
+            os.makedirs(log_dir)
+        self._queue = queue.SimpleQueue()
+        self._writer = None
+        self._writer_lock = threading.Lock()
+        
+    def log_message(self, level: str, message: str, filename: str|None = None) -> None:
+        """
+        Запись сообщения в лог-файл
+        
+        Args:
+            level (str): Уровень лога (ОШИБКА, ПРЕДУПРЕЖДЕНИЕ...)
+            message (str): Сообщение для записи
+            filename (str|None): Имя лог-файла (по умолчанию текущая дата на момент вызова)
+        """
+        if self._writer is None:
+            self._start_writer()
+        if self.metrics is not None:
+            self.metrics.count("logger.messages")
+        now = datetime.datetime.now()
+        if filename is None:
+            filename = f"{now.strftime('%d-%m-%Y')}.log"
+        self._queue.put((filename, f"{now.strftime('%d-%m-%Y %H:%M:%S')} {level} {message}\n"))
+    
+    def flush(self, timeout: float = LOG_WAIT_TIMEOUT) -> bool:
+        """
+        Ожидание записи всех ранее переданных сообщений
+        
+        Args:
+            timeout (float): Наибольшее время ожидания в секундах
+        
+        Returns:
+            bool: Сообщения обработаны (False — истекло время или поток записи остановлен)
+        """
+        writer = self._writer
+        if writer is None:
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        deadline = time.monotonic() + timeout
+        while not done.wait(min(0.1, max(0.0, deadline - time.monotonic()))):
+            if not writer.is_alive() or time.monotonic() >= deadline:
+                return False
+        return True
+    
+    def close(self, timeout: float = LOG_WAIT_TIMEOUT) -> None:
+        """
+        Запись оставшихся сообщений и остановка фонового потока
+        
+        Args:
+            timeout (float): Наибольшее время ожидания потока в секундах
+        """
+        with self._writer_lock:
+            writer, self._writer = self._writer, None
+        if writer is not None:
+            self._queue.put(None)
+            writer.join(timeout)
+    
+    def _start_writer(self) -> None:
+        """Запуск фонового потока записи при первом сообщении"""
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write_loop, name="Logger", daemon=True)
+                self._writer.start()
+                atexit.register(self.close)
+    
+    def _write_loop(self) -> None:
+        """Фоновая запись сообщений пакетами"""
+        try:
+            self._remove_expired()
+        except OSError as e:
+            self._report_error(e)
+        pending = {}
+        pending_count = 0
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                # Истёк интервал сброса: записываем накопленное
+                item = ()
+            
+            if isinstance(item, tuple) and item:
+                filename, line = item
+                pending.setdefault(filename, []).append(line)
+                pending_count += 1
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+                if pending_count < self.flush_count:
+                    continue
+            
+            try:
+                self._write_pending(pending)
+            except Exception as e:
+                # Пакет теряется, но поток продолжает работать и отвечать на flush
+                self._report_error(e)
+            pending.clear()
+            pending_count = 0
+            deadline = None
+            if item is None:
+                return
+            if isinstance(item, threading.Event):
+                item.set()
+    
+    def _report_error(self, error: Exception) -> None:
+        """Вывод ошибки записи лога в stderr"""
+        if self.metrics is not None:
+            self.metrics.count("logger.errors")
+        print(f"Не удалось записать лог в {self.log_dir}: {error}", file=sys.stderr)
+    
+    def _write_pending(self, pending: dict[str, list[str]]) -> None:
+        """Запись накопленных сообщений: один вызов open на файл"""
+        if not pending:
+            return
+        start = time.perf_counter()
+        # Папку могли удалить, пока программа работает
+        os.makedirs(self.log_dir, exist_ok=True)
+        today = datetime.date.today()
+        if today != self._current_day:
+            if self._current_day is not None:
+                self._remove_expired()
+            self._current_day = today
+        
+        for filename, lines in pending.items():
+            path = os.path.join(self.log_dir, filename)
+            data = "".join(lines).encode('utf-8')
+            if self.max_bytes and os.path.exists(path) and os.path.getsize(path) + len(data) > self.max_bytes:
+                self._rotate(path)
+            with open(path, "ab") as file:
+                file.write(data)
+            if self.metrics is not None:
+                self.metrics.count("logger.bytes", len(data))
+        if self.metrics is not None:
+            self.metrics.add_time("logger.write", time.perf_counter() - start)
+    
+    def _rotate(self, path: str) -> None:
+        """Переименование заполненного файла в <имя>.1 со сдвигом прежних копий"""
+        suffix = ".gz" if self.compress else ""
+        for number in range(self.backup_count, 0, -1):
+            source = f"{path}.{number}{suffix}"
+            if not os.path.exists(source):
+                continue
+            if number == self.backup_count:
+                os.remove(source)
+            else:
+                os.replace(source, f"{path}.{number + 1}{suffix}")
+        if self.backup_count == 0:
+            os.remove(path)
+        elif self.compress:
+            self._compress(path, f"{path}.1.gz")
+        else:
+            os.replace(path, f"{path}.1")
+    
+    def _compress(self, source: str, target: str) -> None:
+        """Сжатие файла gzip с удалением исходного"""
+        # gzip и shutil нужны только при compress=True и не замедляют импорт
+        import gzip
+        import shutil
+        with open(source, "rb") as src, gzip.open(target, "wb") as dst:
+            shutil.copyfileobj(src, dst)
+        os.remove(source)
+    
+    def _remove_expired(self) -> None:
+        """Удаление устаревших лог-файлов по датам и сжатие файлов прошлых дней"""
+        today = datetime.date.today()
+        for filename in os.listdir(self.log_dir):
+            match = self.DATED_LOG.fullmatch(filename)
+            if match is None:
+                continue
+            try:
+                day = datetime.datetime.strptime(match.group(1), '%d-%m-%Y').date()
+            except ValueError:
+                continue
+            path = os.path.join(self.log_dir, filename)
+            if self.retention_days and (today - day).days > self.retention_days:
+                os.remove(path)
+            elif self.compress and day < today and match.group(3) is None:
+                self._compress(path, f"{path}.gz")
@@ -0,0 +1,30 @@
+from collections.abc import Sequence
+from DishBase import DishBase
+from MenuManager import MenuManager
+from MenuRowSource import MenuRowSource
+
+class ManagerRowSource(MenuRowSource):
+    """
+    Источник строк из меню в памяти (MenuManager)
+
+    Изменения меню модель не отслеживает: после них её источник
+    подключается заново (MenuPagedTableModel.set_source). Для
+    редактируемой таблицы используется MenuTableModel.
+    """
+
+    def __init__(self, menu_manager: MenuManager):
+        """
+        Инициализация источника
+
+        Args:
+            menu_manager (MenuManager): Менеджер меню
+        """
+        self.menu_manager = menu_manager
+
+    def count_more(self, known: int, limit: int) -> int:
+        """Количество блюд меню после первых known (не больше limit)"""
+        return max(0, min(len(self.menu_manager) - known, limit))
+
+    def rows(self, start: int, count: int) -> Sequence[DishBase]:
+        """Блюда меню start..start + count - 1 без копирования остального меню"""
+        return self.menu_manager.view()[start:start + count]
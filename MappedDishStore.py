@@ -0,0 +1,177 @@
+import mmap
+import os
+from array import array
+from collections.abc import Callable, Iterable, Sequence
+from itertools import accumulate
+from DishBase import DishBase
+from MenuIndex import MenuIndex
+from MenuParser import MenuParser, ParseErrorHandler
+
+# Примерный объём (в байтах) одного блока при построении индекса строк
+INDEX_CHUNK_SIZE = 1 << 20
+# То же при дополнении индекса по запросу: меньше блок — быстрее первая страница
+LAZY_INDEX_CHUNK_SIZE = 64 << 10
+
+class MappedDishStore(Sequence):
+    """
+    Хранилище блюд поверх отображённого в память файла меню
+
+    При открытии строится только индекс смещений корректных строк,
+    объекты блюд создаются при обращении к конкретной строке.
+    Добавленные после открытия блюда хранятся в обычном списке.
+
+    С lazy=True индекс при открытии не строится, а дополняется блоками
+    по запросу (index_more); len() тогда — число уже найденных строк.
+
+    Сортировка и поиск MenuIndex (sorted_slots, search_slots) проходят по
+    строкам файла, создавая блюда по одному: в памяти остаются только
+    номера слотов и значения одного поля, а не индекс всего меню.
+    """
+
+    def __init__(self, filename: str, parser: MenuParser, on_error: ParseErrorHandler,
+                 progress: Callable[[int, int], None]|None = None,
+                 is_cancelled: Callable[[], bool]|None = None, lazy: bool = False):
+        """
+        Открытие файла и построение индекса строк
+
+        Args:
+            filename (str): Путь к файлу меню
+            parser (MenuParser): Парсер строк меню
+            on_error (ParseErrorHandler): Обработчик строк с ошибками
+            progress (Callable[[int, int], None]|None): Вызывается с числом просмотренных байт и размером файла
+            is_cancelled (Callable[[], bool]|None): Возвращает True, если построение индекса нужно прервать
+            lazy (bool): Не строить индекс при открытии (см. index_more)
+        """
+        self.filename = filename
+        self._parser = parser
+        self._offsets = array('q')
+        self._added = []
+        self._file = open(filename, 'rb')
+        size = os.fstat(self._file.fileno()).st_size
+        # Пустой файл отобразить в память нельзя
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        self._on_error = on_error
+        # Докуда файл уже просмотрен при построении индекса
+        self._indexed_bytes = 0
+        self._indexed_lines = 0
+        self.fully_indexed = False
+        if not lazy:
+            self._build_index(progress, is_cancelled)
+
+    def _build_index(self, progress: Callable[[int, int], None]|None,
+                     is_cancelled: Callable[[], bool]|None) -> None:
+        """Однократный проход по файлу с запоминанием смещений корректных строк"""
+        while not self.fully_indexed:
+            if is_cancelled is not None and is_cancelled():
+                return
+            self._index_chunk(INDEX_CHUNK_SIZE)
+            if progress is not None:
+                progress(self._indexed_bytes, len(self._map))
+
+    def _index_chunk(self, size: int) -> None:
+        """Добавление в индекс корректных строк следующего блока файла (примерно size байт)"""
+        raw_lines = self._file.readlines(size)
+        if not raw_lines:
+            self.fully_indexed = True
+            return
+        starts = list(accumulate(map(len, raw_lines), initial=self._indexed_bytes))
+        valid = self._parser.check_chunk(raw_lines, self._indexed_lines + 1, self._on_error)
+        self._offsets.extend(map(starts.__getitem__, valid))
+        self._indexed_bytes = starts[-1]
+        self._indexed_lines += len(raw_lines)
+
+    def index_more(self, count: int) -> int:
+        """
+        Дополнение индекса, пока в нём меньше count строк файла или файл не просмотрен целиком
+
+        Args:
+            count (int): Сколько строк файла нужно найти
+
+        Returns:
+            int: Количество найденных строк файла
+        """
+        while len(self._offsets) < count and not self.fully_indexed:
+            self._index_chunk(LAZY_INDEX_CHUNK_SIZE)
+        return len(self._offsets)
+
+    def __len__(self) -> int:
+        """Получение количества блюд"""
+        return len(self._offsets) + len(self._added)
+
+    def __getitem__(self, index):
+        """Создание блюда (или списка блюд для среза) из строки файла"""
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("индекс блюда вне диапазона")
+        if index >= len(self._offsets):
+            return self._added[index - len(self._offsets)]
+        start = self._offsets[index]
+        end = self._map.find(b"\n", start)
+        if end < 0:
+            end = len(self._map)
+        return self._parser.parse_line(self._map[start:end].decode('utf-8').strip())
+
+    def __delitem__(self, index: int) -> None:
+        """Удаление блюда по индексу"""
+        if index < 0:
+            index += len(self)
+        if index >= len(self._offsets):
+            del self._added[index - len(self._offsets)]
+        else:
+            del self._offsets[index]
+
+    def compact(self, keep: Sequence[int]) -> None:
+        """
+        Оставить только блюда с указанными индексами
+
+        Args:
+            keep (Sequence[int]): Индексы сохраняемых блюд по возрастанию
+        """
+        mapped = len(self._offsets)
+        self._added = [self._added[index - mapped] for index in keep if index >= mapped]
+        self._offsets = array('q', (self._offsets[index] for index in keep if index < mapped))
+
+    def append(self, dish: DishBase) -> None:
+        """Добавление блюда"""
+        self._added.append(dish)
+
+    def extend(self, dishes: Iterable[DishBase]) -> None:
+        """Добавление нескольких блюд"""
+        self._added.extend(dishes)
+
+    def sorted_slots(self, field: str) -> array:
+        """
+        Слоты блюд по возрастанию поля, равные — по номеру слота (для MenuIndex.sorted_rows)
+
+        Args:
+            field (str): "name", "price" или "minutes"
+
+        Returns:
+            array: Номера слотов
+        """
+        values = [MenuIndex.field_value(dish, field) for dish in self]
+        return array('q', sorted(range(len(values)), key=values.__getitem__))
+
+    def search_slots(self, text: str, conditions: Sequence[tuple[str, str, float]], prefix: bool) -> list[int]:
+        """
+        Слоты блюд, подходящих под условия, одним проходом по файлу (для MenuIndex.search)
+
+        Args:
+            text (str): Подстрока (или префикс) названия
+            conditions (Sequence[tuple[str, str, float]]): Условия на цену и время
+            prefix (bool): Искать названия, начинающиеся с text
+
+        Returns:
+            list[int]: Номера слотов по возрастанию
+        """
+        matches = MenuIndex.dish_filter(text, conditions, prefix)
+        return [slot for slot, dish in enumerate(self) if matches(dish)]
+
+    def close(self) -> None:
+        """Закрытие отображения и файла"""
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+        self._file.close()
@@ -0,0 +1,123 @@
+import struct
+import sys
+import zlib
+from array import array
+from collections.abc import Iterable
+from typing import BinaryIO
+from ColumnarDishStore import ColumnarDishStore
+from DishBase import DishBase
+
+class MenuBinaryFormat:
+    """
+    Двоичный снимок меню
+
+    Формат (little-endian):
+        заголовок   MAGIC, версия (uint16), флаги (uint16), число блюд (uint64),
+                    число названий (uint64), размер таблицы названий в байтах (uint64)
+        названия    длины названий в байтах (uint32[]) и сами названия в UTF-8 подряд
+        столбцы     номера названий (uint32[]), цены (float64[]), время в минутах (uint16[])
+        CRC32       контрольная сумма всего после заголовка (uint32), если задан FLAG_CHECKSUM
+
+    Загрузка сводится к нескольким чтениям массивов целиком в ColumnarDishStore.
+    """
+
+    EXTENSION = ".menub"
+    MAGIC = b"MENUBIN\0"
+    VERSION = 1
+    FLAG_CHECKSUM = 1
+    HEADER = struct.Struct("<8sHHQQQ")
+
+    @classmethod
+    def write(cls, dishes: Iterable[DishBase], file: BinaryIO, checksum: bool = True) -> None:
+        """
+        Запись снимка меню
+
+        Args:
+            dishes (Iterable[DishBase]): Блюда (ColumnarDishStore записывается без преобразования)
+            file (BinaryIO): Файл, открытый на запись в двоичном режиме
+            checksum (bool): Добавить контрольную сумму CRC32
+        """
+        store = dishes if isinstance(dishes, ColumnarDishStore) else ColumnarDishStore(dishes)
+        names, name_refs, prices, minutes = store.columns()
+        encoded_names = [name.encode('utf-8') for name in names]
+        names_blob = b"".join(encoded_names)
+        name_sizes = array('I', map(len, encoded_names))
+
+        file.write(cls.HEADER.pack(cls.MAGIC, cls.VERSION, cls.FLAG_CHECKSUM if checksum else 0,
+                                   len(prices), len(names), len(names_blob)))
+        crc = 0
+        for block in (cls._to_bytes(name_sizes), names_blob, cls._to_bytes(name_refs),
+                      cls._to_bytes(prices), cls._to_bytes(minutes)):
+            file.write(block)
+            if checksum:
+                crc = zlib.crc32(block, crc)
+        if checksum:
+            file.write(struct.pack("<I", crc))
+
+    @classmethod
+    def read(cls, file: BinaryIO) -> ColumnarDishStore:
+        """
+        Чтение снимка меню
+
+        Args:
+            file (BinaryIO): Файл, открытый на чтение в двоичном режиме
+
+        Returns:
+            ColumnarDishStore: Блюда снимка
+
+        Raises:
+            ValueError: Файл не является снимком меню или повреждён
+        """
+        header = file.read(cls.HEADER.size)
+        if len(header) != cls.HEADER.size:
+            raise ValueError("Файл слишком короткий для снимка меню")
+        magic, version, flags, dish_count, name_count, names_size = cls.HEADER.unpack(header)
+        if magic != cls.MAGIC:
+            raise ValueError("Файл не является снимком меню")
+        if version != cls.VERSION:
+            raise ValueError(f"Неподдерживаемая версия снимка меню: {version}")
+
+        crc = 0
+        blocks = []
+        for typecode, count in (('I', name_count), (None, names_size), ('I', dish_count),
+                                ('d', dish_count), ('H', dish_count)):
+            size = count if typecode is None else count * array(typecode).itemsize
+            block = file.read(size)
+            if len(block) != size:
+                raise ValueError("Снимок меню обрезан")
+            if flags & cls.FLAG_CHECKSUM:
+                crc = zlib.crc32(block, crc)
+            blocks.append(block if typecode is None else cls._from_bytes(typecode, block))
+        if flags & cls.FLAG_CHECKSUM:
+            stored = file.read(4)
+            if len(stored) != 4 or struct.unpack("<I", stored)[0] != crc:
+                raise ValueError("Контрольная сумма снимка меню не совпадает")
+
+        name_sizes, names_blob, name_refs, prices, minutes = blocks
+        names = []
+        position = 0
+        for size in name_sizes:
+            names.append(names_blob[position:position + size].decode('utf-8'))
+            position += size
+        if position != names_size:
+            raise ValueError("Таблица названий снимка меню повреждена")
+        if dish_count and (max(name_refs) >= name_count or max(minutes) >= 24 * 60 or not min(prices) > 0):
+            raise ValueError("Столбцы снимка меню повреждены")
+        return ColumnarDishStore.from_columns(names, name_refs, prices, minutes)
+
+    @staticmethod
+    def _to_bytes(values: array) -> bytes:
+        """Массив в байтах little-endian"""
+        if sys.byteorder == "big":
+            values = array(values.typecode, values)
+            values.byteswap()
+        return values.tobytes()
+
+    @staticmethod
+    def _from_bytes(typecode: str, data: bytes) -> array:
+        """Массив из байтов little-endian"""
+        values = array(typecode)
+        values.frombytes(data)
+        if sys.byteorder == "big":
+            values.byteswap()
+        return values
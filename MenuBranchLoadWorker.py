@@ -0,0 +1,64 @@
+from collections.abc import Sequence
+from PyQt6.QtCore import QObject, pyqtSignal
+from MenuFileHandler import MenuFileHandler
+from MenuWriteQueue import MenuWriteQueue
+
+class MenuBranchLoadWorker(QObject):
+    """
+    Фоновая параллельная загрузка меню филиалов (выполняется в отдельном QThread)
+    
+    Объединённое меню ставится в очередь изменений меню (MenuWriteQueue).
+    """
+    
+    progress_changed = pyqtSignal(int)
+    finished = pyqtSignal(bool)
+    failed = pyqtSignal(str)
+    
+    def __init__(self, file_handler: MenuFileHandler, write_queue: MenuWriteQueue, filenames: Sequence[str],
+                 conflict: str = "keep_all"):
+        """
+        Инициализация загрузчика
+        
+        Args:
+            file_handler (MenuFileHandler): Обработчик файлов меню
+            write_queue (MenuWriteQueue): Очередь изменений меню, которое заменяется объединённым
+            filenames (Sequence[str]): Пути к файлам филиалов
+            conflict (str): Правило для одинаковых названий (см. MenuFileHandler.load_many)
+        """
+        super().__init__()
+        self.file_handler = file_handler
+        self.write_queue = write_queue
+        self.filenames = list(filenames)
+        self.conflict = conflict
+        self._cancelled = False
+    
+    def cancel(self) -> None:
+        """Запрос на отмену загрузки"""
+        self._cancelled = True
+    
+    def is_cancelled(self) -> bool:
+        """Проверка, была ли запрошена отмена"""
+        return self._cancelled
+    
+    def run(self) -> None:
+        """Загрузка файлов и постановка объединённого меню в очередь изменений"""
+        try:
+            store, failed = self.file_handler.load_many(
+                self.filenames, self.conflict, progress=self._report_progress, is_cancelled=self.is_cancelled
+            )
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        if self._cancelled:
+            # После отмены объединено только часть файлов: прежнее меню не заменяется
+            self.finished.emit(True)
+            return
+        self.write_queue.submit(lambda menu_manager: menu_manager.use_storage(store))
+        if failed:
+            self.failed.emit(f"не прочитаны файлы: {', '.join(failed)}")
+            return
+        self.finished.emit(self._cancelled)
+    
+    def _report_progress(self, done: int, total: int) -> None:
+        """Пересчёт прогресса в проценты"""
+        self.progress_changed.emit(100 if total == 0 else done * 100 // total)
@@ -0,0 +1,353 @@
+import datetime
+import sqlite3
+from array import array
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from itertools import islice
+from Dish import Dish
+from DishBase import DishBase
+from MenuIndex import MenuIndex
+
+# Количество блюд в одном executemany при записи в базу
+DB_BATCH_SIZE = 50_000
+# Версия схемы базы (PRAGMA user_version)
+DATABASE_VERSION = 1
+
+class MenuDatabase:
+    """
+    Меню в локальной базе SQLite
+
+    Блюда лежат в таблице dishes: id (INTEGER PRIMARY KEY, порядок меню),
+    name, name_key (ключ названия MenuIndex.name_key), price, minutes
+    (время приготовления в минутах) и removed (блюдо удалено, строка ждёт
+    уплотнения). По name_key, price и minutes построены индексы, поэтому
+    поиск по префиксу названия и диапазонам цены и времени не просматривает
+    всю таблицу. Страницы читаются по ключу (id > последнего прочитанного),
+    а не через OFFSET, поэтому чтение любой страницы не зависит от её номера.
+
+    Запись идёт пакетами executemany внутри одной транзакции. База
+    открывается в режиме WAL: её можно читать (например, SqliteRowSource),
+    пока MenuManager в неё пишет. Соединение разрешено использовать из
+    разных потоков, но не одновременно (это обеспечивает блокировка MenuManager).
+    """
+
+    COLUMNS = ("CREATE TABLE {table} (id INTEGER PRIMARY KEY, name TEXT NOT NULL, name_key TEXT NOT NULL, "
+               "price REAL NOT NULL, minutes INTEGER NOT NULL, removed INTEGER NOT NULL DEFAULT 0)")
+    INDEXES = {
+        "dishes_name_key": "dishes (name_key)",
+        "dishes_price": "dishes (price)",
+        "dishes_minutes": "dishes (minutes)",
+        # Частичный индекс: проверка, есть ли удалённые строки, не просматривает таблицу
+        "dishes_removed": "dishes (id) WHERE removed = 1",
+    }
+    # Столбцы полей сортировки и условий поиска MenuIndex
+    FIELD_COLUMNS = {"name": "name_key", "price": "price", "minutes": "minutes"}
+    INSERT = "INSERT INTO dishes (name, name_key, price, minutes) VALUES (?, ?, ?, ?)"
+
+    def __init__(self, path: str, read_only: bool = False):
+        """
+        Открытие (или создание) базы
+
+        Args:
+            path (str): Путь к файлу базы
+            read_only (bool): Открыть только для чтения (просмотр): файл не создаётся и не изменяется
+
+        Raises:
+            ValueError: Файл — база другой версии или не база меню
+        """
+        self.path = path
+        if read_only:
+            # Режим ro на уровне SQLite: даже режим журнала и схема базы не меняются
+            from pathlib import Path
+            try:
+                self.connection = sqlite3.connect(f"{Path(path).absolute().as_uri()}?mode=ro", uri=True,
+                                                  check_same_thread=False)
+            except sqlite3.Error as e:
+                raise ValueError(f"Не удалось открыть базу меню {path}: {e}") from e
+        else:
+            self.connection = sqlite3.connect(path, check_same_thread=False)
+        try:
+            if not read_only:
+                self.connection.execute("PRAGMA journal_mode = WAL")
+                # В режиме WAL NORMAL не портит базу при сбое, теряются лишь последние транзакции
+                self.connection.execute("PRAGMA synchronous = NORMAL")
+            version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+            has_table = self.connection.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'dishes'").fetchone() is not None
+            if not has_table:
+                if read_only:
+                    raise ValueError("в файле нет таблицы блюд")
+                with self._transaction():
+                    self.connection.execute(self.COLUMNS.format(table="dishes"))
+                    self._create_indexes()
+                    self.connection.execute(f"PRAGMA user_version = {DATABASE_VERSION}")
+            elif version != DATABASE_VERSION:
+                raise ValueError(f"Неподдерживаемая версия базы меню: {version}")
+        except (sqlite3.DatabaseError, ValueError) as e:
+            self.connection.close()
+            raise ValueError(f"Не удалось открыть базу меню {path}: {e}") from e
+
+    @staticmethod
+    def _row(dish: DishBase) -> tuple[str, str, float, int]:
+        """Значения столбцов строки блюда для INSERT"""
+        return dish.name, MenuIndex.name_key(dish.name), dish.price, dish.prep_time.hour * 60 + dish.prep_time.minute
+
+    @staticmethod
+    def _dishes(rows: Iterable[tuple[str, float, int]]) -> list[DishBase]:
+        """Блюда из строк (name, price, minutes)"""
+        return [Dish(name, price, datetime.time(minutes // 60, minutes % 60)) for name, price, minutes in rows]
+
+    @contextmanager
+    def _transaction(self) -> Iterator[None]:
+        """Явная транзакция: вместе с изменениями данных откатываются и изменения схемы"""
+        with self.connection:
+            if not self.connection.in_transaction:
+                self.connection.execute("BEGIN")
+            yield
+
+    def _create_indexes(self) -> None:
+        """Создание индексов таблицы блюд (если их нет)"""
+        for name, definition in self.INDEXES.items():
+            self.connection.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {definition}")
+
+    def _insert_batches(self, dishes: Iterable[DishBase]) -> int:
+        """Вставка блюд пакетами по DB_BATCH_SIZE в текущей транзакции"""
+        rows = map(self._row, dishes)
+        count = 0
+        while batch := list(islice(rows, DB_BATCH_SIZE)):
+            self.connection.executemany(self.INSERT, batch)
+            count += len(batch)
+        return count
+
+    def insert_many(self, dishes: Iterable[DishBase]) -> int:
+        """
+        Добавление блюд в конец меню одной транзакцией
+
+        Если таблица пуста, индексы на время вставки удаляются и строятся
+        заново в конце: так загрузка миллионов блюд в несколько раз быстрее.
+
+        Args:
+            dishes (Iterable[DishBase]): Блюда
+
+        Returns:
+            int: Количество добавленных блюд
+        """
+        with self._transaction():
+            if self.connection.execute("SELECT 1 FROM dishes LIMIT 1").fetchone() is not None:
+                return self._insert_batches(dishes)
+            for name in self.INDEXES:
+                self.connection.execute(f"DROP INDEX IF EXISTS {name}")
+            count = self._insert_batches(dishes)
+            self._create_indexes()
+            return count
+
+    def import_text(self, file_handler, filename: str) -> int:
+        """
+        Добавление блюд из текстового файла меню одной транзакцией, без загрузки файла в память целиком
+
+        Args:
+            file_handler (MenuFileHandler): Обработчик файлов (разбор строк и лог ошибок)
+            filename (str): Путь к файлу
+
+        Returns:
+            int: Количество добавленных блюд
+        """
+        return self.insert_many(dish for batch in file_handler.iter_menu_batches(filename) for dish in batch)
+
+    def export_text(self, file_handler, filename: str) -> None:
+        """
+        Сохранение блюд базы в текстовый файл меню (или снимок, по расширению)
+
+        Args:
+            file_handler (MenuFileHandler): Обработчик файлов
+            filename (str): Путь к файлу
+        """
+        file_handler.save_menu(self.iter_dishes(), filename)
+
+    def max_id(self) -> int:
+        """Наибольший идентификатор блюда (0 — база пуста)"""
+        return self.connection.execute("SELECT coalesce(max(id), 0) FROM dishes").fetchone()[0]
+
+    def count(self) -> int:
+        """Количество оставшихся (не удалённых) блюд"""
+        return self.connection.execute("SELECT count(*) FROM dishes WHERE removed = 0").fetchone()[0]
+
+    def iter_dishes(self) -> Iterator[DishBase]:
+        """
+        Оставшиеся блюда по порядку меню (читаются курсором пакетами)
+
+        Yields:
+            DishBase: Блюдо
+        """
+        cursor = self.connection.execute("SELECT name, price, minutes FROM dishes WHERE removed = 0 ORDER BY id")
+        while rows := cursor.fetchmany(DB_BATCH_SIZE):
+            yield from self._dishes(rows)
+
+    def rows_from(self, first_id: int, count: int) -> list[DishBase]:
+        """
+        Блюда с идентификаторами от first_id по порядку, включая удалённые (страницы SqliteDishStore)
+
+        Args:
+            first_id (int): Идентификатор первого блюда
+            count (int): Количество блюд
+
+        Returns:
+            list[DishBase]: Блюда
+        """
+        return self._dishes(self.connection.execute(
+            "SELECT name, price, minutes FROM dishes WHERE id >= ? ORDER BY id LIMIT ?", (first_id, count)))
+
+    def count_after(self, after_id: int, limit: int) -> tuple[int, int]:
+        """
+        Количество оставшихся блюд после блюда after_id (по порядку меню)
+
+        Args:
+            after_id (int): Идентификатор последнего известного блюда (0 — с начала)
+            limit (int): Больше стольких блюд считать не нужно
+
+        Returns:
+            tuple[int, int]: Количество блюд (не больше limit) и идентификатор последнего из них
+        """
+        count, last_id = self.connection.execute(
+            "SELECT count(*), max(id) FROM "
+            "(SELECT id FROM dishes WHERE id > ? AND removed = 0 ORDER BY id LIMIT ?)",
+            (after_id, limit)).fetchone()
+        return count, last_id if count else after_id
+
+    def page(self, after_id: int, count: int, skip: int = 0) -> list[DishBase]:
+        """
+        Оставшиеся блюда по порядку меню после блюда after_id
+
+        Args:
+            after_id (int): Идентификатор блюда перед страницей (0 — с начала)
+            count (int): Количество блюд
+            skip (int): Сколько блюд после after_id пропустить
+
+        Returns:
+            list[DishBase]: Блюда страницы
+        """
+        return self._dishes(self.connection.execute(
+            "SELECT name, price, minutes FROM dishes WHERE id > ? AND removed = 0 ORDER BY id LIMIT ? OFFSET ?",
+            (after_id, count, skip)))
+
+    def find(self, name_prefix: str = "", min_price: float|None = None, max_price: float|None = None,
+             max_minutes: int|None = None, limit: int|None = None) -> list[DishBase]:
+        """
+        Поиск оставшихся блюд по индексам (условия объединяются через «и»)
+
+        Args:
+            name_prefix (str): Начало названия (без учёта регистра и «ё»)
+            min_price (float|None): Наименьшая цена
+            max_price (float|None): Наибольшая цена
+            max_minutes (int|None): Наибольшее время приготовления в минутах
+            limit (int|None): Наибольшее количество блюд
+
+        Returns:
+            list[DishBase]: Блюда по порядку меню
+        """
+        conditions = ["removed = 0"]
+        parameters = []
+        if name_prefix:
+            key = MenuIndex.name_key(name_prefix)
+            # Диапазон ключей с префиксом: использует индекс, в отличие от LIKE
+            conditions.append("name_key >= ? AND name_key < ?")
+            parameters += [key, key + "\U0010ffff"]
+        for condition, value in (("price >= ?", min_price), ("price <= ?", max_price),
+                                 ("minutes <= ?", max_minutes)):
+            if value is not None:
+                conditions.append(condition)
+                parameters.append(value)
+        query = f"SELECT name, price, minutes FROM dishes WHERE {' AND '.join(conditions)} ORDER BY id"
+        if limit is not None:
+            query += " LIMIT ?"
+            parameters.append(limit)
+        return self._dishes(self.connection.execute(query, parameters))
+
+    def ordered_ids(self, field: str) -> array:
+        """
+        Идентификаторы оставшихся блюд по возрастанию поля (равные — по идентификатору), по индексу поля
+
+        Args:
+            field (str): "name" (ключ названия), "price" или "minutes"
+
+        Returns:
+            array: Идентификаторы блюд
+        """
+        column = self.FIELD_COLUMNS[field]
+        cursor = self.connection.execute(f"SELECT id FROM dishes WHERE removed = 0 ORDER BY {column}, id")
+        ids = array('q')
+        while rows := cursor.fetchmany(DB_BATCH_SIZE):
+            ids.extend(dish_id for dish_id, in rows)
+        return ids
+
+    def search_ids(self, text: str = "", conditions: Iterable[tuple[str, str, float]] = (),
+                   prefix: bool = False) -> list[int]:
+        """
+        Идентификаторы оставшихся блюд, подходящих под условия MenuIndex.search
+
+        Префикс названия и условия на цену и время ищутся по индексам,
+        подстрока названия проверяется в самой базе без чтения блюд.
+
+        Args:
+            text (str): Подстрока (или префикс) названия; пустая строка — без условия
+            conditions (Iterable[tuple[str, str, float]]): Условия ("price"|"minutes", "<"|"<="|">"|">="|"=", значение)
+            prefix (bool): Искать названия, начинающиеся с text
+
+        Returns:
+            list[int]: Идентификаторы блюд по возрастанию
+        """
+        clauses = ["removed = 0"]
+        parameters = []
+        if text:
+            key = MenuIndex.name_key(text)
+            if prefix:
+                clauses.append("name_key >= ? AND name_key < ?")
+                parameters += [key, key + "\U0010ffff"]
+            else:
+                clauses.append("instr(name_key, ?) > 0")
+                parameters.append(key)
+        for field, op, value in conditions:
+            if field not in ("price", "minutes") or op not in MenuIndex.OPERATORS:
+                raise ValueError(f"Неизвестное условие поиска: {field} {op}")
+            clauses.append(f"{self.FIELD_COLUMNS[field]} {op} ?")
+            parameters.append(value)
+        query = f"SELECT id FROM dishes WHERE {' AND '.join(clauses)} ORDER BY id"
+        return [dish_id for dish_id, in self.connection.execute(query, parameters)]
+
+    def mark_removed(self, dish_ids: Iterable[int]) -> None:
+        """
+        Пометка блюд удалёнными одной транзакцией (строки удаляются при уплотнении)
+
+        Args:
+            dish_ids (Iterable[int]): Идентификаторы блюд в базе
+        """
+        with self._transaction():
+            self.connection.executemany("UPDATE dishes SET removed = 1 WHERE id = ?", ((dish_id,) for dish_id in dish_ids))
+
+    def is_compact(self) -> bool:
+        """Проверка, что удалённых строк нет и идентификаторы идут подряд с 1"""
+        if self.connection.execute("SELECT 1 FROM dishes WHERE removed = 1 LIMIT 1").fetchone() is not None:
+            return False
+        count, max_id = self.connection.execute("SELECT count(*), coalesce(max(id), 0) FROM dishes").fetchone()
+        return count == max_id
+
+    def compact(self) -> None:
+        """
+        Уплотнение: удаление помеченных строк и перенумерация блюд подряд с 1 одной транзакцией
+
+        Таблица переписывается в новую (это быстрее изменения ключей на месте
+        с обновлением всех индексов), затем индексы строятся заново.
+        """
+        if self.is_compact():
+            return
+        with self._transaction():
+            self.connection.execute(self.COLUMNS.format(table="dishes_compact"))
+            self.connection.execute("INSERT INTO dishes_compact (name, name_key, price, minutes) "
+                                    "SELECT name, name_key, price, minutes FROM dishes WHERE removed = 0 ORDER BY id")
+            self.connection.execute("DROP TABLE dishes")
+            self.connection.execute("ALTER TABLE dishes_compact RENAME TO dishes")
+            self._create_indexes()
+
+    def close(self) -> None:
+        """Закрытие базы"""
+        self.connection.close()
@@ -0,0 +1,549 @@
+import os.path
+import time
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from itertools import islice
+from typing import TYPE_CHECKING, BinaryIO
+from ColumnarDishStore import ColumnarDishStore
+from DishBase import DishBase
+from Logger import Logger
+from MenuIndex import MenuIndex
+from MenuManager import MenuView
+from MenuMetrics import MenuMetrics, timed
+from MenuParser import FastMenuParser, MenuParser, ParseError
+from ParseErrorReport import ParseErrorReport
+
+if TYPE_CHECKING:
+    # sqlite3, mmap и struct импортируются только при работе с базой, отображённым
+    # файлом и снимком, чтобы не замедлять импорт
+    from MappedDishStore import MappedDishStore
+    from SqliteDishStore import SqliteDishStore
+
+# Количество блюд в одном пакете при потоковой загрузке
+LOAD_BATCH_SIZE = 10_000
+# Примерный объём (в байтах) одного чтения файла меню
+LOAD_CHUNK_SIZE = 1 << 20
+# Файлы меню от этого размера (в байтах) открываются без загрузки в память
+MAPPED_LOAD_THRESHOLD = 64 << 20
+# Количество блюд в одном блоке текста при сохранении
+SAVE_BATCH_SIZE = 50_000
+# Размер буфера файла (в байтах) при сохранении
+SAVE_BUFFER_SIZE = 4 << 20
+# Когда сбрасывать сохранённый файл на диск: никогда (только атомарная замена),
+# сам файл перед заменой или ещё и каталог после замены (замена переживает сбой питания)
+FSYNC_POLICIES = ("never", "file", "full")
+# Расширения файлов баз SQLite (MenuDatabase)
+DATABASE_EXTENSIONS = (".sqlite", ".db")
+# Время приготовления в формате файла меню: индекс — количество минут
+# (заполняется при первом сохранении, чтобы не замедлять импорт)
+_TIME_TEXTS = []
+# Сколько ошибок разбора каждого вида записывается в лог при загрузке файла (остальные — в сводку)
+PARSE_ERROR_LOG_LIMIT = 10
+# Что делать с блюдами с одинаковым названием при загрузке нескольких файлов
+CONFLICT_POLICIES = ("keep_all", "keep_first", "keep_last", "min_price")
+# Маска прав процесса для новых файлов (читается один раз: os.umask её временно меняет)
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+class MenuFileHandler:
+    """
+    Класс для обработки сохранения и загрузки меню
+    
+    Если задан metrics (MenuMetrics), учитываются время загрузки и
+    сохранения (file.*), разбора блоков строк (parse.chunk), число
+    разобранных строк и ошибок разбора (parse.*) и объём сохранённых файлов.
+    """
+    
+    PARSE_ENGINES = {"python": MenuParser, "fast": FastMenuParser}
+    
+    def __init__(self, logger: Logger, engine: str = "python", fsync: str = "file",
+                 error_log_limit: int = PARSE_ERROR_LOG_LIMIT, metrics: MenuMetrics|None = None):
+        """
+        Инициализация обработчика файлов
+        
+        Args:
+            logger (Logger): Логгер для ошибок разбора
+            engine (str): Движок разбора строк: "python" (построчный) или "fast" (блочный)
+            fsync (str): Политика сброса сохранённых файлов на диск (см. FSYNC_POLICIES)
+            error_log_limit (int): Сколько ошибок разбора каждого вида записывать в лог за загрузку
+            metrics (MenuMetrics|None): Сбор метрик (None — без замеров)
+        """
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Неизвестная политика fsync: {fsync}")
+        self.logger = logger
+        self.engine = engine
+        self.fsync = fsync
+        self.error_log_limit = error_log_limit
+        self.metrics = metrics
+        # Сводка ошибок разбора последней загрузки
+        self.parse_report = ParseErrorReport()
+        self.parser = self.PARSE_ENGINES[engine]()
+    
+    @staticmethod
+    def is_binary(filename: str) -> bool:
+        """
+        Проверка, выбран ли по расширению файла двоичный формат снимка
+        
+        Args:
+            filename (str): Путь к файлу
+        """
+        from MenuBinaryFormat import MenuBinaryFormat
+        return filename.lower().endswith(MenuBinaryFormat.EXTENSION)
+    
+    @staticmethod
+    def is_database(filename: str) -> bool:
+        """
+        Проверка, выбрана ли по расширению файла база SQLite (см. DATABASE_EXTENSIONS)
+        
+        Args:
+            filename (str): Путь к файлу
+        """
+        return filename.lower().endswith(DATABASE_EXTENSIONS)
+    
+    @timed("file.save_menu")
+    def save_menu(self, dishes: Iterable[DishBase], filename: str) -> None:
+        """
+        Сохранение меню в файл (текстовый или, по расширению, двоичный снимок .menub или база SQLite)
+        
+        Файл записывается крупными блоками рядом под временным именем,
+        сбрасывается на диск по политике fsync и атомарно заменяет исходный:
+        прерванное сохранение не оставляет недописанного меню, а сохранение
+        поверх открытого через map_menu файла не портит отображённые в память данные.
+        
+        Args:
+            dishes (Iterable[DishBase]): Блюда
+            filename (str): Путь к файлу
+        """
+        if self.is_binary(filename):
+            from MenuBinaryFormat import MenuBinaryFormat
+            write_atomic(filename, lambda file: MenuBinaryFormat.write(dishes, file), self.fsync)
+        elif self.is_database(filename):
+            self.save_database(dishes, filename)
+        else:
+            write_atomic(filename, lambda file: file.writelines(self.iter_text_blocks(dishes)), self.fsync)
+        if self.metrics is not None:
+            self.metrics.count("file.saved_bytes", os.path.getsize(filename))
+    
+    @staticmethod
+    def iter_text_blocks(dishes: Iterable[DishBase]) -> Iterator[bytes]:
+        """
+        Текст файла меню блоками по SAVE_BATCH_SIZE блюд
+        
+        Для ColumnarDishStore (и представления меню поверх него) строки
+        собираются прямо из столбцов, без создания объектов блюд.
+        
+        Args:
+            dishes (Iterable[DishBase]): Блюда
+        
+        Yields:
+            bytes: Строки очередного блока в UTF-8
+        """
+        store, slots = dishes.storage_slots() if isinstance(dishes, MenuView) else (dishes, None)
+        if isinstance(store, ColumnarDishStore):
+            names, name_refs, prices, minutes = store.columns()
+            if not _TIME_TEXTS:
+                _TIME_TEXTS.extend(f"{minutes // 60:02d}:{minutes % 60:02d}" for minutes in range(24 * 60))
+            prefixes = [f"{name}," for name in names]
+            slots = range(len(prices)) if slots is None else slots
+            for start in range(0, len(slots), SAVE_BATCH_SIZE):
+                yield "".join([
+                    f"{prefixes[name_refs[slot]]}{prices[slot]},{_TIME_TEXTS[minutes[slot]]}\n"
+                    for slot in slots[start:start + SAVE_BATCH_SIZE]
+                ]).encode('utf-8')
+            return
+        iterator = iter(dishes)
+        while batch := list(islice(iterator, SAVE_BATCH_SIZE)):
+            yield "".join([f"{dish}\n" for dish in batch]).encode('utf-8')
+    
+    def save_database(self, dishes: Iterable[DishBase], filename: str) -> None:
+        """
+        Сохранение меню в новую базу SQLite: рядом под временным именем, затем атомарная замена
+        
+        Args:
+            dishes (Iterable[DishBase]): Блюда
+            filename (str): Путь к файлу базы
+        """
+        from MenuDatabase import MenuDatabase
+        descriptor, temp_filename = _temp_file(filename)
+        # SQLite открывает файл сам; пустой файл он считает новой базой
+        os.close(descriptor)
+        try:
+            database = MenuDatabase(temp_filename)
+        except BaseException:
+            os.remove(temp_filename)
+            raise
+        try:
+            database.insert_many(dishes)
+        except BaseException:
+            database.close()
+            os.remove(temp_filename)
+            raise
+        # Закрытие последнего соединения переносит журнал WAL в файл базы
+        database.close()
+        # Журнал прежней базы не должен примениться к новой
+        for suffix in ("-wal", "-shm"):
+            if os.path.exists(filename + suffix):
+                os.remove(filename + suffix)
+        os.replace(temp_filename, filename)
+    
+    def open_database(self, filename: str) -> "SqliteDishStore":
+        """
+        Открытие базы SQLite как хранилища меню: изменения меню сразу записываются в неё
+        
+        Args:
+            filename (str): Путь к файлу базы
+            
+        Returns:
+            SqliteDishStore: Хранилище для MenuManager.use_storage
+        """
+        from SqliteDishStore import SqliteDishStore
+        return SqliteDishStore(filename)
+    
+    def load_snapshot(self, filename: str) -> ColumnarDishStore:
+        """
+        Загрузка двоичного снимка меню
+        
+        Args:
+            filename (str): Путь к файлу
+            
+        Returns:
+            ColumnarDishStore: Хранилище для MenuManager.use_storage
+        """
+        from MenuBinaryFormat import MenuBinaryFormat
+        with open(filename, 'rb') as file:
+            return MenuBinaryFormat.read(file)
+    
+    @timed("file.map_menu")
+    def map_menu(self, filename: str, progress: Callable[[int, int], None]|None = None,
+                 is_cancelled: Callable[[], bool]|None = None) -> "MappedDishStore":
+        """
+        Открытие меню без загрузки в память: строится только индекс строк файла
+        
+        Args:
+            filename (str): Путь к файлу
+            progress (Callable[[int, int], None]|None): Вызывается с числом просмотренных байт и размером файла
+            is_cancelled (Callable[[], bool]|None): Возвращает True, если открытие нужно прервать
+            
+        Returns:
+            MappedDishStore: Хранилище для MenuManager.use_storage
+        """
+        from MappedDishStore import MappedDishStore
+        self.parse_report = ParseErrorReport()
+        store = MappedDishStore(filename, self.parser, self._log_parse_error, progress, is_cancelled)
+        self._count_lines(len(store) + self.parse_report.total)
+        self._log_parse_summary()
+        return store
+    
+    @timed("file.load_menu")
+    def load_menu(self, filename: str) -> list[DishBase]:
+        """
+        Загрузка меню из файла
+        
+        Args:
+            filename (str): Путь к файлу
+            
+        Returns:
+            list[DishBase]: Список блюд
+        """
+        self.parse_report = ParseErrorReport()
+        if self.is_binary(filename):
+            return list(self.load_snapshot(filename))
+        if self.is_database(filename):
+            return self._read_database(filename, list)
+        dishes = []
+        for batch in self.iter_menu_batches(filename):
+            dishes.extend(batch)
+        return dishes
+    
+    @timed("file.load_store")
+    def load_store(self, filename: str) -> ColumnarDishStore:
+        """
+        Загрузка меню из файла сразу по столбцам, без создания объектов блюд
+        
+        Args:
+            filename (str): Путь к файлу (текстовый или снимок .menub)
+            
+        Returns:
+            ColumnarDishStore: Хранилище блюд
+        """
+        self.parse_report = ParseErrorReport()
+        if self.is_binary(filename):
+            return self.load_snapshot(filename)
+        if self.is_database(filename):
+            return self._read_database(filename, ColumnarDishStore)
+        store = ColumnarDishStore()
+        line_number = 0
+        with open(filename, 'rb') as file:
+            while raw_lines := file.readlines(LOAD_CHUNK_SIZE):
+                for _, name, price, prep_time in self.parser.scan_chunk(raw_lines, line_number + 1,
+                                                                         self._log_parse_error):
+                    store.append_row(name, price, prep_time)
+                line_number += len(raw_lines)
+        self._count_lines(line_number)
+        self._log_parse_summary()
+        return store
+    
+    @timed("file.load_many")
+    def load_many(self, filenames: Sequence[str], conflict: str = "keep_all", workers: int|None = None,
+                  progress: Callable[[int, int], None]|None = None,
+                  is_cancelled: Callable[[], bool]|None = None) -> tuple[ColumnarDishStore, list[str]]:
+        """
+        Параллельная загрузка нескольких файлов меню (например, по одному на филиал)
+        
+        Каждый файл разбирается в отдельном процессе и возвращается по столбцам
+        (ColumnarDishStore), ошибки разбора пишутся в лог с именем файла,
+        а parse_report собирает их по всем файлам. Результаты объединяются в порядке filenames, см. merge_stores.
+        
+        Args:
+            filenames (Sequence[str]): Пути к файлам
+            conflict (str): Правило для одинаковых названий (см. CONFLICT_POLICIES)
+            workers (int|None): Число процессов (по умолчанию по числу ядер; 1 — без процессов)
+            progress (Callable[[int, int], None]|None): Вызывается с числом загруженных файлов и их общим числом
+            is_cancelled (Callable[[], bool]|None): Возвращает True, если загрузку нужно прервать
+            
+        Returns:
+            tuple[ColumnarDishStore, list[str]]: Объединённое меню и файлы, которые не удалось прочитать
+        """
+        if conflict not in CONFLICT_POLICIES:
+            raise ValueError(f"Неизвестное правило для одинаковых названий: {conflict}")
+        stores = [None] * len(filenames)
+        failed = []
+        self.parse_report = ParseErrorReport()
+        
+        def collect(index: int, load) -> None:
+            """Запись результата одного файла (или ошибки его чтения)"""
+            try:
+                stores[index], report, messages = load()
+            except Exception as e:
+                # Любая ошибка файла, в том числе упавший процесс пула (BrokenProcessPool),
+                # не прерывает объединение остальных файлов
+                failed.append(filenames[index])
+                self.logger.log_message("ОШИБКА", f"Не удалось загрузить файл {filenames[index]}: {e}")
+                return
+            self.parse_report.merge(report)
+            self._count_lines(len(stores[index]) + report.total)
+            for level, message in messages:
+                self.logger.log_message(level, f"{filenames[index]}: {message}")
+        
+        workers = workers or os.cpu_count() or 1
+        if workers == 1 or len(filenames) <= 1:
+            for index, filename in enumerate(filenames):
+                if is_cancelled is not None and is_cancelled():
+                    break
+                collect(index, lambda: _load_file(filename, self.engine, self.error_log_limit))
+                if progress is not None:
+                    progress(index + 1, len(filenames))
+        else:
+            # Пул процессов нужен редко, а его импорт заметно удлиняет запуск
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor, as_completed
+            # spawn, а не fork: в процессе уже работают потоки логгера и Qt
+            with ProcessPoolExecutor(max_workers=min(workers, len(filenames)),
+                                     mp_context=multiprocessing.get_context("spawn")) as executor:
+                futures = {executor.submit(_load_file, filename, self.engine, self.error_log_limit): index
+                           for index, filename in enumerate(filenames)}
+                for done, future in enumerate(as_completed(futures), 1):
+                    if is_cancelled is not None and is_cancelled():
+                        executor.shutdown(cancel_futures=True)
+                        break
+                    collect(futures[future], future.result)
+                    if progress is not None:
+                        progress(done, len(filenames))
+        
+        return self.merge_stores([store for store in stores if store is not None], conflict), failed
+    
+    @staticmethod
+    def merge_stores(stores: Iterable[ColumnarDishStore], conflict: str = "keep_all") -> ColumnarDishStore:
+        """
+        Объединение меню по правилу для одинаковых названий
+        
+        Названия сравниваются без учёта регистра и различий «ё»/«е». При
+        keep_first остаётся первое блюдо с названием, при keep_last — последнее
+        (на месте первого), при min_price — самое дешёвое (при равной цене
+        первое, на месте первого), при keep_all остаются все блюда.
+        
+        Args:
+            stores (Iterable[ColumnarDishStore]): Меню в порядке приоритета
+            conflict (str): Правило для одинаковых названий (см. CONFLICT_POLICIES)
+            
+        Returns:
+            ColumnarDishStore: Объединённое меню
+        """
+        merged = ColumnarDishStore()
+        if conflict == "keep_all":
+            for store in stores:
+                merged.extend(store)
+            return merged
+        
+        winners = {}
+        for store in stores:
+            names, name_refs, prices, _ = store.columns()
+            keys = [MenuIndex.name_key(name) for name in names]
+            for row, name_id in enumerate(name_refs):
+                key = keys[name_id]
+                current = winners.get(key)
+                if (current is None or conflict == "keep_last"
+                        or (conflict == "min_price" and prices[row] < current[2])):
+                    winners[key] = (store, row, prices[row])
+        for store, row, _ in winners.values():
+            merged.append(store[row])
+        return merged
+    
+    def iter_menu_batches(self, filename: str, batch_size: int = LOAD_BATCH_SIZE,
+                          progress: Callable[[int, int], None]|None = None,
+                          is_cancelled: Callable[[], bool]|None = None) -> Iterator[list[DishBase]]:
+        """
+        Потоковая загрузка меню из файла пакетами
+        
+        Args:
+            filename (str): Путь к файлу
+            batch_size (int): Количество блюд в пакете
+            progress (Callable[[int, int], None]|None): Вызывается с числом прочитанных байт и размером файла
+            is_cancelled (Callable[[], bool]|None): Возвращает True, если загрузку нужно прервать
+            
+        Yields:
+            list[DishBase]: Очередной пакет блюд
+        """
+        self.parse_report = ParseErrorReport()
+        total_size = os.path.getsize(filename)
+        line_number = 0
+        dishes = []
+        
+        with open(filename, 'rb') as file:
+            while True:
+                if is_cancelled is not None and is_cancelled():
+                    return
+                raw_lines = file.readlines(LOAD_CHUNK_SIZE)
+                if not raw_lines:
+                    break
+                if self.metrics is None:
+                    dishes.extend(self.parser.parse_chunk(raw_lines, line_number + 1, self._log_parse_error))
+                else:
+                    start = time.perf_counter()
+                    dishes.extend(self.parser.parse_chunk(raw_lines, line_number + 1, self._log_parse_error))
+                    self.metrics.add_time("parse.chunk", time.perf_counter() - start)
+                    self._count_lines(len(raw_lines))
+                line_number += len(raw_lines)
+                while len(dishes) >= batch_size:
+                    yield dishes[:batch_size]
+                    dishes = dishes[batch_size:]
+                if progress is not None:
+                    progress(file.tell(), total_size)
+        self._log_parse_summary()
+        if dishes:
+            yield dishes
+    
+    @staticmethod
+    def _read_database(filename: str, collect: Callable[[Iterable[DishBase]], Sequence[DishBase]]) -> Sequence[DishBase]:
+        """Чтение оставшихся блюд базы SQLite в новое хранилище"""
+        from MenuDatabase import MenuDatabase
+        database = MenuDatabase(filename)
+        try:
+            return collect(database.iter_dishes())
+        finally:
+            database.close()
+    
+    def _log_parse_error(self, line_number: int, line: str, error: ParseError) -> None:
+        """Учёт ошибки разбора строки в сводке и запись в лог первых error_log_limit ошибок её вида"""
+        if self.metrics is not None:
+            self.metrics.count("parse.errors")
+        if self.parse_report.add(error.kind, line_number) <= self.error_log_limit:
+            self.logger.log_message("ОШИБКА", f"Не удалось разобрать строку {line_number}: {line}. Ошибка: {str(error)}")
+    
+    def _count_lines(self, count: int) -> None:
+        """Учёт разобранных строк в метриках"""
+        if self.metrics is not None:
+            self.metrics.count("parse.lines", count)
+    
+    def _log_parse_summary(self) -> None:
+        """Запись сводки ошибок разбора, если часть ошибок не попала в лог"""
+        if any(count > self.error_log_limit for count in self.parse_report.counts.values()):
+            self.logger.log_message("ОШИБКА", f"В лог записаны первые {self.error_log_limit} ошибок "
+                                              f"каждого вида, всего {self.parse_report.summary()}")
+
+class _CollectingLogger:
+    """Логгер процесса-обработчика: сообщения возвращаются в основной процесс"""
+    
+    def __init__(self):
+        """Инициализация пустого списка сообщений"""
+        self.messages = []
+    
+    def log_message(self, level: str, message: str, filename: str|None = None) -> None:
+        """Сохранение сообщения"""
+        self.messages.append((level, message))
+
+def _load_file(filename: str, engine: str,
+               error_log_limit: int) -> tuple[ColumnarDishStore, ParseErrorReport, list[tuple[str, str]]]:
+    """
+    Загрузка одного файла в процессе-обработчике load_many
+    
+    Args:
+        filename (str): Путь к файлу
+        engine (str): Движок разбора строк
+        error_log_limit (int): Сколько ошибок разбора каждого вида записывать в лог
+        
+    Returns:
+        tuple[ColumnarDishStore, ParseErrorReport, list[tuple[str, str]]]: Блюда по столбцам,
+            сводка ошибок разбора и сообщения для лога
+    """
+    logger = _CollectingLogger()
+    handler = MenuFileHandler(logger, engine, error_log_limit=error_log_limit)
+    return handler.load_store(filename), handler.parse_report, logger.messages
+
+def _temp_file(filename: str) -> tuple[int, str]:
+    """
+    Создание уникального временного файла рядом с filename (с правами прежнего файла или обычного нового)
+
+    Уникальное имя нужно, чтобы два одновременных сохранения одного файла
+    (например, сворачивание журнала и ручное сохранение снимка) не писали
+    в один временный файл.
+
+    Returns:
+        tuple[int, str]: Дескриптор и путь временного файла
+    """
+    import tempfile
+    directory, name = os.path.split(os.path.abspath(filename))
+    descriptor, temp_filename = tempfile.mkstemp(prefix=f"{name}.", suffix=".tmp", dir=directory)
+    try:
+        mode = os.stat(filename).st_mode & 0o7777
+    except FileNotFoundError:
+        # mkstemp создаёт файл только для владельца, а сохранённое меню — обычный файл
+        mode = 0o666 & ~_UMASK
+    try:
+        os.chmod(temp_filename, mode)
+    except BaseException:
+        os.close(descriptor)
+        os.remove(temp_filename)
+        raise
+    return descriptor, temp_filename
+
+def write_atomic(filename: str, write: Callable[[BinaryIO], None], fsync: str = "file") -> None:
+    """
+    Атомарная запись файла: под уникальным временным именем рядом, затем os.replace
+    
+    Если запись прервалась, временный файл удаляется, а прежний файл остаётся нетронутым.
+    
+    Args:
+        filename (str): Путь к файлу
+        write (Callable[[BinaryIO], None]): Записывает содержимое в файл, открытый в двоичном режиме
+        fsync (str): Политика сброса на диск (см. FSYNC_POLICIES)
+    """
+    descriptor, temp_filename = _temp_file(filename)
+    replaced = False
+    try:
+        with open(descriptor, 'wb', buffering=SAVE_BUFFER_SIZE) as file:
+            write(file)
+            if fsync != "never":
+                file.flush()
+                os.fsync(file.fileno())
+        os.replace(temp_filename, filename)
+        replaced = True
+    finally:
+        if not replaced:
+            os.remove(temp_filename)
+    if fsync == "full" and os.name == "posix":
+        # Запись о замене в каталоге тоже сбрасывается, иначе после сбоя питания может остаться старый файл
+        directory = os.open(os.path.dirname(os.path.abspath(filename)), os.O_RDONLY)
+        try:
+            os.fsync(directory)
+        finally:
+            os.close(directory)
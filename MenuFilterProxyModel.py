@@ -0,0 +1,191 @@
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable
+from PyQt6.QtCore import Qt, QAbstractProxyModel, QAbstractTableModel, QModelIndex, QPersistentModelIndex
+from MenuIndex import MenuIndex
+from MenuManager import MenuManager
+
+class MenuFilterProxyModel(QAbstractProxyModel):
+    """
+    Прокси-модель, показывающая только найденные через MenuIndex блюда
+    
+    Без запроса прокси прозрачно повторяет исходную модель. С запросом
+    строки берутся из результата поиска по индексу, поэтому фильтрация
+    не вызывает data() для каждой строки исходной модели. Добавленные
+    строки проверяются по запросу по одной (MenuIndex.matcher), а удалённые
+    вырезаются из результата, поэтому изменения меню при активном запросе
+    (например, потоковая загрузка) не повторяют поиск по всему меню.
+    Сортировка передаётся исходной модели (MenuTableModel.sort).
+    """
+    
+    def __init__(self, menu_manager: MenuManager, parent=None):
+        """
+        Инициализация прокси-модели
+        
+        Args:
+            menu_manager (MenuManager): Менеджер меню с индексом для поиска
+            parent: Родительский объект Qt
+        """
+        super().__init__(parent)
+        self.menu_manager = menu_manager
+        self.query = ""
+        self._rows = None
+        self._matcher = None
+        # Удаляемый участок результата: начало, конец и число удаляемых строк исходной модели
+        self._removing = None
+        self._layout_indexes = []
+    
+    def setSourceModel(self, model: QAbstractTableModel) -> None:
+        """Подключение исходной модели и её сигналов об изменениях"""
+        super().setSourceModel(model)
+        model.rowsAboutToBeInserted.connect(self._on_rows_about_to_be_inserted)
+        model.rowsInserted.connect(self._on_rows_inserted)
+        model.rowsAboutToBeRemoved.connect(self._on_rows_about_to_be_removed)
+        model.rowsRemoved.connect(self._on_rows_removed)
+        model.modelAboutToBeReset.connect(self.beginResetModel)
+        model.modelReset.connect(self._on_model_reset)
+        model.dataChanged.connect(self._on_data_changed)
+        model.layoutAboutToBeChanged.connect(self._on_layout_about_to_be_changed)
+        model.layoutChanged.connect(self._on_layout_changed)
+    
+    def sort(self, column: int, order: Qt.SortOrder = Qt.SortOrder.AscendingOrder) -> None:
+        """Сортировка выполняется исходной моделью по индексу меню"""
+        self.sourceModel().sort(column, order)
+    
+    def set_query(self, query: str) -> None:
+        """
+        Установка строки поиска (см. MenuIndex.search_text)
+        
+        Args:
+            query (str): Строка запроса; пустая строка снимает фильтр
+        """
+        self.beginResetModel()
+        self.query = query
+        self._matcher = MenuIndex.matcher(query)
+        self._rows = self._search()
+        self.endResetModel()
+    
+    def _search(self) -> list[int]|None:
+        """Строки исходной модели, подходящие под запрос, по возрастанию"""
+        rows = self.menu_manager.index.search_text(self.query)
+        return None if rows is None else sorted(self.sourceModel().rows_of_slots(rows))
+    
+    def _refilter(self) -> None:
+        """Повторное выполнение запроса после изменения меню"""
+        self.set_query(self.query)
+    
+    def _on_rows_about_to_be_inserted(self, parent: QModelIndex, first: int, last: int) -> None:
+        if self._rows is None:
+            self.beginInsertRows(QModelIndex(), first, last)
+    
+    def _on_rows_inserted(self, parent: QModelIndex, first: int, last: int) -> None:
+        if self._rows is None:
+            self.endInsertRows()
+            return
+        # Строки исходной модели после вставленных сдвигаются, их места в результате те же
+        position = bisect_left(self._rows, first)
+        count = last - first + 1
+        for i in range(position, len(self._rows)):
+            self._rows[i] += count
+        model = self.sourceModel()
+        matches = [row for row in range(first, last + 1)
+                   if self._matcher(self.menu_manager.dish_in_slot(model.slot_at(row)))]
+        if matches:
+            self.beginInsertRows(QModelIndex(), position, position + len(matches) - 1)
+            self._rows[position:position] = matches
+            self.endInsertRows()
+    
+    def _on_rows_about_to_be_removed(self, parent: QModelIndex, first: int, last: int) -> None:
+        if self._rows is None:
+            self.beginRemoveRows(QModelIndex(), first, last)
+            return
+        start, end = bisect_left(self._rows, first), bisect_right(self._rows, last)
+        self._removing = (start, end, last - first + 1)
+        if start < end:
+            self.beginRemoveRows(QModelIndex(), start, end - 1)
+    
+    def _on_rows_removed(self, parent: QModelIndex, first: int, last: int) -> None:
+        if self._rows is None:
+            self.endRemoveRows()
+            return
+        start, end, count = self._removing
+        self._removing = None
+        del self._rows[start:end]
+        for i in range(start, len(self._rows)):
+            self._rows[i] -= count
+        if start < end:
+            self.endRemoveRows()
+    
+    def _on_model_reset(self) -> None:
+        if self._rows is not None:
+            self._rows = self._search()
+        self.endResetModel()
+    
+    def _on_layout_about_to_be_changed(self, parents=(), hint=None) -> None:
+        self.layoutAboutToBeChanged.emit()
+        self._layout_indexes = [(index, QPersistentModelIndex(self.mapToSource(index)))
+                                for index in self.persistentIndexList()]
+    
+    def _on_layout_changed(self, parents=(), hint=None) -> None:
+        if self._rows is not None:
+            self._rows = self._search()
+        for index, source_index in self._layout_indexes:
+            self.changePersistentIndex(index, self.mapFromSource(source_index))
+        self._layout_indexes = []
+        self.layoutChanged.emit()
+    
+    def _on_data_changed(self, top_left: QModelIndex, bottom_right: QModelIndex, roles=()) -> None:
+        if self._rows is None:
+            self.dataChanged.emit(self.mapFromSource(top_left), self.mapFromSource(bottom_right), roles)
+        else:
+            self._refilter()
+    
+    def index(self, row: int, column: int, parent: QModelIndex = QModelIndex()) -> QModelIndex:
+        """Получение индекса ячейки прокси-модели"""
+        if parent.isValid() or not (0 <= row < self.rowCount() and 0 <= column < self.columnCount()):
+            return QModelIndex()
+        return self.createIndex(row, column)
+    
+    def parent(self, index: QModelIndex = QModelIndex()) -> QModelIndex:
+        """У строк таблицы нет родителя"""
+        return QModelIndex()
+    
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        """Получение количества строк"""
+        if parent.isValid() or self.sourceModel() is None:
+            return 0
+        return self.sourceModel().rowCount() if self._rows is None else len(self._rows)
+    
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        """Получение количества столбцов"""
+        return 0 if self.sourceModel() is None else self.sourceModel().columnCount()
+    
+    def source_rows(self, rows: Iterable[int]) -> list[int]:
+        """
+        Строки исходной модели для строк прокси-модели (без создания индексов Qt)
+        
+        Args:
+            rows (Iterable[int]): Номера строк прокси-модели
+        
+        Returns:
+            list[int]: Номера строк исходной модели
+        """
+        return list(rows) if self._rows is None else [self._rows[row] for row in rows]
+    
+    def mapToSource(self, proxy_index: QModelIndex) -> QModelIndex:
+        """Преобразование индекса прокси-модели в индекс исходной модели"""
+        if not proxy_index.isValid():
+            return QModelIndex()
+        row = proxy_index.row() if self._rows is None else self._rows[proxy_index.row()]
+        return self.sourceModel().index(row, proxy_index.column())
+    
+    def mapFromSource(self, source_index: QModelIndex) -> QModelIndex:
+        """Преобразование индекса исходной модели в индекс прокси-модели"""
+        if not source_index.isValid():
+            return QModelIndex()
+        row = source_index.row()
+        if self._rows is not None:
+            position = bisect_left(self._rows, row)
+            if position == len(self._rows) or self._rows[position] != row:
+                return QModelIndex()
+            row = position
+        return self.index(row, source_index.column())
@@ -0,0 +1,52 @@
+from PyQt6.QtWidgets import QVBoxLayout, QHBoxLayout, QLineEdit, QTimeEdit, QDoubleSpinBox, QLabel
+from PyQt6.QtCore import QTime
+
+class MenuFormManager:
+    """Класс для управления полями формы ввода данных о блюде"""
+    
+    def __init__(self, form_layout: QHBoxLayout):
+        """
+        Инициализация менеджера формы
+        
+        Args:
+            form_layout (QHBoxLayout): Макет для полей формы
+        """
+        self.form_layout = form_layout
+        self.name_edit = QLineEdit()
+        self.price_edit = QDoubleSpinBox()
+        self.prep_time_edit = QTimeEdit()
+        self.init_form_fields()
+    
+    def init_form_fields(self) -> None:
+        """Инициализация полей формы для блюда"""
+        # Поле для названия блюда
+        name_layout = QVBoxLayout()
+        name_layout.addWidget(QLabel("Название блюда"))
+        self.name_edit.setPlaceholderText("Например, Паста Карбонара")
+        name_layout.addWidget(self.name_edit)
+        self.form_layout.addLayout(name_layout)
+        
+        # Поле для цены
+        price_layout = QVBoxLayout()
+        price_layout.addWidget(QLabel("Цена (руб)"))
+        self.price_edit.setMinimum(0.1)
+        self.price_edit.setMaximum(10000.0)
+        self.price_edit.setSingleStep(50.0)
+        price_layout.addWidget(self.price_edit)
+        self.form_layout.addLayout(price_layout)
+        
+        # Поле для времени приготовления
+        time_layout = QVBoxLayout()
+        time_layout.addWidget(QLabel("Время приготовления"))
+        self.prep_time_edit.setDisplayFormat("HH:mm")
+        time_layout.addWidget(self.prep_time_edit)
+        self.form_layout.addLayout(time_layout)
+    
+    def get_form_values(self) -> tuple[str, float, QTime]:
+        """
+        Получение значений из полей формы
+        
+        Returns:
+            tuple[str, float, QTime]: Название, цена и время приготовления
+        """
+        return self.name_edit.text().strip(), self.price_edit.value(), self.prep_time_edit.time()
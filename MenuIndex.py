@@ -0,0 +1,423 @@
+import operator
+import re
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import Callable, Iterable, Sequence
+from DishBase import DishBase
+from MenuListener import MenuListener
+
+# Пакеты добавления больше этого размера не вставляются в индекс по одному блюду
+INCREMENTAL_INSERT_LIMIT = 1000
+# Условие поиска: поле ("price" или "minutes"), операция сравнения, значение
+Condition = tuple[str, str, float]
+
+class MenuIndex(MenuListener):
+    """
+    Индекс меню для поиска по названию, цене и времени приготовления
+
+    Названия хранятся в виде таблицы уникальных ключей (casefold, «ё» как «е»)
+    с триграммным индексом для поиска подстроки и отсортированным списком
+    для поиска по префиксу. Цены и время в минутах хранятся в отсортированных
+    массивах, поэтому условия вида «цена < 500» сводятся к двоичному поиску.
+    Те же ключи задают порядок сортировки таблицы (см. sorted_rows и sort_key).
+    Строками считаются слоты хранилища MenuManager.
+
+    Добавление блюд обновляет индекс на месте. Удалённые строки только
+    запоминаются и отбрасываются из результатов; после полной замены меню
+    и уплотнения хранилища индекс перестраивается при следующем запросе.
+
+    Хранилища на диске (SqliteDishStore, MappedDishStore) сортируют и ищут
+    блюда сами (методы sorted_slots и search_slots): индекс в памяти для
+    них не строится, иначе пришлось бы создать блюдо для каждой строки.
+    """
+
+    FIELDS = {"цена": "price", "price": "price", "время": "minutes", "time": "minutes"}
+    OPERATORS = {"<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge, "=": operator.eq}
+    SORT_FIELDS = ("name", "price", "minutes")
+    CONDITION = re.compile(r"(цена|price|время|time)\s*(<=|>=|<|>|=)\s*(\d+(?:[.:]\d+)?)", re.IGNORECASE)
+
+    def __init__(self, dishes: Sequence[DishBase]):
+        """
+        Инициализация индекса
+
+        Args:
+            dishes (Sequence[DishBase]): Блюда по слотам (обычно MenuManager.view(slots=True))
+        """
+        self._dishes = dishes
+        self._removed = set()
+        self._stale = True
+
+    @staticmethod
+    def name_key(name: str) -> str:
+        """
+        Ключ названия для поиска без учёта регистра и различий «ё»/«е»
+
+        Args:
+            name (str): Название блюда
+
+        Returns:
+            str: Ключ названия
+        """
+        return name.casefold().replace("ё", "е")
+
+    @classmethod
+    def field_value(cls, dish: DishBase, field: str) -> str|float|int:
+        """
+        Значение поля блюда, по которому сортирует индекс
+
+        Args:
+            dish (DishBase): Блюдо
+            field (str): "name" (ключ названия), "price" или "minutes"
+
+        Returns:
+            str|float|int: Значение поля
+        """
+        if field == "name":
+            return cls.name_key(dish.name)
+        if field == "price":
+            return dish.price
+        if field == "minutes":
+            return dish.prep_time.hour * 60 + dish.prep_time.minute
+        raise ValueError(f"Неизвестное поле сортировки: {field}")
+
+    def _storage(self) -> Sequence[DishBase]:
+        """Хранилище блюд по слотам (для представления MenuManager — само хранилище менеджера)"""
+        if hasattr(self._dishes, "storage_slots"):
+            return self._dishes.storage_slots()[0]
+        return self._dishes
+
+    def _searching_storage(self) -> Sequence[DishBase]|None:
+        """Хранилище, которое само сортирует и ищет блюда, или None"""
+        storage = self._storage()
+        return storage if hasattr(storage, "search_slots") else None
+
+    def _clear(self) -> None:
+        """Сброс всех структур индекса"""
+        self._keys = []
+        self._key_ids = {}
+        self._key_rows = []
+        self._trigrams = {}
+        self._sorted_keys = []
+        self._row_keys = array('I')
+        self._row_prices = array('d')
+        self._row_minutes = array('H')
+        self._price_keys = array('d')
+        self._price_rows = array('q')
+        self._minute_keys = array('H')
+        self._minute_rows = array('q')
+
+    def _rebuild(self) -> None:
+        """Полное построение индекса по текущему меню"""
+        self._clear()
+        for row, dish in enumerate(self._storage()):
+            self._index_row(row, dish)
+        self._sorted_keys = sorted(self._keys)
+        self._price_rows = array('q', sorted(range(len(self._row_prices)), key=self._row_prices.__getitem__))
+        self._price_keys = array('d', map(self._row_prices.__getitem__, self._price_rows))
+        self._minute_rows = array('q', sorted(range(len(self._row_minutes)), key=self._row_minutes.__getitem__))
+        self._minute_keys = array('H', map(self._row_minutes.__getitem__, self._minute_rows))
+        self._stale = False
+
+    def _index_row(self, row: int, dish: DishBase) -> None:
+        """Запись блюда в построчные массивы и таблицу названий (без отсортированных массивов)"""
+        key = self.name_key(dish.name)
+        key_id = self._key_ids.get(key)
+        if key_id is None:
+            key_id = self._key_ids[key] = len(self._keys)
+            self._keys.append(key)
+            self._key_rows.append(array('q'))
+            for trigram in self._trigrams_of(key):
+                self._trigrams.setdefault(trigram, set()).add(key_id)
+        self._key_rows[key_id].append(row)
+        self._row_keys.append(key_id)
+        self._row_prices.append(dish.price)
+        self._row_minutes.append(dish.prep_time.hour * 60 + dish.prep_time.minute)
+
+    def _add_rows(self, first: int, dishes: Iterable[DishBase]) -> None:
+        """Добавление в индекс блюд, занимающих строки начиная с first"""
+        for row, dish in enumerate(dishes, first):
+            known_keys = len(self._keys)
+            self._index_row(row, dish)
+            if len(self._keys) > known_keys:
+                insort(self._sorted_keys, self._keys[-1])
+            self._insert_sorted(self._price_keys, self._price_rows, self._row_prices[row], row)
+            self._insert_sorted(self._minute_keys, self._minute_rows, self._row_minutes[row], row)
+
+    @staticmethod
+    def _insert_sorted(keys: array, rows: array, key: float, row: int) -> None:
+        """Вставка пары (ключ, строка) в отсортированные массивы"""
+        position = bisect_right(keys, key)
+        keys.insert(position, key)
+        rows.insert(position, row)
+
+    @staticmethod
+    def _trigrams_of(key: str) -> set[str]:
+        """Триграммы ключа названия"""
+        return {key[i:i + 3] for i in range(len(key) - 2)}
+
+    def rows_inserted(self, first: int, last: int) -> None:
+        """Индексация добавленных блюд (крупный пакет дешевле перестроить целиком)"""
+        if self._stale:
+            return
+        if last - first >= INCREMENTAL_INSERT_LIMIT:
+            self._stale = True
+        else:
+            self._add_rows(first, self._dishes[first:last + 1])
+
+    def rows_removed(self, rows: Sequence[int]) -> None:
+        """Удалённые строки исключаются из результатов без перестройки индекса"""
+        self._removed.update(rows)
+
+    def menu_reset(self) -> None:
+        """Меню заменено: индекс будет перестроен при следующем запросе"""
+        self._removed = set()
+        self._stale = True
+
+    def menu_compacted(self, rows: Sequence[int]) -> None:
+        """Строки перенумерованы: индекс будет перестроен при следующем запросе"""
+        self._removed = set()
+        self._stale = True
+
+    def _without_removed(self, rows: array) -> array:
+        """Строки без удалённых"""
+        if not self._removed:
+            return array('q', rows)
+        return array('q', (row for row in rows if row not in self._removed))
+
+    def sorted_rows(self, field: str) -> array:
+        """
+        Строки меню, упорядоченные по полю (равные значения — по номеру строки)
+
+        Args:
+            field (str): "name", "price" или "minutes"
+
+        Returns:
+            array: Новый массив номеров строк по возрастанию ключа
+        """
+        storage = self._searching_storage()
+        if storage is not None:
+            if field not in self.SORT_FIELDS:
+                raise ValueError(f"Неизвестное поле сортировки: {field}")
+            return self._without_removed(storage.sorted_slots(field))
+        if self._stale:
+            self._rebuild()
+        if field == "price":
+            return self._without_removed(self._price_rows)
+        if field == "minutes":
+            return self._without_removed(self._minute_rows)
+        if field == "name":
+            rows = array('q')
+            for key in self._sorted_keys:
+                rows.extend(self._key_rows[self._key_ids[key]])
+            return self._without_removed(rows)
+        raise ValueError(f"Неизвестное поле сортировки: {field}")
+
+    def sort_key(self, field: str) -> Callable[[int], tuple]:
+        """
+        Функция ключа сортировки строки, согласованная с sorted_rows
+
+        Args:
+            field (str): "name", "price" или "minutes"
+
+        Returns:
+            Callable[[int], tuple]: Ключ строки: (значение поля, номер строки)
+        """
+        if self._searching_storage() is not None:
+            if field not in self.SORT_FIELDS:
+                raise ValueError(f"Неизвестное поле сортировки: {field}")
+            return lambda row: (self.field_value(self._dishes[row], field), row)
+        if self._stale:
+            self._rebuild()
+        if field == "price":
+            return lambda row: (self._row_prices[row], row)
+        if field == "minutes":
+            return lambda row: (self._row_minutes[row], row)
+        if field == "name":
+            return lambda row: (self._keys[self._row_keys[row]], row)
+        raise ValueError(f"Неизвестное поле сортировки: {field}")
+
+    def _matching_keys(self, text: str, prefix: bool) -> list[int]:
+        """Номера ключей названий, содержащих text (или начинающихся с него)"""
+        key = self.name_key(text)
+        if prefix:
+            start = bisect_left(self._sorted_keys, key)
+            end = bisect_left(self._sorted_keys, key + "\U0010ffff")
+            return [self._key_ids[name] for name in self._sorted_keys[start:end]]
+        trigrams = self._trigrams_of(key)
+        if not trigrams:
+            # Для одного-двух символов просматриваем уникальные названия, а не все блюда
+            return [key_id for key_id, name in enumerate(self._keys) if key in name]
+        candidates = None
+        for trigram in sorted(trigrams, key=lambda t: len(self._trigrams.get(t, ()))):
+            postings = self._trigrams.get(trigram, set())
+            candidates = set(postings) if candidates is None else candidates & postings
+            if not candidates:
+                return []
+        return [key_id for key_id in candidates if key in self._keys[key_id]]
+
+    def _range(self, keys: array, op: str, value: float) -> tuple[int, int]:
+        """Диапазон позиций отсортированного массива, удовлетворяющих условию"""
+        if op == "<":
+            return 0, bisect_left(keys, value)
+        if op == "<=":
+            return 0, bisect_right(keys, value)
+        if op == ">":
+            return bisect_right(keys, value), len(keys)
+        if op == ">=":
+            return bisect_left(keys, value), len(keys)
+        if op == "=":
+            return bisect_left(keys, value), bisect_right(keys, value)
+        raise ValueError(f"Неизвестная операция сравнения: {op}")
+
+    def search(self, text: str = "", conditions: Iterable[Condition] = (), prefix: bool = False) -> list[int]:
+        """
+        Поиск блюд по названию и условиям на цену и время приготовления
+
+        Args:
+            text (str): Подстрока (или префикс) названия; пустая строка — без условия
+            conditions (Iterable[Condition]): Условия ("price"|"minutes", "<"|"<="|">"|">="|"=", значение)
+            prefix (bool): Искать названия, начинающиеся с text
+
+        Returns:
+            list[int]: Строки подходящих блюд по возрастанию
+        """
+        storage = self._searching_storage()
+        if storage is not None:
+            removed = self._removed
+            return [row for row in storage.search_slots(text, list(conditions), prefix) if row not in removed]
+        if self._stale:
+            self._rebuild()
+
+        # Каждое условие сужает диапазон в своём отсортированном массиве
+        ranges = {"price": (0, len(self._price_keys)), "minutes": (0, len(self._minute_keys))}
+        sorted_columns = {"price": (self._price_keys, self._price_rows),
+                          "minutes": (self._minute_keys, self._minute_rows)}
+        for field, op, value in conditions:
+            start, end = self._range(sorted_columns[field][0], op, value)
+            current = ranges[field]
+            ranges[field] = (max(start, current[0]), min(end, current[1]))
+
+        key_ids = None
+        if text:
+            key_ids = self._matching_keys(text, prefix)
+
+        # Перебираем самый узкий набор кандидатов и проверяем остальные условия напрямую
+        sizes = {field: max(0, end - start) for field, (start, end) in ranges.items()}
+        if key_ids is not None:
+            sizes["name"] = sum(len(self._key_rows[key_id]) for key_id in key_ids)
+        driver = min(sizes, key=sizes.get)
+        if driver == "name":
+            candidates = [row for key_id in key_ids for row in self._key_rows[key_id]]
+        else:
+            start, end = ranges[driver]
+            candidates = sorted_columns[driver][1][start:end]
+
+        price_start, price_end = ranges["price"]
+        minutes_start, minutes_end = ranges["minutes"]
+        price_low = self._price_keys[price_start] if price_start < price_end else None
+        price_high = self._price_keys[price_end - 1] if price_start < price_end else None
+        minutes_low = self._minute_keys[minutes_start] if minutes_start < minutes_end else None
+        minutes_high = self._minute_keys[minutes_end - 1] if minutes_start < minutes_end else None
+        if price_low is None or minutes_low is None:
+            return []
+        key_set = None if key_ids is None else set(key_ids)
+        removed = self._removed
+
+        return sorted(
+            row for row in candidates
+            if price_low <= self._row_prices[row] <= price_high
+            and minutes_low <= self._row_minutes[row] <= minutes_high
+            and (key_set is None or self._row_keys[row] in key_set)
+            and row not in removed
+        )
+
+    @classmethod
+    def parse_query(cls, query: str) -> tuple[str, list[Condition]]|None:
+        """
+        Разбор строки запроса, например «паста цена<500 время<=0:30»
+
+        Условия на цену и время задаются словами «цена»/«price» и «время»/«time»
+        (время в минутах или ЧЧ:ММ), остальной текст ищется как подстрока названия.
+
+        Args:
+            query (str): Строка запроса
+
+        Returns:
+            tuple[str, list[Condition]]|None: Подстрока названия и условия или None для пустого запроса
+        """
+        conditions = []
+        for field, op, value in cls.CONDITION.findall(query):
+            field = cls.FIELDS[field.lower()]
+            if field == "minutes" and ":" in value:
+                hours, minutes = value.split(":")
+                number = int(hours) * 60 + int(minutes)
+            else:
+                number = float(value.replace(":", "."))
+            conditions.append((field, op, number))
+        text = " ".join(cls.CONDITION.sub(" ", query).split())
+        if not text and not conditions:
+            return None
+        return text, conditions
+
+    @classmethod
+    def dish_filter(cls, text: str = "", conditions: Iterable[Condition] = (),
+                    prefix: bool = False) -> Callable[[DishBase], bool]:
+        """
+        Проверка одного блюда по тем же условиям, что и у search, без обращения к индексу
+
+        Args:
+            text (str): Подстрока (или префикс) названия; пустая строка — без условия
+            conditions (Iterable[Condition]): Условия ("price"|"minutes", "<"|"<="|">"|">="|"=", значение)
+            prefix (bool): Название должно начинаться с text
+
+        Returns:
+            Callable[[DishBase], bool]: Проверка блюда
+        """
+        key = cls.name_key(text)
+        checks = []
+        for field, op, value in conditions:
+            if field not in ("price", "minutes") or op not in cls.OPERATORS:
+                raise ValueError(f"Неизвестное условие поиска: {field} {op}")
+            checks.append((field, cls.OPERATORS[op], value))
+
+        def matches(dish: DishBase) -> bool:
+            if key:
+                name = cls.name_key(dish.name)
+                if not (name.startswith(key) if prefix else key in name):
+                    return False
+            return all(compare(cls.field_value(dish, field), value) for field, compare, value in checks)
+        return matches
+
+    @classmethod
+    def matcher(cls, query: str) -> Callable[[DishBase], bool]|None:
+        """
+        Проверка одного блюда по строке запроса без обращения к индексу
+
+        Отбирает те же блюда, что и search_text; нужна, чтобы проверять
+        только добавленные блюда, а не искать заново по всему меню.
+
+        Args:
+            query (str): Строка запроса (см. parse_query)
+
+        Returns:
+            Callable[[DishBase], bool]|None: Проверка блюда или None для пустого запроса
+        """
+        parsed = cls.parse_query(query)
+        if parsed is None:
+            return None
+        return cls.dish_filter(*parsed)
+
+    def search_text(self, query: str) -> list[int]|None:
+        """
+        Поиск по строке запроса (см. parse_query)
+
+        Args:
+            query (str): Строка запроса
+
+        Returns:
+            list[int]|None: Строки подходящих блюд или None для пустого запроса
+        """
+        parsed = self.parse_query(query)
+        if parsed is None:
+            return None
+        return self.search(*parsed)
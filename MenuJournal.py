@@ -0,0 +1,262 @@
+import datetime
+import io
+import os
+import struct
+import zlib
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterable, Iterator, Sequence
+from ColumnarDishStore import ColumnarDishStore
+from DishBase import DishBase
+from MenuBinaryFormat import MenuBinaryFormat
+from MenuFileHandler import write_atomic
+from MenuListener import MenuListener
+
+# Журнал сворачивается в снимок, когда он не меньше порога (в байтах) и больше самого снимка
+JOURNAL_COMPACT_MIN_BYTES = 1 << 20
+
+class MenuJournal(MenuListener):
+    """
+    Журналируемое хранение меню: снимок плюс журнал изменений (write-ahead log)
+
+    Снимок лежит в файле path (формат MenuBinaryFormat), журнал — в path + ".journal".
+    Каждое изменение MenuManager дописывается в конец журнала одной записью,
+    поэтому сохранение не зависит от размера меню. Когда журнал вырастает
+    больше снимка, он сворачивается в новый снимок (compact).
+
+    Формат журнала (little-endian):
+        заголовок   MAGIC, версия (uint16), число блюд снимка (uint64), CRC32 снимка (uint32)
+        записи      длина (uint32), CRC32 (uint32) и данные записи:
+                    b"A" и блюда: цена (float64), минуты (uint16), длина названия (uint32), название в UTF-8
+                    b"D" и номера удаляемых блюд (int64[])
+
+    Блюда нумеруются в журнале по порядку: сначала блюда снимка, затем
+    добавленные записями "A". Заголовок связывает журнал с его снимком: если
+    сбой случился между заменой снимка и журнала при сворачивании, устаревший
+    журнал не применяется (его записи уже есть в снимке). Оборванная при сбое
+    последняя запись отбрасывается по длине и контрольной сумме.
+    """
+
+    MAGIC = b"MENUJRN\0"
+    VERSION = 1
+    HEADER = struct.Struct("<8sHQI")
+    RECORD = struct.Struct("<II")
+    DISH = struct.Struct("<dHI")
+    ADD = b"A"
+    DELETE = b"D"
+
+    def __init__(self, path: str, fsync: bool = False, compact_min_bytes: int = JOURNAL_COMPACT_MIN_BYTES):
+        """
+        Инициализация журнала
+
+        Args:
+            path (str): Путь к файлу снимка (.menub); журнал лежит рядом с суффиксом .journal
+            fsync (bool): Сбрасывать каждую запись журнала на диск (os.fsync), а не только в ОС
+            compact_min_bytes (int): Минимальный размер журнала для сворачивания в снимок
+        """
+        self.path = path
+        self.journal_path = path + ".journal"
+        self.fsync = fsync
+        self.compact_min_bytes = compact_min_bytes
+        self.menu_manager = None
+        self._file = None
+        self._snapshot_size = 0
+        # Идентификаторы блюд MenuManager по номерам журнала (по возрастанию)
+        self._ids = array('q')
+        # Изменения отложены до release() и были ли они
+        self._held = False
+        self._pending = False
+
+    def open(self, menu_manager) -> None:
+        """
+        Подключение журнала к меню
+
+        Если снимок уже есть, меню заменяется снимком с применёнными записями
+        журнала; иначе текущее меню становится первым снимком. После этого
+        все изменения меню записываются в журнал.
+
+        Args:
+            menu_manager (MenuManager): Менеджер меню
+        """
+        self.close()
+        self.menu_manager = menu_manager
+        if os.path.exists(self.path):
+            store, replayed = self.recover()
+            menu_manager.use_storage(store)
+        else:
+            replayed = True
+        menu_manager.add_listener(self)
+        if replayed:
+            # Журнал (или его отсутствие) сразу сворачиваем, чтобы нумерация начиналась со снимка
+            self.compact()
+        else:
+            self._snapshot_size = os.path.getsize(self.path)
+            self._ids = self._live_ids()
+            self._file = open(self.journal_path, 'ab')
+
+    def hold(self) -> None:
+        """
+        Отложить запись изменений (на время загрузки меню)
+
+        Пока журнал удержан, изменения меню не пишутся: замена меню в начале
+        загрузки не должна стать снимком, если загрузка не удастся. При
+        release() всё накопленное записывается одним снимком; close() без
+        release() оставляет на диске прежние снимок и журнал.
+        """
+        self._held = True
+
+    def release(self) -> None:
+        """Возобновить запись изменений; если меню менялось, записать его новым снимком"""
+        pending = self._held and self._pending
+        self._held = False
+        self._pending = False
+        if pending and self.menu_manager is not None:
+            self.compact()
+
+    def close(self) -> None:
+        """Отключение журнала от меню и закрытие файла журнала"""
+        self._held = False
+        self._pending = False
+        if self.menu_manager is not None:
+            self.menu_manager.remove_listener(self)
+            self.menu_manager = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def recover(self) -> tuple[ColumnarDishStore, bool]:
+        """
+        Восстановление меню из снимка и журнала
+
+        Returns:
+            tuple[ColumnarDishStore, bool]: Меню и признак того, что журнал содержал записи,
+                не подходил к снимку или кончается оборванной записью, и его нужно свернуть
+
+        Raises:
+            ValueError: Снимок повреждён
+        """
+        with open(self.path, 'rb') as file:
+            data = file.read()
+        store = MenuBinaryFormat.read(io.BytesIO(data))
+        read = self._read_records((len(store), zlib.crc32(data)))
+        if read is None:
+            return store, True
+        records, complete = read
+
+        removed = set()
+        for record in records:
+            if record[:1] == self.ADD:
+                for name, price, minutes in self._unpack_dishes(record):
+                    store.append_row(name, price, datetime.time(minutes // 60, minutes % 60))
+            elif record[:1] == self.DELETE:
+                removed.update(MenuBinaryFormat._from_bytes('q', record[1:]))
+        if removed:
+            store.compact([row for row in range(len(store)) if row not in removed])
+        # После оборванной записи дописывать нельзя: новые записи оказались бы за мусором
+        return store, bool(records) or not complete
+
+    def _read_records(self, snapshot: tuple[int, int]) -> tuple[list[bytes], bool]|None:
+        """
+        Целые записи журнала и признак того, что журнал прочитан до конца
+
+        Returns:
+            tuple[list[bytes], bool]|None: Записи и False, если чтение остановилось на оборванной
+                или испорченной записи; None, если журнала нет или он относится к другому снимку
+        """
+        if not os.path.exists(self.journal_path):
+            return None
+        with open(self.journal_path, 'rb') as file:
+            header = file.read(self.HEADER.size)
+            if len(header) != self.HEADER.size:
+                return None
+            magic, version, dish_count, crc = self.HEADER.unpack(header)
+            if magic != self.MAGIC or version != self.VERSION or (dish_count, crc) != snapshot:
+                return None
+            records = []
+            while True:
+                frame = file.read(self.RECORD.size)
+                if not frame:
+                    return records, True
+                if len(frame) != self.RECORD.size:
+                    return records, False
+                size, crc = self.RECORD.unpack(frame)
+                record = file.read(size)
+                # Оборванная или испорченная запись: всё после неё не применяется
+                if len(record) != size or zlib.crc32(record) != crc:
+                    return records, False
+                records.append(record)
+
+    def compact(self) -> None:
+        """Сворачивание журнала: запись нового снимка меню и пустого журнала к нему"""
+        store = ColumnarDishStore(self.menu_manager.view())
+        buffer = io.BytesIO()
+        MenuBinaryFormat.write(store, buffer)
+        data = buffer.getvalue()
+        header = self.HEADER.pack(self.MAGIC, self.VERSION, len(store), zlib.crc32(data))
+
+        if self._file is not None:
+            self._file.close()
+        # Сначала снимок, затем журнал: между заменами старый журнал не подходит к новому снимку
+        write_atomic(self.path, lambda file: file.write(data), "full")
+        write_atomic(self.journal_path, lambda file: file.write(header), "full")
+        self._snapshot_size = len(data)
+        self._ids = self._live_ids()
+        self._file = open(self.journal_path, 'ab')
+
+    def _live_ids(self) -> array:
+        """Идентификаторы блюд меню по порядку (номера журнала после снимка)"""
+        return array('q', map(self.menu_manager.slot_id, self.menu_manager.live_slots()))
+
+    def _append(self, record: bytes) -> None:
+        """Дописывание записи в журнал и сворачивание слишком длинного журнала"""
+        self._file.write(self.RECORD.pack(len(record), zlib.crc32(record)) + record)
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        size = self._file.tell()
+        if size >= self.compact_min_bytes and size > self._snapshot_size:
+            self.compact()
+
+    def rows_inserted(self, first: int, last: int) -> None:
+        """Запись добавленных блюд"""
+        if self._held:
+            self._pending = True
+            return
+        slots = range(first, last + 1)
+        self._ids.extend(map(self.menu_manager.slot_id, slots))
+        self._append(self.ADD + self._pack_dishes(map(self.menu_manager.dish_in_slot, slots)))
+
+    def rows_removed(self, rows: Sequence[int]) -> None:
+        """Запись удаления блюд"""
+        if self._held:
+            self._pending = True
+            return
+        numbers = array('q', (bisect_left(self._ids, self.menu_manager.slot_id(slot)) for slot in rows))
+        self._append(self.DELETE + MenuBinaryFormat._to_bytes(numbers))
+
+    def menu_reset(self) -> None:
+        """Меню заменено целиком: вместо записей сразу новый снимок"""
+        if self._held:
+            self._pending = True
+            return
+        self.compact()
+
+    @classmethod
+    def _pack_dishes(cls, dishes: Iterable[DishBase]) -> bytes:
+        """Упаковка блюд для записи "A" """
+        parts = []
+        for dish in dishes:
+            name = dish.name.encode('utf-8')
+            parts.append(cls.DISH.pack(dish.price, dish.prep_time.hour * 60 + dish.prep_time.minute, len(name)))
+            parts.append(name)
+        return b"".join(parts)
+
+    @classmethod
+    def _unpack_dishes(cls, record: bytes) -> Iterator[tuple[str, float, int]]:
+        """Блюда записи "A": название, цена, минуты"""
+        position = 1
+        while position < len(record):
+            price, minutes, size = cls.DISH.unpack_from(record, position)
+            position += cls.DISH.size
+            yield record[position:position + size].decode('utf-8'), price, minutes
+            position += size
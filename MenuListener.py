@@ -0,0 +1,32 @@
+from collections.abc import Sequence
+
+class MenuListener:
+    """
+    Интерфейс наблюдателя за изменениями меню (по умолчанию ничего не делает)
+    
+    Строки в оповещениях — слоты хранилища MenuManager: новые блюда
+    занимают слоты в конце, удалённые остаются на месте до уплотнения
+    хранилища, поэтому номер строки блюда не меняется между menu_reset
+    и menu_compacted.
+    """
+    
+    def rows_about_to_be_inserted(self, first: int, last: int) -> None:
+        """Вызывается перед вставкой строк first..last"""
+    
+    def rows_inserted(self, first: int, last: int) -> None:
+        """Вызывается после вставки строк first..last"""
+    
+    def rows_about_to_be_removed(self, rows: Sequence[int]) -> None:
+        """Вызывается перед удалением строк rows (по возрастанию)"""
+    
+    def rows_removed(self, rows: Sequence[int]) -> None:
+        """Вызывается после удаления строк rows (по возрастанию)"""
+    
+    def menu_about_to_be_reset(self) -> None:
+        """Вызывается перед полной заменой меню"""
+    
+    def menu_reset(self) -> None:
+        """Вызывается после полной замены меню"""
+    
+    def menu_compacted(self, rows: Sequence[int]) -> None:
+        """Вызывается после уплотнения хранилища: новая строка i — прежняя строка rows[i]"""
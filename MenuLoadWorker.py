@@ -0,0 +1,81 @@
+from PyQt6.QtCore import QObject, pyqtSignal
+from MenuFileHandler import MenuFileHandler
+from MenuWriteQueue import MenuWriteQueue
+
+class MenuLoadWorker(QObject):
+    """
+    Фоновая загрузка меню из файла пакетами (выполняется в отдельном QThread)
+    
+    Загруженные блюда ставятся в очередь изменений меню (MenuWriteQueue):
+    первый пакет заменяет прежнее меню, следующие добавляются к нему,
+    поэтому при ошибке чтения до первых данных меню остаётся прежним.
+    Сигнал finished отправляется после всех изменений и приходит уже
+    после их выполнения.
+    """
+    
+    progress_changed = pyqtSignal(int)
+    finished = pyqtSignal(bool)
+    failed = pyqtSignal(str)
+    
+    def __init__(self, file_handler: MenuFileHandler, write_queue: MenuWriteQueue, filename: str,
+                 mapped: bool = False):
+        """
+        Инициализация загрузчика
+        
+        Args:
+            file_handler (MenuFileHandler): Обработчик файлов меню
+            write_queue (MenuWriteQueue): Очередь изменений меню, которое заменяется загруженным
+            filename (str): Путь к файлу
+            mapped (bool): Открыть файл через MappedDishStore вместо полной загрузки
+        """
+        super().__init__()
+        self.file_handler = file_handler
+        self.write_queue = write_queue
+        self.filename = filename
+        self.mapped = mapped
+        self._cancelled = False
+    
+    def cancel(self) -> None:
+        """Запрос на отмену загрузки"""
+        self._cancelled = True
+    
+    def is_cancelled(self) -> bool:
+        """Проверка, была ли запрошена отмена"""
+        return self._cancelled
+    
+    def run(self) -> None:
+        """Загрузка файла с постановкой пакетов блюд в очередь изменений меню"""
+        try:
+            if self.file_handler.is_binary(self.filename):
+                self._use_storage(self.file_handler.load_snapshot(self.filename))
+            elif self.file_handler.is_database(self.filename):
+                self._use_storage(self.file_handler.open_database(self.filename))
+            elif self.mapped:
+                self._use_storage(self.file_handler.map_menu(
+                    self.filename, progress=self._report_progress, is_cancelled=self.is_cancelled
+                ))
+            else:
+                replaced = False
+                for batch in self.file_handler.iter_menu_batches(
+                    self.filename, progress=self._report_progress, is_cancelled=self.is_cancelled
+                ):
+                    if replaced:
+                        self.write_queue.add_dishes(batch)
+                    else:
+                        self.write_queue.submit(lambda menu_manager, dishes=batch: menu_manager.replace_menu(dishes))
+                        replaced = True
+                if not replaced and not self._cancelled:
+                    # Пустой файл тоже заменяет меню
+                    self.write_queue.submit(lambda menu_manager: menu_manager.clear_menu())
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        self.finished.emit(self._cancelled)
+    
+    def _use_storage(self, storage) -> None:
+        """Постановка в очередь замены хранилища меню загруженным целиком (снимок, база, отображённый файл)"""
+        self.write_queue.submit(lambda menu_manager: menu_manager.use_storage(storage))
+    
+    def _report_progress(self, done: int, total: int) -> None:
+        """Пересчёт прогресса в проценты"""
+        self.progress_changed.emit(100 if total == 0 else done * 100 // total)
@@ -0,0 +1,583 @@
+from array import array
+from bisect import bisect_left
+from collections.abc import Callable, Iterable, Sequence
+from contextlib import AbstractContextManager
+from functools import wraps
+from itertools import compress
+from DishBase import DishBase
+from MenuIndex import MenuIndex
+from MenuListener import MenuListener
+from MenuNameIndex import MenuNameIndex
+from MenuMetrics import MenuMetrics, timed
+from ReadWriteLock import ReadWriteLock
+
+# Хранилище уплотняется, когда удалённых слотов не меньше порога и доли 1/COMPACT_RATIO
+COMPACT_MIN_REMOVED = 10_000
+COMPACT_RATIO = 4
+# Какое из блюд с одинаковым названием остаётся при upsert и dedupe
+UPSERT_POLICIES = ("keep_first", "keep_last", "min_price")
+
+def _reads(method):
+    """Метод MenuManager под блокировкой на чтение"""
+    @wraps(method)
+    def locked(self, *args, **kwargs):
+        self._lock.acquire_read()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            self._lock.release_read()
+    return locked
+
+def _writes(method):
+    """Метод MenuManager под блокировкой на запись"""
+    @wraps(method)
+    def locked(self, *args, **kwargs):
+        self._lock.acquire_write()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            self._lock.release_write()
+    return locked
+
+class MenuView(Sequence):
+    """Представление меню только для чтения, не копирующее список блюд"""
+    
+    def __init__(self, menu_manager: "MenuManager", slots: bool = False):
+        """
+        Инициализация представления
+        
+        Args:
+            menu_manager (MenuManager): Менеджер меню
+            slots (bool): Обращаться к слотам хранилища, включая удалённые блюда
+                (так меню видит MenuIndex), а не к позициям оставшихся блюд
+        """
+        self._menu_manager = menu_manager
+        self._slots = slots
+    
+    @property
+    def version(self) -> int:
+        """Получить номер версии меню"""
+        return self._menu_manager.version
+    
+    def __len__(self) -> int:
+        """Получение количества блюд"""
+        if self._slots:
+            return len(self._menu_manager.storage)
+        return len(self._menu_manager)
+    
+    def __getitem__(self, index):
+        """Получение блюда (или списка блюд для среза) без копирования всего меню"""
+        if self._slots:
+            return self._menu_manager.storage[index]
+        if isinstance(index, slice):
+            return [self._menu_manager.dish_at(i) for i in range(*index.indices(len(self)))]
+        return self._menu_manager.dish_at(index)
+    
+    def storage_slots(self) -> tuple[Sequence[DishBase], Sequence[int]]:
+        """
+        Хранилище и слоты блюд представления по порядку (для чтения столбцов без создания блюд)
+        
+        Returns:
+            tuple[Sequence[DishBase], Sequence[int]]: Хранилище и номера его слотов
+        """
+        storage = self._menu_manager.storage
+        if self._slots or len(self._menu_manager) == len(storage):
+            return storage, range(len(storage))
+        return storage, self._menu_manager.live_slots()
+
+class MenuManager:
+    """
+    Класс для управления меню ресторана
+    
+    Каждое блюдо получает постоянный идентификатор. Блюда лежат в слотах
+    хранилища; удаление только помечает слот (tombstone), а хранилище
+    уплотняется, когда помеченных слотов становится слишком много.
+    Идентификаторы выдаются по возрастанию и уплотнение сохраняет порядок
+    слотов, поэтому слот блюда по идентификатору находится двоичным поиском
+    в массиве идентификаторов без отдельной хеш-таблицы, а до первого
+    уплотнения — просто вычитанием первого идентификатора.
+    
+    Методы безопасны для нескольких потоков: изменения идут под блокировкой
+    на запись, чтения — на чтение (ReadWriteLock), наблюдатели оповещаются
+    в потоке изменения под той же блокировкой. Несколько изменений подряд
+    без промежуточных состояний делаются в transaction(), согласованное
+    чтение нескольких значений — в read(). Номера слотов (slot_id,
+    dish_in_slot) действительны до следующего изменения, поэтому вне
+    потока-владельца (например, потока интерфейса, см. MenuWriteQueue) ими
+    пользуются только внутри read().
+    
+    Блюда можно добавлять без повторов названий (upsert_dish, upsert_many):
+    хеш-индекс названий names (MenuNameIndex) находит блюдо с тем же
+    названием за O(1), поэтому загрузка миллиона блюд с повторами идёт за
+    линейное время.
+    
+    Если задан metrics (MenuMetrics), учитывается время изменений
+    (manager.*), число добавленных и удалённых блюд и копии меню целиком.
+    """
+    
+    # Удаление стольких блюд обновляет список оставшихся слотов на месте, а не сбрасывает его
+    LIVE_UPDATE_LIMIT = 100
+    
+    def __init__(self, storage_factory: Callable[[Iterable[DishBase]], Sequence[DishBase]] = list,
+                 metrics: MenuMetrics|None = None):
+        """
+        Инициализация пустого меню
+        
+        Args:
+            storage_factory (Callable): Создаёт хранилище блюд из набора блюд (list, ColumnarDishStore...)
+            metrics (MenuMetrics|None): Сбор метрик (None — без замеров)
+        """
+        self.storage_factory = storage_factory
+        self.metrics = metrics
+        self.storage = storage_factory(())
+        self.version = 0
+        self._next_id = 0
+        # Идентификаторы блюд по слотам (по возрастанию) и отметки удалённых слотов
+        self._ids = array('q')
+        self._removed = bytearray()
+        self._removed_count = 0
+        # Слоты оставшихся блюд по порядку; строится по требованию, пока есть удалённые слоты
+        self._live = None
+        # Индекс подписан первым, чтобы наблюдатели уже видели его обновлённым
+        self.index = MenuIndex(self.view(slots=True))
+        self.names = MenuNameIndex(self)
+        self._listeners = [self.index, self.names]
+        self._lock = ReadWriteLock()
+    
+    @property
+    def dishes(self) -> MenuView:
+        """Блюда меню по порядку (без удалённых), без копирования"""
+        return self.view()
+    
+    @_writes
+    def add_listener(self, listener: MenuListener) -> None:
+        """
+        Подписка на изменения меню
+        
+        Args:
+            listener (MenuListener): Наблюдатель
+        """
+        self._listeners.append(listener)
+    
+    @_writes
+    def remove_listener(self, listener: MenuListener) -> None:
+        """
+        Отписка от изменений меню
+        
+        Args:
+            listener (MenuListener): Наблюдатель
+        """
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+    
+    def _notify(self, event: str, *args) -> None:
+        """Оповещение всех наблюдателей о событии"""
+        for listener in self._listeners:
+            getattr(listener, event)(*args)
+    
+    @_reads
+    def __len__(self) -> int:
+        """Получение количества блюд в меню"""
+        return len(self._ids) - self._removed_count
+    
+    def add_dish(self, dish: DishBase) -> int:
+        """
+        Добавление блюда в меню
+        
+        Args:
+            dish (DishBase): Блюдо для добавления
+        
+        Returns:
+            int: Идентификатор блюда
+        """
+        return self.add_dishes([dish])[0]
+    
+    @_writes
+    @timed("manager.add_dishes")
+    def add_dishes(self, dishes: Iterable[DishBase]) -> range:
+        """
+        Пакетное добавление блюд с одним оповещением наблюдателей
+        
+        Args:
+            dishes (Iterable[DishBase]): Блюда для добавления
+        
+        Returns:
+            range: Идентификаторы добавленных блюд
+        """
+        dishes = list(dishes)
+        ids = range(self._next_id, self._next_id + len(dishes))
+        if not dishes:
+            return ids
+        first = len(self._ids)
+        last = first + len(dishes) - 1
+        self._notify("rows_about_to_be_inserted", first, last)
+        self.storage.extend(dishes)
+        self._ids.extend(ids)
+        self._removed.extend(bytes(len(dishes)))
+        if self._live is not None:
+            self._live.extend(range(first, last + 1))
+        self._next_id = ids.stop
+        self.version += 1
+        self._notify("rows_inserted", first, last)
+        if self.metrics is not None:
+            self.metrics.count("manager.added", len(dishes))
+        return ids
+    
+    @staticmethod
+    def _replaces(new: DishBase, old: DishBase, policy: str) -> bool:
+        """Проверка, вытесняет ли блюдо new блюдо old с тем же названием по правилу policy"""
+        if policy == "keep_last":
+            return True
+        if policy == "min_price":
+            return new.price < old.price
+        return False
+    
+    @staticmethod
+    def _check_policy(policy: str) -> None:
+        """Проверка правила для одинаковых названий"""
+        if policy not in UPSERT_POLICIES:
+            raise ValueError(f"Неизвестное правило для одинаковых названий: {policy}")
+    
+    def upsert_dish(self, dish: DishBase, policy: str = "keep_last") -> int:
+        """
+        Добавление блюда или замена блюда с тем же названием
+        
+        Args:
+            dish (DishBase): Блюдо
+            policy (str): Правило для одинаковых названий (см. upsert_many)
+        
+        Returns:
+            int: Идентификатор блюда с этим названием, оставшегося в меню
+        """
+        with self.transaction():
+            self.upsert_many([dish], policy)
+            return self.names.get(dish.name)
+    
+    @_writes
+    @timed("manager.upsert_many")
+    def upsert_many(self, dishes: Iterable[DishBase], policy: str = "keep_last") -> tuple[int, int]:
+        """
+        Пакетное добавление блюд без повторов названий за линейное время
+        
+        Названия сравниваются без учёта регистра и «ё». Из блюд с одним
+        названием остаётся первое (keep_first), последнее (keep_last) или
+        самое дешёвое, при равной цене — более раннее (min_price); это
+        касается и повторов внутри пакета, и блюд, уже бывших в меню.
+        Вытесненное блюдо меню удаляется, а новое добавляется в конец с новым
+        идентификатором — так изменение видят наблюдатели и журнал. Повторы,
+        уже добавленные add_dishes, не удаляются (см. dedupe).
+        
+        Args:
+            dishes (Iterable[DishBase]): Блюда
+            policy (str): Правило для одинаковых названий (см. UPSERT_POLICIES)
+        
+        Returns:
+            tuple[int, int]: Количество новых названий и количество заменённых блюд
+        
+        Raises:
+            ValueError: Неизвестное правило
+        """
+        self._check_policy(policy)
+        # Победители пакета по ключам названий в порядке первого появления
+        winners = {}
+        for dish in dishes:
+            key = MenuIndex.name_key(dish.name)
+            current = winners.get(key)
+            if current is None or self._replaces(dish, current, policy):
+                winners[key] = dish
+        added = []
+        replaced_ids = []
+        for dish in winners.values():
+            dish_id = self.names.get(dish.name)
+            if dish_id is None:
+                added.append(dish)
+            elif self._replaces(dish, self.dish_by_id(dish_id), policy):
+                replaced_ids.append(dish_id)
+                added.append(dish)
+        self.delete_many(replaced_ids)
+        self.add_dishes(added)
+        return len(added) - len(replaced_ids), len(replaced_ids)
+    
+    @_writes
+    @timed("manager.dedupe")
+    def dedupe(self, policy: str = "keep_first") -> int:
+        """
+        Удаление повторов названий за один проход по меню
+        
+        Args:
+            policy (str): Какое блюдо с названием остаётся (см. upsert_many)
+        
+        Returns:
+            int: Количество удалённых блюд
+        
+        Raises:
+            ValueError: Неизвестное правило
+        """
+        self._check_policy(policy)
+        if not self.names.has_duplicates():
+            return 0
+        slots = self.live_slots()
+        winners = {}
+        losers = []
+        for slot, key in zip(slots, self.names.slot_keys(slots)):
+            best = winners.get(key)
+            if best is None:
+                winners[key] = slot
+            elif policy == "keep_last" or (
+                    policy == "min_price" and self.storage[slot].price < self.storage[best].price):
+                losers.append(best)
+                winners[key] = slot
+            else:
+                losers.append(slot)
+        return self.delete_many(map(self._ids.__getitem__, losers))
+    
+    @_writes
+    def delete_dish(self, index: int) -> None:
+        """
+        Удаление блюда по индексу
+        
+        Args:
+            index (int): Индекс блюда
+        """
+        if 0 <= index < len(self):
+            self.delete_many([self.dish_id(index)])
+    
+    @_writes
+    @timed("manager.delete_many")
+    def delete_many(self, dish_ids: Iterable[int]) -> int:
+        """
+        Удаление блюд по идентификаторам с одним оповещением наблюдателей
+        
+        Args:
+            dish_ids (Iterable[int]): Идентификаторы блюд; неизвестные пропускаются
+        
+        Returns:
+            int: Количество удалённых блюд
+        """
+        slots = sorted({slot for slot in map(self.slot_of, dish_ids) if slot is not None})
+        if not slots:
+            return 0
+        self._notify("rows_about_to_be_removed", slots)
+        for slot in slots:
+            self._removed[slot] = 1
+        if hasattr(self.storage, "mark_removed"):
+            # Хранилище на диске (SqliteDishStore) сразу сохраняет удаление
+            self.storage.mark_removed(slots)
+        self._removed_count += len(slots)
+        if self._live is not None and len(slots) <= self.LIVE_UPDATE_LIMIT:
+            for slot in reversed(slots):
+                del self._live[bisect_left(self._live, slot)]
+        else:
+            self._live = None
+        self.version += 1
+        self._notify("rows_removed", slots)
+        if self.metrics is not None:
+            self.metrics.count("manager.deleted", len(slots))
+        if self._removed_count >= max(COMPACT_MIN_REMOVED, len(self._ids) // COMPACT_RATIO):
+            self.compact()
+        return len(slots)
+    
+    @_writes
+    @timed("manager.compact")
+    def compact(self) -> None:
+        """Уплотнение хранилища: физическое удаление помеченных слотов"""
+        if not self._removed_count:
+            return
+        slots = self.live_slots()
+        if hasattr(self.storage, "compact"):
+            self.storage.compact(slots)
+        else:
+            self.storage[:] = [self.storage[slot] for slot in slots]
+        self._ids = array('q', map(self._ids.__getitem__, slots))
+        self._removed = bytearray(len(slots))
+        self._removed_count = 0
+        self._live = None
+        self._notify("menu_compacted", slots)
+    
+    def clear_menu(self) -> None:
+        """Очистка всего меню"""
+        self.replace_menu([])
+    
+    def replace_menu(self, dishes: Iterable[DishBase]) -> None:
+        """
+        Полная замена содержимого меню с одним оповещением наблюдателей
+        
+        Args:
+            dishes (Iterable[DishBase]): Новые блюда
+        """
+        storage = self.storage_factory(dishes)
+        self._count_copy(len(storage))
+        self.use_storage(storage)
+    
+    @_writes
+    @timed("manager.use_storage")
+    def use_storage(self, storage) -> None:
+        """
+        Замена хранилища блюд (список, MappedDishStore, SqliteDishStore и т.п.) с одним оповещением наблюдателей
+        
+        Args:
+            storage: Изменяемая последовательность блюд с методами append и extend
+        """
+        self._notify("menu_about_to_be_reset")
+        old_storage = self.storage
+        self.storage = storage
+        self._ids = array('q', range(self._next_id, self._next_id + len(storage)))
+        self._next_id += len(storage)
+        self._removed = bytearray(len(storage))
+        self._removed_count = 0
+        self._live = None
+        self.version += 1
+        self._notify("menu_reset")
+        if hasattr(old_storage, "close"):
+            old_storage.close()
+    
+    @_reads
+    def get_menu(self) -> list[DishBase]:
+        """Получение копии меню"""
+        dishes = list(self.view())
+        self._count_copy(len(dishes))
+        return dishes
+    
+    def _count_copy(self, size: int) -> None:
+        """Учёт копии меню целиком в метриках"""
+        if self.metrics is not None:
+            self.metrics.count("manager.copies")
+            self.metrics.count("manager.copied_dishes", size)
+    
+    @_reads
+    def live_slots(self) -> array:
+        """
+        Слоты оставшихся блюд по порядку
+        
+        Returns:
+            array: Новый массив номеров слотов
+        """
+        if not self._removed_count:
+            return array('q', range(len(self._ids)))
+        return array('q', compress(range(len(self._ids)), map((0).__eq__, self._removed)))
+    
+    def _slot_at(self, index: int) -> int:
+        """Слот блюда по его позиции среди оставшихся блюд"""
+        if not self._removed_count:
+            return index
+        if self._live is None:
+            self._live = self.live_slots()
+        return self._live[index]
+    
+    @_reads
+    def slot_of(self, dish_id: int) -> int|None:
+        """
+        Слот блюда по идентификатору
+        
+        Args:
+            dish_id (int): Идентификатор блюда
+        
+        Returns:
+            int|None: Номер слота или None, если блюда нет в меню
+        """
+        if self._ids and self._ids[-1] - self._ids[0] == len(self._ids) - 1:
+            # Идентификаторы идут подряд: уплотнений ещё не было
+            slot = dish_id - self._ids[0]
+        else:
+            slot = bisect_left(self._ids, dish_id)
+        if 0 <= slot < len(self._ids) and self._ids[slot] == dish_id and not self._removed[slot]:
+            return slot
+        return None
+    
+    def slot_id(self, slot: int) -> int:
+        """
+        Идентификатор блюда в слоте
+        
+        Args:
+            slot (int): Номер слота
+        
+        Returns:
+            int: Идентификатор блюда
+        """
+        return self._ids[slot]
+    
+    @_reads
+    def dish_id(self, index: int) -> int:
+        """
+        Идентификатор блюда по индексу
+        
+        Args:
+            index (int): Индекс блюда
+        
+        Returns:
+            int: Идентификатор блюда
+        """
+        return self._ids[self._slot_at(index)]
+    
+    @_reads
+    def dish_by_id(self, dish_id: int) -> DishBase:
+        """
+        Получение блюда по идентификатору
+        
+        Args:
+            dish_id (int): Идентификатор блюда
+        
+        Returns:
+            DishBase: Блюдо
+        
+        Raises:
+            KeyError: Блюда с таким идентификатором нет в меню
+        """
+        slot = self.slot_of(dish_id)
+        if slot is None:
+            raise KeyError(dish_id)
+        return self.storage[slot]
+    
+    @_reads
+    def dish_at(self, index: int) -> DishBase:
+        """
+        Получение блюда по индексу без копирования меню
+        
+        Args:
+            index (int): Индекс блюда
+        
+        Returns:
+            DishBase: Блюдо
+        """
+        return self.storage[self._slot_at(index)]
+    
+    def dish_in_slot(self, slot: int) -> DishBase:
+        """
+        Получение блюда по номеру слота хранилища
+        
+        Args:
+            slot (int): Номер слота
+        
+        Returns:
+            DishBase: Блюдо
+        """
+        return self.storage[slot]
+    
+    def read(self) -> AbstractContextManager:
+        """
+        Согласованное чтение: блок with, в котором меню не меняется
+        
+        Returns:
+            AbstractContextManager: Блокировка меню на чтение
+        """
+        return self._lock.read()
+    
+    def transaction(self) -> AbstractContextManager:
+        """
+        Пакет изменений: блок with, изменения которого другие потоки видят только целиком
+        
+        Наблюдатели получают события каждого изменения по порядку внутри блока.
+        
+        Returns:
+            AbstractContextManager: Блокировка меню на запись
+        """
+        return self._lock.write()
+    
+    def view(self, slots: bool = False) -> MenuView:
+        """
+        Получение представления меню только для чтения
+        
+        Args:
+            slots (bool): Представление слотов хранилища (см. MenuView)
+        """
+        return MenuView(self, slots)
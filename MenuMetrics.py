@@ -0,0 +1,166 @@
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from functools import wraps
+
+# Сколько функций показывается в отчёте профилировщика и мест выделения памяти в отчёте tracemalloc
+PROFILE_REPORT_LINES = 30
+MEMORY_REPORT_LINES = 15
+
+def timed(name: str):
+    """
+    Метод объекта с атрибутом metrics, время которого учитывается в таймере name
+
+    Пока metrics равен None, метод вызывается без замеров.
+    """
+    def decorator(method):
+        @wraps(method)
+        def measured(self, *args, **kwargs):
+            metrics = self.metrics
+            if metrics is None:
+                return method(self, *args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                metrics.add_time(name, time.perf_counter() - start)
+        return measured
+    return decorator
+
+class MenuMetrics:
+    """
+    Счётчики и таймеры горячих путей меню
+
+    Сбор включается явно: MenuFileHandler, MenuManager, MenuTableModel и
+    Logger получают объект метрик в атрибут metrics (по умолчанию None, и
+    тогда всё, что стоит замер, — одна проверка на None). Значения
+    накапливаются из любых потоков; snapshot() возвращает их копию в виде
+    словаря, пригодного для JSON.
+
+    Имена счётчиков и таймеров начинаются с подсистемы: file.*, parse.*,
+    manager.*, model.*, view.*, logger.*. Таймер хранит число замеров,
+    суммарное и наибольшее время.
+
+    Дополнительно можно снять профиль cProfile и статистику выделения
+    памяти tracemalloc между start_profiling() и stop_profiling().
+    cProfile видит только поток, в котором профилирование запущено;
+    tracemalloc учитывает все потоки.
+    """
+
+    def __init__(self):
+        """Инициализация пустых счётчиков"""
+        self._lock = threading.Lock()
+        self.counters = {}
+        # Имя таймера -> [число замеров, суммарное время, наибольшее время] (в секундах)
+        self.timers = {}
+        self._profiler = None
+        self._tracing_memory = False
+
+    def count(self, name: str, value: int = 1) -> None:
+        """
+        Увеличение счётчика
+
+        Args:
+            name (str): Имя счётчика
+            value (int): Прибавляемое значение
+        """
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def add_time(self, name: str, seconds: float) -> None:
+        """
+        Учёт одного замера таймера
+
+        Args:
+            name (str): Имя таймера
+            seconds (float): Время (в секундах)
+        """
+        with self._lock:
+            timer = self.timers.get(name)
+            if timer is None:
+                self.timers[name] = [1, seconds, seconds]
+            else:
+                timer[0] += 1
+                timer[1] += seconds
+                if seconds > timer[2]:
+                    timer[2] = seconds
+
+    @contextmanager
+    def timer(self, name: str) -> Iterator[None]:
+        """Замер времени блока with таймером name"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+
+    def snapshot(self) -> dict:
+        """
+        Текущие значения метрик
+
+        Returns:
+            dict: {"counters": {имя: значение}, "timers": {имя: {"count", "total", "max", "mean"}},
+                "profiling": идёт ли профилирование}
+        """
+        with self._lock:
+            counters = dict(self.counters)
+            timers = {name: {"count": count, "total": total, "max": longest, "mean": total / count}
+                      for name, (count, total, longest) in self.timers.items()}
+        return {"counters": counters, "timers": timers, "profiling": self.is_profiling()}
+
+    def reset(self) -> None:
+        """Обнуление счётчиков и таймеров"""
+        with self._lock:
+            self.counters.clear()
+            self.timers.clear()
+
+    def is_profiling(self) -> bool:
+        """Проверка, идёт ли профилирование"""
+        return self._profiler is not None or self._tracing_memory
+
+    def start_profiling(self, memory: bool = False) -> None:
+        """
+        Запуск профилирования текущего потока (cProfile) и, по желанию, выделений памяти (tracemalloc)
+
+        Args:
+            memory (bool): Учитывать выделения памяти
+
+        Raises:
+            RuntimeError: Профилирование уже идёт
+        """
+        if self.is_profiling():
+            raise RuntimeError("Профилирование уже запущено")
+        # Профилировщики нужны только при отладке и не импортируются заранее
+        import cProfile
+        self._profiler = cProfile.Profile()
+        if memory:
+            import tracemalloc
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._tracing_memory = True
+        self._profiler.enable()
+
+    def stop_profiling(self) -> str:
+        """
+        Остановка профилирования
+
+        Returns:
+            str: Отчёт: самые затратные функции и, если учитывалась память, места наибольших выделений
+        """
+        import io
+        import pstats
+        report = io.StringIO()
+        if self._profiler is not None:
+            self._profiler.disable()
+            pstats.Stats(self._profiler, stream=report).sort_stats("cumulative").print_stats(PROFILE_REPORT_LINES)
+            self._profiler = None
+        if self._tracing_memory:
+            import tracemalloc
+            snapshot = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+            self._tracing_memory = False
+            report.write("Наибольшие выделения памяти:\n")
+            for statistic in snapshot.statistics("lineno")[:MEMORY_REPORT_LINES]:
+                report.write(f"{statistic}\n")
+        return report.getvalue()
@@ -0,0 +1,134 @@
+from collections.abc import Iterable, Iterator, Sequence
+from typing import TYPE_CHECKING
+from MenuIndex import MenuIndex
+from MenuListener import MenuListener
+
+if TYPE_CHECKING:
+    from MenuManager import MenuManager
+
+class MenuNameIndex(MenuListener):
+    """
+    Хеш-индекс названий меню: ключ названия (MenuIndex.name_key) -> идентификатор блюда
+
+    Для каждого ключа запоминается первое оставшееся блюдо с ним, а блюда
+    с уже известным ключом (повторы, добавленные add_dishes) только
+    подсчитываются. Идентификаторы не меняются при уплотнении хранилища,
+    поэтому индекс обновляется только при добавлении и удалении блюд.
+    Пока повторов нет, удаление блюда убирает его ключ на месте; если
+    удаляется блюдо, у ключа которого есть повторы, и после полной замены
+    меню индекс перестраивается при следующем запросе за один проход.
+    """
+
+    def __init__(self, menu_manager: "MenuManager"):
+        """
+        Инициализация индекса
+
+        Args:
+            menu_manager (MenuManager): Менеджер меню (хранилище, слоты и идентификаторы блюд)
+        """
+        self._menu_manager = menu_manager
+        self._ids = {}
+        # Количество оставшихся блюд, ключ которых уже записан за другим блюдом
+        self._shadowed = 0
+        self._stale = True
+        # Ключи названий ColumnarDishStore по номерам названий (см. slot_keys) и хранилище, к которому они относятся
+        self._name_keys = []
+        self._keys_storage = None
+
+    def slot_keys(self, slots: Iterable[int]) -> Iterator[str]:
+        """
+        Ключи названий блюд в слотах хранилища менеджера
+
+        Для ColumnarDishStore блюда не создаются, а ключи запоминаются по
+        номерам названий хранилища: ключ считается один раз на уникальное
+        название, и добавление блюд дополняет таблицу только новыми названиями.
+
+        Args:
+            slots (Iterable[int]): Номера слотов
+
+        Yields:
+            str: Ключ названия блюда слота
+        """
+        storage = self._menu_manager.storage
+        if hasattr(storage, "columns"):
+            names, name_refs, _, _ = storage.columns()
+            if self._keys_storage is not storage:
+                self._keys_storage = storage
+                self._name_keys = []
+            keys = self._name_keys
+            if len(keys) < len(names):
+                keys.extend(map(MenuIndex.name_key, names[len(keys):]))
+            for slot in slots:
+                yield keys[name_refs[slot]]
+        else:
+            for slot in slots:
+                yield MenuIndex.name_key(storage[slot].name)
+
+    def _rebuild(self) -> None:
+        """Построение индекса по оставшимся блюдам меню"""
+        manager = self._menu_manager
+        slots = manager.live_slots()
+        self._ids = {}
+        for slot, key in zip(slots, self.slot_keys(slots)):
+            self._ids.setdefault(key, manager.slot_id(slot))
+        self._shadowed = len(slots) - len(self._ids)
+        self._stale = False
+
+    def __len__(self) -> int:
+        """Получение количества различных ключей названий"""
+        if self._stale:
+            self._rebuild()
+        return len(self._ids)
+
+    def get(self, name: str) -> int|None:
+        """
+        Идентификатор первого блюда с таким названием
+
+        Args:
+            name (str): Название (сравнивается без учёта регистра и «ё»)
+
+        Returns:
+            int|None: Идентификатор блюда или None, если такого названия нет
+        """
+        if self._stale:
+            self._rebuild()
+        return self._ids.get(MenuIndex.name_key(name))
+
+    def has_duplicates(self) -> bool:
+        """Проверка, есть ли в меню повторы названий"""
+        if self._stale:
+            self._rebuild()
+        return self._shadowed > 0
+
+    def rows_inserted(self, first: int, last: int) -> None:
+        """Запись ключей добавленных блюд"""
+        if self._stale:
+            return
+        manager = self._menu_manager
+        slots = range(first, last + 1)
+        for slot, key in zip(slots, self.slot_keys(slots)):
+            if key in self._ids:
+                self._shadowed += 1
+            else:
+                self._ids[key] = manager.slot_id(slot)
+
+    def rows_removed(self, rows: Sequence[int]) -> None:
+        """Удаление ключей удалённых блюд (при повторах индекс перестраивается позже)"""
+        if self._stale:
+            return
+        manager = self._menu_manager
+        for slot, key in zip(rows, self.slot_keys(rows)):
+            if self._ids.get(key) != manager.slot_id(slot):
+                self._shadowed -= 1
+            elif self._shadowed:
+                # Ключ может перейти к повтору, который без полного прохода не найти
+                self._stale = True
+                return
+            else:
+                del self._ids[key]
+
+    def menu_reset(self) -> None:
+        """Меню заменено: индекс будет перестроен при следующем запросе"""
+        self._stale = True
+        self._name_keys = []
+        self._keys_storage = None
@@ -0,0 +1,159 @@
+import datetime
+from collections import OrderedDict
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
+from DishBase import DishBase
+from MenuMetrics import MenuMetrics
+from MenuRowSource import MenuRowSource
+from MenuTableModel import MenuTableModel
+
+class MenuPagedTableModel(QAbstractTableModel):
+    """
+    Модель Qt только для чтения поверх источника строк с подгрузкой по требованию
+
+    Модель открывается пустой и узнаёт о строках страницами по PAGE_SIZE
+    через canFetchMore/fetchMore, когда представление докручено до конца
+    известных строк; при этом блюда не создаются. Блюда страницы
+    читаются из источника (MenuRowSource) при первом обращении к её
+    ячейкам, в памяти держится не больше CACHED_PAGES страниц.
+
+    Если задан metrics (MenuMetrics), учитываются вызовы data()
+    (model.data_calls) и прочитанные из источника страницы (model.pages_loaded).
+    """
+
+    # Сколько строк модель узнаёт за один fetchMore и читает из источника за раз
+    PAGE_SIZE = 1000
+    # Сколько прочитанных страниц хранится в памяти
+    CACHED_PAGES = 32
+
+    def __init__(self, source: MenuRowSource, parent=None, metrics: MenuMetrics|None = None):
+        """
+        Инициализация модели без чтения источника
+
+        Args:
+            source (MenuRowSource): Источник строк
+            parent: Родительский объект Qt
+            metrics (MenuMetrics|None): Сбор метрик (None — без замеров)
+        """
+        super().__init__(parent)
+        self.source = source
+        self.metrics = metrics
+        self.headers = ["Название", "Цена", "Время приготовления"]
+        self._row_count = 0
+        self._exhausted = False
+        # Прочитанные страницы: номер страницы -> блюда, в порядке последнего обращения
+        self._pages = OrderedDict()
+
+    def set_source(self, source: MenuRowSource) -> None:
+        """
+        Замена источника (или повторное чтение изменившегося) со сбросом модели
+
+        Прежний источник не закрывается, если это тот же объект.
+
+        Args:
+            source (MenuRowSource): Новый источник строк
+        """
+        self.beginResetModel()
+        if source is not self.source:
+            self.source.close()
+        self.source = source
+        self._row_count = 0
+        self._exhausted = False
+        self._pages.clear()
+        self.endResetModel()
+
+    def canFetchMore(self, parent: QModelIndex = QModelIndex()) -> bool:
+        """Проверка, могут ли у источника быть ещё не известные модели строки"""
+        return not parent.isValid() and not self._exhausted
+
+    def fetchMore(self, parent: QModelIndex = QModelIndex()) -> None:
+        """Добавление в модель следующей страницы строк (без чтения блюд)"""
+        if parent.isValid() or self._exhausted:
+            return
+        count = self.source.count_more(self._row_count, self.PAGE_SIZE)
+        if count < self.PAGE_SIZE:
+            self._exhausted = True
+        if not count:
+            return
+        self.beginInsertRows(QModelIndex(), self._row_count, self._row_count + count - 1)
+        self._row_count += count
+        self.endInsertRows()
+
+    def fetch_until(self, row: int) -> None:
+        """
+        Подгрузка страниц, пока модель не узнает строку row или источник не закончится
+
+        Args:
+            row (int): Номер строки (например, для перехода в конец таблицы)
+        """
+        while self._row_count <= row and self.canFetchMore():
+            self.fetchMore()
+
+    def dish_at(self, row: int) -> DishBase:
+        """
+        Блюдо строки (страница читается из источника при первом обращении)
+
+        Args:
+            row (int): Номер строки среди известных модели
+
+        Returns:
+            DishBase: Блюдо
+        """
+        page_number, offset = divmod(row, self.PAGE_SIZE)
+        page = self._pages.get(page_number)
+        if page is None:
+            page = self.source.rows(page_number * self.PAGE_SIZE, self.PAGE_SIZE)
+            if self.metrics is not None:
+                self.metrics.count("model.pages_loaded")
+            self._pages[page_number] = page
+            if len(self._pages) > self.CACHED_PAGES:
+                self._pages.popitem(last=False)
+        else:
+            self._pages.move_to_end(page_number)
+        return page[offset]
+
+    def columnCount(self, parent=None) -> int:
+        """Получение количества столбцов"""
+        return len(self.headers)
+
+    def rowCount(self, parent=None) -> int:
+        """Получение количества уже известных строк"""
+        if parent is not None and parent.isValid():
+            return 0
+        return self._row_count
+
+    def data(self, index: QModelIndex, role=Qt.ItemDataRole.DisplayRole) -> str|float|datetime.time|None:
+        """
+        Получение данных для отображения в таблице
+
+        Args:
+            index (QModelIndex): Индекс ячейки
+            role (Qt.ItemDataRole): Роль данных Qt: DisplayRole или MenuTableModel.RAW_ROLE
+
+        Returns:
+            str|float|datetime.time|None: Данные ячейки или None
+        """
+        if self.metrics is not None:
+            self.metrics.count("model.data_calls")
+        if not index.isValid() or not 0 <= index.column() < len(self.headers):
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            return MenuTableModel.format_cell(self.dish_at(index.row()), index.column())
+        if role == MenuTableModel.RAW_ROLE:
+            dish = self.dish_at(index.row())
+            return (dish.name, dish.price, dish.prep_time)[index.column()]
+        return None
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role=Qt.ItemDataRole.DisplayRole) -> str|None:
+        """
+        Получение заголовков таблицы
+
+        Args:
+            section (int): Номер секции
+            orientation (Qt.Orientation): Ориентация таблицы (вертикальная/горизонтальная)
+
+        Returns:
+            str|None: Заголовок или None
+        """
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.headers[section]
+        return None
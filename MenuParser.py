@@ -0,0 +1,215 @@
+import datetime
+from collections.abc import Callable, Iterator
+from typing import NamedTuple
+from Dish import Dish
+from DishBase import DishBase
+
+# Виды ошибок разбора строки и их подписи для сводки
+PARSE_ERROR_KINDS = {
+    "encoding": "кодировка",
+    "fields": "число полей",
+    "name": "название",
+    "price": "цена",
+    "time": "время",
+}
+
+class ParseError(NamedTuple):
+    """Ошибка разбора строки: вид (см. PARSE_ERROR_KINDS) и сообщение"""
+
+    kind: str
+    message: str
+
+    def __str__(self) -> str:
+        """Сообщение об ошибке"""
+        return self.message
+
+# Обработчик ошибки разбора: номер строки, строка, ошибка
+ParseErrorHandler = Callable[[int, str, ParseError], None]
+
+class MenuParser:
+    """Построчный разбор текстового формата меню (название,цена,ЧЧ:ММ)"""
+
+    def read_line(self, line: str) -> tuple[str, float, datetime.time]|ParseError:
+        """
+        Разбор одной строки меню без исключений
+
+        Args:
+            line (str): Строка без пробельных символов по краям
+
+        Returns:
+            tuple[str, float, datetime.time]|ParseError: Название, цена и время или вид ошибки
+        """
+        fields = line.split(',')
+        if len(fields) != 3:
+            return ParseError("fields", f"Ожидалось 3 поля, получено {len(fields)}")
+        name, price_str, time_str = fields
+        # Валидация названия
+        if not name:
+            return ParseError("name", "Название блюда не может быть пустым")
+        # Валидация цены
+        try:
+            price = float(price_str)
+        except ValueError:
+            return ParseError("price", f"Цена не является числом: {price_str}")
+        if price <= 0:
+            return ParseError("price", f"Цена должна быть положительной: {price_str}")
+        # Валидация времени приготовления
+        hours_str, separator, minutes_str = time_str.partition(':')
+        try:
+            hours, minutes = int(hours_str), int(minutes_str)
+        except ValueError:
+            hours = minutes = -1
+        if not separator or not (0 <= hours < 24 and 0 <= minutes < 60):
+            return ParseError("time", f"Неверный формат времени: {time_str}")
+        return name, price, datetime.time(hours, minutes)
+
+    def parse_line(self, line: str) -> DishBase:
+        """
+        Разбор одной строки меню
+
+        Args:
+            line (str): Строка без пробельных символов по краям
+
+        Returns:
+            DishBase: Блюдо
+
+        Raises:
+            ValueError: Строка не соответствует формату меню
+        """
+        result = self.read_line(line)
+        if isinstance(result, ParseError):
+            raise ValueError(result.message)
+        return Dish(*result)
+
+    def parse_chunk(self, raw_lines: list[bytes], first_line_number: int,
+                    on_error: ParseErrorHandler) -> list[DishBase]:
+        """
+        Разбор блока строк файла меню
+
+        Args:
+            raw_lines (list[bytes]): Строки файла в кодировке UTF-8
+            first_line_number (int): Номер первой строки блока в файле
+            on_error (ParseErrorHandler): Обработчик строк с ошибками
+
+        Returns:
+            list[DishBase]: Блюда из корректных строк
+        """
+        return [Dish(name, price, prep_time)
+                for _, name, price, prep_time in self.scan_chunk(raw_lines, first_line_number, on_error)]
+
+    def scan_chunk(self, raw_lines: list[bytes], first_line_number: int,
+                   on_error: ParseErrorHandler) -> Iterator[tuple[int, str, float, datetime.time]]:
+        """
+        Перебор корректных строк блока без создания блюд
+
+        Ошибки не выбрасываются, а передаются в on_error с видом ошибки.
+
+        Args:
+            raw_lines (list[bytes]): Строки файла в кодировке UTF-8
+            first_line_number (int): Номер первой строки блока в файле
+            on_error (ParseErrorHandler): Обработчик строк с ошибками
+
+        Yields:
+            tuple[int, str, float, datetime.time]: Индекс строки в блоке, название, цена, время
+        """
+        for offset, raw_line in enumerate(raw_lines):
+            try:
+                line = raw_line.decode('utf-8').strip()
+            except UnicodeDecodeError as e:
+                on_error(first_line_number + offset, raw_line.decode('utf-8', 'replace').strip(),
+                         ParseError("encoding", f"Строка не в кодировке UTF-8: {e.reason}"))
+                continue
+            if not line:
+                continue
+            result = self.read_line(line)
+            if isinstance(result, ParseError):
+                on_error(first_line_number + offset, line, result)
+                continue
+            yield offset, *result
+
+    def check_chunk(self, raw_lines: list[bytes], first_line_number: int,
+                    on_error: ParseErrorHandler) -> list[int]:
+        """
+        Проверка блока строк файла меню без создания блюд
+
+        Args:
+            raw_lines (list[bytes]): Строки файла в кодировке UTF-8
+            first_line_number (int): Номер первой строки блока в файле
+            on_error (ParseErrorHandler): Обработчик строк с ошибками
+
+        Returns:
+            list[int]: Индексы корректных строк внутри блока
+        """
+        return [offset for offset, _, _, _ in self.scan_chunk(raw_lines, first_line_number, on_error)]
+
+class FastMenuParser(MenuParser):
+    """
+    Ускоренный разбор меню целыми блоками
+
+    Блок декодируется одним вызовом, а время приготовления берётся из
+    заранее построенной таблицы вместо split(':'), int() и datetime.time
+    для каждой строки. Строки, не прошедшие быструю проверку, разбираются
+    обычным read_line, поэтому результат и сообщения об ошибках не
+    отличаются от MenuParser.
+    """
+
+    # Все записи времени, которые int() в read_line понимает одинаково: "7:05", "07:05"...
+    # (строится при первом разборе, чтобы не замедлять импорт)
+    _TIMES = None
+
+    @classmethod
+    def _time_table(cls) -> dict[str, datetime.time]:
+        """Таблица записей времени (строится один раз)"""
+        if cls._TIMES is None:
+            cls._TIMES = {
+                f"{hours_str}:{minutes_str}": datetime.time(hours, minutes)
+                for hours in range(24)
+                for minutes in range(60)
+                for hours_str in {str(hours), f"{hours:02d}"}
+                for minutes_str in {str(minutes), f"{minutes:02d}"}
+            }
+        return cls._TIMES
+
+    def scan_chunk(self, raw_lines: list[bytes], first_line_number: int,
+                   on_error: ParseErrorHandler) -> Iterator[tuple[int, str, float, datetime.time]]:
+        """
+        Перебор корректных строк блока без создания блюд
+
+        Args:
+            raw_lines (list[bytes]): Строки файла в кодировке UTF-8
+            first_line_number (int): Номер первой строки блока в файле
+            on_error (ParseErrorHandler): Обработчик строк с ошибками
+
+        Yields:
+            tuple[int, str, float, datetime.time]: Индекс строки в блоке, название, цена, время
+        """
+        try:
+            text = b"".join(raw_lines).decode('utf-8')
+        except UnicodeDecodeError:
+            # Блок с испорченной кодировкой разбирается построчно, чтобы найти плохие строки
+            yield from super().scan_chunk(raw_lines, first_line_number, on_error)
+            return
+        lines = list(map(str.strip, text.split('\n')[:len(raw_lines)]))
+        times = self._time_table()
+
+        for offset, line in enumerate(lines):
+            fields = line.split(',')
+            if len(fields) == 3:
+                name, price_str, time_str = fields
+                prep_time = times.get(time_str)
+                if name and prep_time is not None:
+                    try:
+                        price = float(price_str)
+                    except ValueError:
+                        price = 0.0
+                    if price > 0:
+                        yield offset, name, price, prep_time
+                        continue
+            if not line:
+                continue
+            # Медленный путь даёт те же результаты и сообщения, что и MenuParser
+            result = self.read_line(line)
+            if isinstance(result, ParseError):
+                on_error(first_line_number + offset, line, result)
+                continue
+            yield offset, *result
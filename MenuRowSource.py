@@ -0,0 +1,42 @@
+from collections.abc import Sequence
+from DishBase import DishBase
+
+class MenuRowSource:
+    """
+    Источник строк для MenuPagedTableModel
+
+    Строки читаются по порядку страницами. Общее число строк источнику
+    знать заранее не нужно: модель спрашивает о следующих строках
+    (count_more), только когда представление докручено до конца уже
+    известных, поэтому открытие даже очень большого источника ничего
+    не читает.
+    """
+
+    def count_more(self, known: int, limit: int) -> int:
+        """
+        Количество строк после первых known
+
+        Args:
+            known (int): Сколько строк уже известно модели
+            limit (int): Больше стольких строк считать не нужно
+
+        Returns:
+            int: Количество следующих строк (не больше limit; 0 — строк больше нет)
+        """
+        raise NotImplementedError
+
+    def rows(self, start: int, count: int) -> Sequence[DishBase]:
+        """
+        Блюда строк start..start + count - 1 (только среди уже найденных через count_more)
+
+        Args:
+            start (int): Номер первой строки
+            count (int): Количество строк
+
+        Returns:
+            Sequence[DishBase]: Блюда (меньше count в конце источника)
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Освобождение ресурсов источника (по умолчанию ничего не делает)"""
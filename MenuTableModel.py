@@ -0,0 +1,326 @@
+import datetime
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Sequence
+from itertools import compress
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
+from DishBase import DishBase
+from MenuIndex import INCREMENTAL_INSERT_LIMIT
+from MenuListener import MenuListener
+from MenuManager import MenuManager
+from MenuMetrics import MenuMetrics
+
+class MenuTableModel(QAbstractTableModel, MenuListener):
+    """
+    Модель Qt для отображения меню в таблице
+    
+    Модель хранит слоты блюд (см. MenuManager) в порядке возрастания ключа
+    сортировки: без сортировки ключ — сам номер слота, при сортировке по
+    столбцу порядок берётся из MenuIndex (ключи названий без учёта регистра
+    и «ё», цены, время в минутах). Добавленные блюда вставляются двоичным
+    поиском, без полной пересортировки; удаление множества блюд стоит один
+    проход по массиву слотов.
+    
+    Отформатированные значения ячеек хранятся в LRU-кэше по идентификатору
+    блюда и столбцу: идентификаторы не меняются при сортировке и уплотнении,
+    поэтому кэш сбрасывается только при удалении блюд и замене меню.
+    Кроме DisplayRole модель отдаёт ключ сортировки (SORT_ROLE) и значение
+    поля без форматирования (RAW_ROLE).
+    
+    Если задан metrics (MenuMetrics), учитываются вызовы data()
+    (model.data_calls) и промахи кэша ячеек (model.cache_misses).
+    """
+    
+    SORT_FIELDS = ("name", "price", "minutes")
+    # Роли данных: ключ сортировки столбца и значение поля без форматирования
+    SORT_ROLE = Qt.ItemDataRole.UserRole
+    RAW_ROLE = Qt.ItemDataRole.UserRole + 1
+    # Не больше стольких отдельных сигналов удаления, иначе сброс модели
+    REMOVE_SIGNAL_LIMIT = 64
+    # Сколько отформатированных ячеек хранится в кэше
+    DISPLAY_CACHE_SIZE = 8192
+    
+    def __init__(self, menu_manager: MenuManager, parent=None, metrics: MenuMetrics|None = None):
+        """
+        Инициализация модели таблицы
+        
+        Args:
+            menu_manager (MenuManager): Менеджер меню
+            parent: Родительский объект Qt
+            metrics (MenuMetrics|None): Сбор метрик (None — без замеров)
+        """
+        super().__init__(parent)
+        self.menu_manager = menu_manager
+        self.metrics = metrics
+        self.headers = ["Название", "Цена", "Время приготовления"]
+        self._sort_column = -1
+        self._descending = False
+        # Слоты блюд по возрастанию ключа сортировки
+        self._order = menu_manager.live_slots()
+        # Обратная перестановка (слот -> позиция в _order), строится по требованию
+        self._positions = None
+        # Текст ячеек: (идентификатор блюда, столбец) -> строка, в порядке последнего обращения
+        self._display_cache = OrderedDict()
+        self.menu_manager.add_listener(self)
+    
+    def sort(self, column: int, order: Qt.SortOrder = Qt.SortOrder.AscendingOrder) -> None:
+        """
+        Сортировка таблицы по столбцу
+        
+        Args:
+            column (int): Номер столбца; отрицательный — исходный порядок меню
+            order (Qt.SortOrder): Направление сортировки
+        """
+        self.layoutAboutToBeChanged.emit()
+        persistent = self.persistentIndexList()
+        slots = [self.slot_at(index.row()) for index in persistent]
+        
+        if 0 <= column < len(self.SORT_FIELDS):
+            self._sort_column = column
+            self._descending = order == Qt.SortOrder.DescendingOrder
+        else:
+            self._sort_column = -1
+            self._descending = False
+        self._order = self._sorted_slots()
+        self._positions = None
+        
+        self.changePersistentIndexList(
+            persistent, [self.index(self.row_of_slot(slot), index.column()) for slot, index in zip(slots, persistent)])
+        self.layoutChanged.emit()
+    
+    def _sorted_slots(self) -> array:
+        """Слоты всех блюд в порядке текущей сортировки"""
+        if self._sort_column < 0:
+            return self.menu_manager.live_slots()
+        return self.menu_manager.index.sorted_rows(self.SORT_FIELDS[self._sort_column])
+    
+    def _sort_key(self) -> Callable[[int], tuple]|None:
+        """Ключ сортировки слота (None — сам номер слота)"""
+        if self._sort_column < 0:
+            return None
+        return self.menu_manager.index.sort_key(self.SORT_FIELDS[self._sort_column])
+    
+    def _view_position(self, position: int) -> int:
+        """Строка таблицы для позиции в _order (и наоборот)"""
+        return len(self._order) - 1 - position if self._descending else position
+    
+    def slot_at(self, row: int) -> int:
+        """
+        Слот блюда, показанного в строке таблицы
+        
+        Args:
+            row (int): Номер строки таблицы
+        
+        Returns:
+            int: Номер слота в MenuManager
+        """
+        return self._order[self._view_position(row)]
+    
+    def dish_ids(self, rows: Iterable[int]) -> list[int]:
+        """
+        Идентификаторы блюд в строках таблицы
+        
+        Args:
+            rows (Iterable[int]): Номера строк таблицы
+        
+        Returns:
+            list[int]: Идентификаторы блюд (см. MenuManager.delete_many)
+        """
+        return [self.menu_manager.slot_id(self.slot_at(row)) for row in rows]
+    
+    def row_of_slot(self, slot: int) -> int:
+        """
+        Строка таблицы, в которой показан слот
+        
+        Args:
+            slot (int): Номер слота в MenuManager
+        
+        Returns:
+            int: Номер строки таблицы
+        """
+        key = self._sort_key()
+        if key is None:
+            position = bisect_left(self._order, slot)
+        else:
+            position = bisect_left(self._order, key(slot), key=key)
+        return self._view_position(position)
+    
+    def rows_of_slots(self, slots: Sequence[int]) -> list[int]:
+        """Строки таблицы для нескольких слотов"""
+        if self._sort_column < 0 or len(slots) < self.REMOVE_SIGNAL_LIMIT:
+            return [self.row_of_slot(slot) for slot in slots]
+        if self._positions is None:
+            self._positions = array('q', bytes(8 * len(self.menu_manager.storage)))
+            for position, slot in enumerate(self._order):
+                self._positions[slot] = position
+        return [self._view_position(self._positions[slot]) for slot in slots]
+    
+    def rows_inserted(self, first: int, last: int) -> None:
+        """Вставка строк в модель (в отсортированную таблицу — по месту ключа)"""
+        self._positions = None
+        if self._sort_column < 0:
+            self.beginInsertRows(QModelIndex(), len(self._order), len(self._order) + last - first)
+            self._order.extend(range(first, last + 1))
+            self.endInsertRows()
+        elif last - first >= INCREMENTAL_INSERT_LIMIT:
+            # Крупный пакет дешевле отсортировать заново
+            self.beginResetModel()
+            self._order = self._sorted_slots()
+            self.endResetModel()
+        else:
+            key = self._sort_key()
+            for slot in range(first, last + 1):
+                position = bisect_left(self._order, key(slot), key=key)
+                # Новая строка таблицы ещё не входит в len(self._order)
+                row = len(self._order) - position if self._descending else position
+                self.beginInsertRows(QModelIndex(), row, row)
+                self._order.insert(position, slot)
+                self.endInsertRows()
+    
+    def rows_removed(self, rows: Sequence[int]) -> None:
+        """Удаление строк из модели: по сигналу на каждый непрерывный участок или сброс"""
+        self._positions = None
+        self.invalidate(map(self.menu_manager.slot_id, rows) if len(rows) < len(self._display_cache) else None)
+        if self._sort_column < 0:
+            # Слоты в _order по возрастанию, rows тоже
+            positions = [bisect_left(self._order, slot) for slot in rows]
+        elif len(rows) < self.REMOVE_SIGNAL_LIMIT:
+            key = self._sort_key()
+            positions = sorted(bisect_left(self._order, key(slot), key=key) for slot in rows)
+        else:
+            removed = bytearray(len(self.menu_manager.storage))
+            for slot in rows:
+                removed[slot] = 1
+            positions = list(compress(range(len(self._order)), bytes(map(removed.__getitem__, self._order))))
+        
+        # Непрерывные участки позиций, с конца, чтобы не пересчитывать следующие
+        runs = []
+        for position in reversed(positions):
+            if runs and runs[-1][0] == position + 1:
+                runs[-1][0] = position
+            else:
+                runs.append([position, position])
+        
+        if len(runs) > self.REMOVE_SIGNAL_LIMIT:
+            self.beginResetModel()
+            keep = bytearray(b"\1") * len(self._order)
+            for position in positions:
+                keep[position] = 0
+            self._order = array('q', compress(self._order, keep))
+            self.endResetModel()
+            return
+        for start, end in runs:
+            first, last = sorted((self._view_position(start), self._view_position(end)))
+            self.beginRemoveRows(QModelIndex(), first, last)
+            del self._order[start:end + 1]
+            self.endRemoveRows()
+    
+    def menu_about_to_be_reset(self) -> None:
+        """Начало полного сброса модели"""
+        self.beginResetModel()
+    
+    def menu_reset(self) -> None:
+        """Завершение полного сброса модели"""
+        self._order = self._sorted_slots()
+        self._positions = None
+        self.invalidate()
+        self.endResetModel()
+    
+    def menu_compacted(self, rows: Sequence[int]) -> None:
+        """Перенумерация слотов после уплотнения хранилища (строки таблицы не меняются)"""
+        self._positions = None
+        if self._sort_column < 0:
+            self._order = array('q', range(len(rows)))
+            return
+        new_slots = array('q', bytes(8 * (rows[-1] + 1 if rows else 0)))
+        for slot, old_slot in enumerate(rows):
+            new_slots[old_slot] = slot
+        self._order = array('q', map(new_slots.__getitem__, self._order))
+    
+    def invalidate(self, dish_ids: Iterable[int]|None = None) -> None:
+        """
+        Сброс кэша отформатированных ячеек
+        
+        Args:
+            dish_ids (Iterable[int]|None): Идентификаторы изменённых блюд (None — весь кэш)
+        """
+        if dish_ids is None:
+            self._display_cache.clear()
+            return
+        for dish_id in dish_ids:
+            for column in range(len(self.headers)):
+                self._display_cache.pop((dish_id, column), None)
+    
+    def columnCount(self, parent=None) -> int:
+        """Получение количества столбцов"""
+        return len(self.headers)
+    
+    def rowCount(self, parent=None) -> int:
+        """Получение количества строк"""
+        return len(self._order)
+    
+    def data(self, index: QModelIndex, role=Qt.ItemDataRole.DisplayRole) -> str|float|datetime.time|None:
+        """
+        Получение данных для отображения в таблице
+        
+        Args:
+            index (QModelIndex): Индекс ячейки
+            role (Qt.ItemDataRole): Роль данных Qt: DisplayRole, SORT_ROLE или RAW_ROLE
+        
+        Returns:
+            str|float|datetime.time|None: Данные ячейки или None
+        """
+        if self.metrics is not None:
+            self.metrics.count("model.data_calls")
+        if not index.isValid():
+            return None
+        column = index.column()
+        slot = self.slot_at(index.row())
+        
+        if role == Qt.ItemDataRole.DisplayRole:
+            key = (self.menu_manager.slot_id(slot), column)
+            text = self._display_cache.get(key)
+            if text is not None:
+                self._display_cache.move_to_end(key)
+                return text
+            if self.metrics is not None:
+                self.metrics.count("model.cache_misses")
+            text = self.format_cell(self.menu_manager.dish_in_slot(slot), column)
+            if text is not None:
+                self._display_cache[key] = text
+                if len(self._display_cache) > self.DISPLAY_CACHE_SIZE:
+                    self._display_cache.popitem(last=False)
+            return text
+        if role == self.SORT_ROLE and 0 <= column < len(self.SORT_FIELDS):
+            return self.menu_manager.index.sort_key(self.SORT_FIELDS[column])(slot)[0]
+        if role == self.RAW_ROLE:
+            dish = self.menu_manager.dish_in_slot(slot)
+            return (dish.name, dish.price, dish.prep_time)[column] if 0 <= column < len(self.headers) else None
+        return None
+    
+    @staticmethod
+    def format_cell(dish: DishBase, column: int) -> str|None:
+        """Текст ячейки блюда для столбца"""
+        if column == 0:
+            return dish.name
+        elif column == 1:
+            return f"{dish.price:.2f}"
+        elif column == 2:
+            return dish.prep_time.strftime("%H:%M")
+        return None
+    
+    def headerData(self, section: int, orientation: Qt.Orientation, role=Qt.ItemDataRole.DisplayRole) -> str|None:
+        """
+        Получение заголовков таблицы
+        
+        Args:
+            section (int): Номер секции
+            orientation (Qt.Orientation): Ориентация таблицы (вертикальная/горизонтальная)
+        
+        Returns:
+            str|None: Заголовок или None
+        """
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.headers[section]
+        return None
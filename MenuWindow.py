@@ -0,0 +1,365 @@
+import os.path
+import sqlite3
+from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QTableView, QPushButton,
+                             QLineEdit, QMessageBox, QFileDialog, QProgressDialog, QAbstractItemView,
+                             QInputDialog, QDockWidget)
+from PyQt6.QtCore import Qt, QThread
+from ColumnarDishStore import ColumnarDishStore
+from Dish import Dish
+from FileRowSource import FileRowSource
+from Logger import Logger
+from MenuBranchLoadWorker import MenuBranchLoadWorker
+from MenuDatabase import MenuDatabase
+from MenuFileHandler import MAPPED_LOAD_THRESHOLD, MenuFileHandler
+from MenuFilterProxyModel import MenuFilterProxyModel
+from MenuFormManager import MenuFormManager
+from MenuJournal import MenuJournal
+from MenuLoadWorker import MenuLoadWorker
+from MenuManager import MenuManager
+from MenuPagedTableModel import MenuPagedTableModel
+from MenuMetrics import MenuMetrics
+from MenuTableModel import MenuTableModel
+from SqliteRowSource import SqliteRowSource
+from MenuWriteQueue import MenuWriteQueue
+from MetricsPanel import MetricsPanel
+
+# Фильтр диалогов открытия и сохранения меню
+MENU_FILE_FILTER = "Текстовые файлы (*.txt);;Снимки меню (*.menub);;Базы меню (*.sqlite *.db);;Все файлы (*)"
+# Фильтр диалога выбора журналируемого меню (снимок, рядом с которым лежит журнал .journal)
+JOURNAL_FILE_FILTER = "Снимки меню (*.menub)"
+# Фильтр диалога просмотра файла без загрузки в меню; базы SQLite узнаются по расширению
+BROWSE_FILE_FILTER = "Текстовые файлы (*.txt);;Базы меню (*.sqlite *.db);;Все файлы (*)"
+# Подписи правил для одинаковых названий при загрузке филиалов (см. MenuFileHandler.load_many)
+CONFLICT_LABELS = {
+    "keep_first": "Оставить первое блюдо",
+    "keep_last": "Оставить последнее блюдо",
+    "min_price": "Оставить самое дешёвое блюдо",
+    "keep_all": "Оставить все блюда",
+}
+
+class MenuWindow(QMainWindow):
+    """Главное окно приложения для управления меню ресторана"""
+    
+    def __init__(self, dev: bool = False):
+        """
+        Инициализация главного окна
+        
+        Args:
+            dev (bool): Режим разработчика: сбор метрик и панель метрик с профилированием
+        """
+        super().__init__()
+        self.setWindowTitle("Меню ресторана")
+        self.setGeometry(100, 100, 800, 600)
+        
+        # Инициализация компонентов
+        self.metrics = MenuMetrics() if dev else None
+        self.menu_manager = MenuManager(ColumnarDishStore, metrics=self.metrics)
+        self.logger = Logger(metrics=self.metrics)
+        self.file_handler = MenuFileHandler(self.logger, engine="fast", metrics=self.metrics)
+        # Изменения меню из фоновых потоков (загрузчиков) выполняются в потоке окна
+        self.write_queue = MenuWriteQueue(self.menu_manager, self)
+        self.write_queue.failed.connect(
+            lambda error: self.logger.log_message("ОШИБКА", f"Не удалось изменить меню: {error}"))
+        self.load_thread = None
+        self.load_worker = None
+        self.load_progress = None
+        self.journal = None
+        
+        # Создание интерфейса
+        self.init_ui()
+    
+    def init_ui(self) -> None:
+        """Инициализация пользовательского интерфейса"""
+        central_widget = QWidget()
+        self.setCentralWidget(central_widget)
+        layout = QVBoxLayout(central_widget)
+        
+        # Строка поиска
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("Поиск, например: паста цена<500 время<=0:30")
+        layout.addWidget(self.search_edit)
+        
+        # Создание таблицы
+        self.table_view = QTableView()
+        self.table_model = MenuTableModel(self.menu_manager, metrics=self.metrics)
+        self.proxy_model = MenuFilterProxyModel(self.menu_manager)
+        self.proxy_model.setSourceModel(self.table_model)
+        self.table_view.setModel(self.proxy_model)
+        # Без выбранного столбца блюда показываются в порядке меню
+        self.table_view.horizontalHeader().setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+        self.table_view.setSortingEnabled(True)
+        self.table_view.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table_view.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        layout.addWidget(self.table_view)
+        self.search_edit.textChanged.connect(self.proxy_model.set_query)
+        
+        # Создание формы
+        form_layout = QHBoxLayout()
+        
+        # Инициализация менеджера формы
+        self.form_manager = MenuFormManager(form_layout)
+        
+        # Кнопка добавления блюда
+        self.add_button = QPushButton("Добавить блюдо")
+        self.add_button.clicked.connect(self.add_dish)
+        form_layout.addWidget(self.add_button)
+        
+        layout.addLayout(form_layout)
+        
+        # Макет для кнопок управления
+        button_layout = QHBoxLayout()
+        
+        # Кнопка загрузки
+        self.load_button = QPushButton("Загрузить меню")
+        self.load_button.clicked.connect(self.load_menu)
+        button_layout.addWidget(self.load_button)
+        
+        # Кнопка загрузки меню филиалов
+        self.load_branches_button = QPushButton("Загрузить филиалы")
+        self.load_branches_button.clicked.connect(self.load_branches)
+        button_layout.addWidget(self.load_branches_button)
+        
+        # Кнопка сохранения
+        self.save_button = QPushButton("Сохранить меню")
+        self.save_button.clicked.connect(self.save_menu)
+        button_layout.addWidget(self.save_button)
+        
+        # Кнопка просмотра файла без загрузки
+        self.browse_button = QPushButton("Просмотреть файл")
+        self.browse_button.clicked.connect(self.browse_file)
+        button_layout.addWidget(self.browse_button)
+        
+        # Кнопка журналируемого хранения
+        self.journal_button = QPushButton("Вести журнал")
+        self.journal_button.clicked.connect(self.open_journal)
+        button_layout.addWidget(self.journal_button)
+        
+        # Кнопка удаления
+        self.delete_button = QPushButton("Удалить выбранное")
+        self.delete_button.clicked.connect(self.delete_dish)
+        button_layout.addWidget(self.delete_button)
+        
+        layout.addLayout(button_layout)
+        
+        # Панель метрик (только в режиме разработчика)
+        self.metrics_panel = None
+        if self.metrics is not None:
+            self.metrics_panel = MetricsPanel(self.metrics)
+            self.metrics_panel.watch_repaints(self.table_view.viewport())
+            metrics_dock = QDockWidget("Метрики", self)
+            metrics_dock.setWidget(self.metrics_panel)
+            self.addDockWidget(Qt.DockWidgetArea.RightDockWidgetArea, metrics_dock)
+    
+    def add_dish(self) -> None:
+        """Добавление нового блюда на основе данных формы"""
+        name, price, prep_time = self.form_manager.get_form_values()
+        
+        # Валидация названия
+        if not name:
+            QMessageBox.warning(self, "Предупреждение", "Название блюда не может быть пустым!")
+            self.logger.log_message("ПРЕДУПРЕЖДЕНИЕ", "Попытка добавить блюдо с пустым названием")
+            return
+        
+        # Валидация цены
+        if price <= 0:
+            QMessageBox.warning(self, "Предупреждение", "Цена должна быть положительной!")
+            self.logger.log_message("ПРЕДУПРЕЖДЕНИЕ", f"Неверная цена: {price}")
+            return
+        
+        dish = Dish(name, price, prep_time.toPyTime())
+        self.menu_manager.add_dish(dish)
+    
+    def delete_dish(self) -> None:
+        """Удаление выбранных блюд"""
+        rows = []
+        for selection_range in self.table_view.selectionModel().selection():
+            rows.extend(range(selection_range.top(), selection_range.bottom() + 1))
+        if not rows:
+            selected = self.table_view.currentIndex()
+            if selected.isValid():
+                rows.append(selected.row())
+        if not rows:
+            QMessageBox.warning(self, "Предупреждение", "Выберите блюдо для удаления!")
+            self.logger.log_message("ПРЕДУПРЕЖДЕНИЕ", "Попытка удаления блюда без выбора")
+            return
+        
+        question = ("Вы уверены, что хотите удалить это блюдо?" if len(rows) == 1
+                    else f"Вы уверены, что хотите удалить выбранные блюда ({len(rows)})?")
+        reply = QMessageBox.question(
+            self, "Подтверждение удаления", 
+            question,
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        
+        if reply == QMessageBox.StandardButton.Yes:
+            dish_ids = self.table_model.dish_ids(self.proxy_model.source_rows(rows))
+            self.menu_manager.delete_many(dish_ids)
+    
+    def closeEvent(self, event) -> None:
+        """Закрытие журнала и запись накопленных сообщений лога при закрытии окна"""
+        if self.journal is not None:
+            self.journal.close()
+        self.logger.flush()
+        super().closeEvent(event)
+    
+    def save_menu(self) -> None:
+        """Сохранение меню в файл"""
+        filename, _ = QFileDialog.getSaveFileName(
+            None, "Сохранить меню", ".", MENU_FILE_FILTER
+        )
+        if not filename:
+            return
+        database = getattr(self.menu_manager.storage, "database", None)
+        if database is not None and os.path.abspath(database.path) == os.path.abspath(filename):
+            # Меню открыто из этой базы: все изменения уже в ней
+            self.logger.log_message("ПРЕДУПРЕЖДЕНИЕ", f"Меню уже хранится в базе {filename}, сохранение не нужно")
+            return
+        self.file_handler.save_menu(
+            self.menu_manager.view(),
+            filename
+        )
+    
+    def open_journal(self) -> None:
+        """
+        Журналируемое хранение меню в выбранном снимке
+        
+        Если снимок уже существует, меню восстанавливается из него и его журнала;
+        иначе текущее меню записывается как первый снимок. Дальше каждое
+        изменение сразу дописывается в журнал.
+        """
+        filename, _ = QFileDialog.getSaveFileName(
+            None, "Вести журнал меню", ".", JOURNAL_FILE_FILTER,
+            options=QFileDialog.Option.DontConfirmOverwrite
+        )
+        if not filename or self.is_loading():
+            return
+        if self.journal is not None:
+            self.journal.close()
+            self.journal = None
+        journal = MenuJournal(filename)
+        try:
+            journal.open(self.menu_manager)
+        except (OSError, ValueError) as e:
+            journal.close()
+            QMessageBox.critical(self, "Ошибка", f"Не удалось открыть журнал: {e}")
+            self.logger.log_message("ОШИБКА", f"Не удалось открыть журнал: {e}")
+            return
+        self.journal = journal
+        self.setWindowTitle(f"Меню ресторана — {os.path.basename(filename)}")
+    
+    def browse_file(self) -> None:
+        """Просмотр файла меню или базы SQLite в отдельном окне с подгрузкой страниц по мере прокрутки"""
+        filename, _ = QFileDialog.getOpenFileName(
+            None, "Просмотреть меню", ".", BROWSE_FILE_FILTER
+        )
+        if not filename:
+            return
+        try:
+            if self.file_handler.is_database(filename):
+                source = SqliteRowSource(MenuDatabase(filename, read_only=True))
+            else:
+                # Строки с ошибками при просмотре пропускаются; проверка файла — при загрузке в меню
+                source = FileRowSource(filename, self.file_handler.parser)
+        except (OSError, ValueError, sqlite3.Error) as e:
+            QMessageBox.critical(self, "Ошибка", f"Не удалось открыть файл: {e}")
+            self.logger.log_message("ОШИБКА", f"Не удалось открыть файл для просмотра: {e}")
+            return
+        view = QTableView(self)
+        view.setWindowFlag(Qt.WindowType.Window)
+        view.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+        view.setWindowTitle(f"Просмотр — {os.path.basename(filename)}")
+        view.setModel(MenuPagedTableModel(source, view, metrics=self.metrics))
+        view.destroyed.connect(source.close)
+        view.resize(600, 500)
+        view.show()
+    
+    def load_menu(self) -> None:
+        """Загрузка меню из файла"""
+        filename, _ = QFileDialog.getOpenFileName(
+            None, "Открыть меню", ".", MENU_FILE_FILTER
+        )
+        if filename and not self.is_loading():
+            mapped = os.path.isfile(filename) and os.path.getsize(filename) >= MAPPED_LOAD_THRESHOLD
+            self._start_loading(MenuLoadWorker(self.file_handler, self.write_queue, filename, mapped))
+    
+    def load_branches(self) -> None:
+        """Параллельная загрузка меню нескольких филиалов в одно меню"""
+        filenames, _ = QFileDialog.getOpenFileNames(
+            None, "Открыть меню филиалов", ".", MENU_FILE_FILTER
+        )
+        if not filenames or self.is_loading():
+            return
+        label, ok = QInputDialog.getItem(
+            self, "Одинаковые названия", "Если название встречается несколько раз:",
+            list(CONFLICT_LABELS.values()), 0, False
+        )
+        if not ok:
+            return
+        conflict = next(policy for policy, policy_label in CONFLICT_LABELS.items() if policy_label == label)
+        self._start_loading(MenuBranchLoadWorker(self.file_handler, self.write_queue, filenames, conflict))
+    
+    def _start_loading(self, worker: MenuLoadWorker|MenuBranchLoadWorker) -> None:
+        """
+        Запуск фоновой загрузки в отдельном потоке с окном прогресса
+        
+        Args:
+            worker (MenuLoadWorker|MenuBranchLoadWorker): Загрузчик
+        """
+        self.load_progress = QProgressDialog("Загрузка меню...", "Отмена", 0, 100, self)
+        self.load_progress.setWindowModality(Qt.WindowModality.WindowModal)
+        self.load_progress.setMinimumDuration(500)
+        if self.journal is not None:
+            # Снимок пишется по окончании загрузки: неудачная загрузка не должна его затереть
+            self.journal.hold()
+        
+        self.load_thread = QThread(self)
+        self.load_worker = worker
+        self.load_worker.moveToThread(self.load_thread)
+        self.load_thread.started.connect(self.load_worker.run)
+        self.load_worker.progress_changed.connect(self.load_progress.setValue)
+        self.load_worker.finished.connect(self.on_load_finished)
+        self.load_worker.failed.connect(self.on_load_failed)
+        self.load_progress.canceled.connect(self.load_worker.cancel)
+        self.load_thread.start()
+    
+    def is_loading(self) -> bool:
+        """Проверка, идёт ли фоновая загрузка меню"""
+        return self.load_thread is not None
+    
+    def on_load_finished(self, cancelled: bool) -> None:
+        """
+        Завершение фоновой загрузки (изменения меню из очереди к этому моменту уже выполнены)
+        
+        Args:
+            cancelled (bool): Загрузка была отменена пользователем
+        """
+        self._stop_loading()
+        if self.journal is not None:
+            self.journal.release()
+        if not cancelled:
+            QMessageBox.information(self, "Успех", "Меню успешно загружено!")
+    
+    def on_load_failed(self, error: str) -> None:
+        """
+        Обработка ошибки фоновой загрузки (если данных ещё не было, меню остаётся прежним)
+        
+        Args:
+            error (str): Текст ошибки
+        """
+        self._stop_loading()
+        if self.journal is not None:
+            self.journal.release()
+        QMessageBox.critical(self, "Ошибка", f"Не удалось загрузить файл: {error}")
+        self.logger.log_message("ОШИБКА", f"Не удалось загрузить файл: {error}")
+    
+    def _stop_loading(self) -> None:
+        """Остановка потока загрузки и освобождение ресурсов"""
+        self.load_thread.quit()
+        self.load_thread.wait()
+        self.load_progress.reset()
+        self.load_worker.deleteLater()
+        self.load_thread.deleteLater()
+        self.load_progress.deleteLater()
+        self.load_thread = None
+        self.load_worker = None
+        self.load_progress = None
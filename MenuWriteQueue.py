@@ -0,0 +1,73 @@
+from collections.abc import Callable, Iterable
+from PyQt6.QtCore import QObject, Qt, pyqtSignal
+from DishBase import DishBase
+from MenuManager import MenuManager
+
+class MenuWriteQueue(QObject):
+    """
+    Очередь изменений меню из любых потоков в поток интерфейса
+
+    Модели Qt можно менять только в их потоке, а события MenuManager
+    ссылаются на номера слотов, верные лишь в момент изменения. Поэтому
+    фоновые потоки (загрузка, автосохранение, сетевой поток) не меняют
+    меню, с которым работает таблица, напрямую, а ставят изменения в
+    очередь: они передаются в поток очереди сигналом с QueuedConnection и
+    выполняются там по порядку, каждое — одной транзакцией MenuManager.
+    Наблюдатели, включая MenuTableModel, получают события уже в потоке
+    интерфейса.
+    """
+
+    applied = pyqtSignal()
+    failed = pyqtSignal(str)
+    _submitted = pyqtSignal(object)
+
+    def __init__(self, menu_manager: MenuManager, parent=None):
+        """
+        Инициализация очереди в текущем потоке (обычно потоке интерфейса)
+
+        Args:
+            menu_manager (MenuManager): Менеджер меню
+            parent: Родительский объект Qt
+        """
+        super().__init__(parent)
+        self.menu_manager = menu_manager
+        self._submitted.connect(self._apply, Qt.ConnectionType.QueuedConnection)
+
+    def submit(self, change: Callable[[MenuManager], object]) -> None:
+        """
+        Постановка изменения в очередь (можно вызывать из любого потока)
+
+        Args:
+            change (Callable[[MenuManager], object]): Изменение; выполняется в транзакции
+        """
+        self._submitted.emit(change)
+
+    def add_dishes(self, dishes: Iterable[DishBase]) -> None:
+        """
+        Постановка в очередь добавления блюд
+
+        Args:
+            dishes (Iterable[DishBase]): Блюда (копируются сразу, в вызывающем потоке)
+        """
+        dishes = list(dishes)
+        self.submit(lambda menu_manager: menu_manager.add_dishes(dishes))
+
+    def delete_many(self, dish_ids: Iterable[int]) -> None:
+        """
+        Постановка в очередь удаления блюд
+
+        Args:
+            dish_ids (Iterable[int]): Идентификаторы блюд (копируются сразу)
+        """
+        dish_ids = list(dish_ids)
+        self.submit(lambda menu_manager: menu_manager.delete_many(dish_ids))
+
+    def _apply(self, change: Callable[[MenuManager], object]) -> None:
+        """Выполнение изменения из очереди в потоке очереди"""
+        try:
+            with self.menu_manager.transaction():
+                change(self.menu_manager)
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        self.applied.emit()
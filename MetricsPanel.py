@@ -0,0 +1,112 @@
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QPlainTextEdit, QPushButton, QCheckBox
+from PyQt6.QtCore import QEvent, QObject, QTimer
+from MenuMetrics import MenuMetrics
+
+# Период обновления панели (в миллисекундах)
+METRICS_REFRESH_INTERVAL = 1000
+
+class MetricsPanel(QWidget):
+    """
+    Панель разработчика: текущие метрики (MenuMetrics) и профилирование
+
+    Показывает счётчики и таймеры, число вызовов data() на одну
+    перерисовку таблицы за последний период обновления и запускает
+    профилирование cProfile (с учётом памяти tracemalloc по флажку).
+    """
+
+    def __init__(self, metrics: MenuMetrics, parent=None):
+        """
+        Инициализация панели
+
+        Args:
+            metrics (MenuMetrics): Метрики для показа
+            parent: Родительский виджет
+        """
+        super().__init__(parent)
+        self.metrics = metrics
+        # Значения счётчиков при прошлом обновлении (для вызовов data() на перерисовку)
+        self._last_data_calls = 0
+        self._last_repaints = 0
+
+        layout = QVBoxLayout(self)
+        self.metrics_view = QPlainTextEdit()
+        self.metrics_view.setReadOnly(True)
+        layout.addWidget(self.metrics_view)
+
+        button_layout = QHBoxLayout()
+        self.reset_button = QPushButton("Сбросить")
+        self.reset_button.clicked.connect(self.reset)
+        button_layout.addWidget(self.reset_button)
+        self.profile_button = QPushButton("Профилирование")
+        self.profile_button.setCheckable(True)
+        self.profile_button.toggled.connect(self.toggle_profiling)
+        button_layout.addWidget(self.profile_button)
+        self.memory_check = QCheckBox("Учитывать память")
+        button_layout.addWidget(self.memory_check)
+        layout.addLayout(button_layout)
+
+        self.profile_view = QPlainTextEdit()
+        self.profile_view.setReadOnly(True)
+        self.profile_view.setPlaceholderText("Отчёт профилировщика появится после остановки профилирования")
+        layout.addWidget(self.profile_view)
+
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.timeout.connect(self.refresh)
+        self.refresh_timer.start(METRICS_REFRESH_INTERVAL)
+
+    def watch_repaints(self, widget: QWidget) -> None:
+        """
+        Учёт перерисовок виджета (обычно области просмотра таблицы) в счётчике view.repaints
+
+        Args:
+            widget (QWidget): Виджет
+        """
+        widget.installEventFilter(self)
+
+    def eventFilter(self, watched: QObject, event: QEvent) -> bool:
+        """Подсчёт событий перерисовки наблюдаемых виджетов"""
+        if event.type() == QEvent.Type.Paint:
+            self.metrics.count("view.repaints")
+        return False
+
+    def refresh(self) -> None:
+        """Обновление текста панели по текущему снимку метрик"""
+        snapshot = self.metrics.snapshot()
+        counters = snapshot["counters"]
+        lines = []
+        data_calls = counters.get("model.data_calls", 0)
+        repaints = counters.get("view.repaints", 0)
+        if repaints > self._last_repaints:
+            per_repaint = (data_calls - self._last_data_calls) / (repaints - self._last_repaints)
+            lines.append(f"data() на перерисовку: {per_repaint:.0f}")
+        self._last_data_calls, self._last_repaints = data_calls, repaints
+
+        for name, value in sorted(counters.items()):
+            lines.append(f"{name}: {value}")
+        for name, timer in sorted(snapshot["timers"].items()):
+            lines.append(f"{name}: {timer['count']} раз, всего {timer['total'] * 1e3:.1f} мс, "
+                         f"в среднем {timer['mean'] * 1e3:.2f} мс, максимум {timer['max'] * 1e3:.1f} мс")
+        if snapshot["profiling"]:
+            lines.append("Идёт профилирование")
+        self.metrics_view.setPlainText("\n".join(lines))
+
+    def reset(self) -> None:
+        """Обнуление метрик"""
+        self.metrics.reset()
+        self._last_data_calls = self._last_repaints = 0
+        self.refresh()
+
+    def toggle_profiling(self, enabled: bool) -> None:
+        """
+        Запуск или остановка профилирования с показом отчёта
+
+        Args:
+            enabled (bool): Запустить (True) или остановить (False)
+        """
+        if enabled:
+            self.metrics.start_profiling(memory=self.memory_check.isChecked())
+            self.memory_check.setEnabled(False)
+        else:
+            self.profile_view.setPlainText(self.metrics.stop_profiling())
+            self.memory_check.setEnabled(True)
+        self.refresh()
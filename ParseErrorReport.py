@@ -0,0 +1,72 @@
+from MenuParser import PARSE_ERROR_KINDS
+
+# Сколько номеров строк с ошибкой запоминается для каждого вида ошибки
+REPORT_SAMPLE_LINES = 10
+
+class ParseErrorReport:
+    """
+    Сводка ошибок разбора файла меню
+
+    Для каждого вида ошибки (см. PARSE_ERROR_KINDS) хранится количество
+    и номера первых REPORT_SAMPLE_LINES строк, поэтому размер сводки не
+    зависит от числа ошибок в файле.
+    """
+
+    def __init__(self):
+        """Инициализация пустой сводки"""
+        self.counts = {}
+        self.samples = {}
+
+    def add(self, kind: str, line_number: int) -> int:
+        """
+        Учёт ошибки
+
+        Args:
+            kind (str): Вид ошибки
+            line_number (int): Номер строки
+
+        Returns:
+            int: Сколько ошибок этого вида учтено, включая эту
+        """
+        count = self.counts.get(kind, 0) + 1
+        self.counts[kind] = count
+        if count <= REPORT_SAMPLE_LINES:
+            self.samples.setdefault(kind, []).append(line_number)
+        return count
+
+    def merge(self, other: "ParseErrorReport") -> None:
+        """
+        Добавление ошибок другой сводки (например, другого файла)
+
+        Args:
+            other (ParseErrorReport): Сводка
+        """
+        for kind, count in other.counts.items():
+            self.counts[kind] = self.counts.get(kind, 0) + count
+            samples = self.samples.setdefault(kind, [])
+            samples.extend(other.samples.get(kind, [])[:REPORT_SAMPLE_LINES - len(samples)])
+
+    @property
+    def total(self) -> int:
+        """Общее количество ошибок"""
+        return sum(self.counts.values())
+
+    def __bool__(self) -> bool:
+        """Есть ли ошибки"""
+        return bool(self.counts)
+
+    def summary(self) -> str:
+        """
+        Строка сводки: всего ошибок и количество по видам с примерами строк
+
+        Returns:
+            str: Сводка
+        """
+        if not self.counts:
+            return "ошибок разбора нет"
+        parts = []
+        for kind, count in sorted(self.counts.items(), key=lambda item: -item[1]):
+            lines = ", ".join(map(str, self.samples.get(kind, [])))
+            more = "…" if count > len(self.samples.get(kind, [])) else ""
+            parts.append(f"{PARSE_ERROR_KINDS.get(kind, kind)}: {count} (строки {lines}{more})")
+        return f"ошибок разбора {self.total}; " + "; ".join(parts)
@@ -0,0 +1,106 @@
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+class ReadWriteLock:
+    """
+    Блокировка «много читателей или один писатель»
+
+    Читатели не мешают друг другу, писатель получает блокировку один.
+    Ожидающий писатель пропускается вперёд новых читателей, поэтому поток
+    изменений не голодает при постоянном чтении. Блокировка повторно
+    входима: поток-писатель может снова взять запись или чтение, а
+    поток-читатель — снова чтение. Повышение чтения до записи не
+    поддерживается (два таких потока ждали бы друг друга).
+    """
+
+    def __init__(self):
+        """Инициализация свободной блокировки"""
+        self._mutex = threading.Lock()
+        self._can_read = threading.Condition(self._mutex)
+        self._can_write = threading.Condition(self._mutex)
+        self._readers = 0
+        self._waiting_writers = 0
+        self._writer = None
+        self._write_depth = 0
+        # Глубина чтения в текущем потоке и признак, что внешнее чтение учтено в _readers
+        self._local = threading.local()
+
+    def acquire_read(self) -> None:
+        """Взятие блокировки на чтение (ожидает, пока пишет или ждёт писатель)"""
+        local = self._local
+        depth = getattr(local, "depth", 0)
+        if depth:
+            local.depth = depth + 1
+            return
+        if self._writer == threading.get_ident():
+            # Чтение внутри собственной записи
+            local.depth, local.counted = 1, False
+            return
+        with self._mutex:
+            while self._writer is not None or self._waiting_writers:
+                self._can_read.wait()
+            self._readers += 1
+        local.depth, local.counted = 1, True
+
+    def release_read(self) -> None:
+        """Освобождение блокировки на чтение"""
+        local = self._local
+        local.depth -= 1
+        if local.depth or not local.counted:
+            return
+        with self._mutex:
+            self._readers -= 1
+            if not self._readers:
+                self._can_write.notify()
+
+    def acquire_write(self) -> None:
+        """
+        Взятие блокировки на запись (ожидает всех читателей и писателя)
+
+        Raises:
+            RuntimeError: Поток держит блокировку только на чтение
+        """
+        me = threading.get_ident()
+        if self._writer == me:
+            self._write_depth += 1
+            return
+        if getattr(self._local, "depth", 0):
+            raise RuntimeError("Нельзя взять запись, удерживая чтение")
+        with self._mutex:
+            self._waiting_writers += 1
+            while self._writer is not None or self._readers:
+                self._can_write.wait()
+            self._waiting_writers -= 1
+            self._writer = me
+            self._write_depth = 1
+
+    def release_write(self) -> None:
+        """Освобождение блокировки на запись"""
+        self._write_depth -= 1
+        if self._write_depth:
+            return
+        with self._mutex:
+            self._writer = None
+            if self._waiting_writers:
+                self._can_write.notify()
+            else:
+                self._can_read.notify_all()
+
+    @contextmanager
+    def read(self) -> Iterator[None]:
+        """Блокировка на чтение в блоке with"""
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write(self) -> Iterator[None]:
+        """Блокировка на запись в блоке with"""
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
@@ -0,0 +1,126 @@
+from array import array
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator, Sequence
+from DishBase import DishBase
+from MenuDatabase import MenuDatabase
+
+class SqliteDishStore(Sequence):
+    """
+    Хранилище блюд MenuManager в базе SQLite (MenuDatabase)
+
+    Слот i хранилища — строка базы с id = i + 1: при открытии база
+    уплотняется, новые блюда получают следующие идентификаторы, а
+    уплотнение перенумеровывает строки подряд. Удаление в MenuManager
+    сразу помечает строки в базе (mark_removed), поэтому изменения меню
+    сохраняются без отдельного сохранения файла.
+
+    Блюда читаются страницами по PAGE_SIZE одним запросом по ключу, в
+    памяти держится не больше CACHED_PAGES страниц: MenuTableModel при
+    перерисовке обращается к соседним слотам, и они берутся из одной страницы.
+    Сортировка и поиск MenuIndex идут запросами к индексам базы
+    (sorted_slots, search_slots), блюда для них не читаются.
+    """
+
+    PAGE_SIZE = 1000
+    CACHED_PAGES = 64
+
+    def __init__(self, database: MenuDatabase|str):
+        """
+        Открытие хранилища с уплотнением базы
+
+        Args:
+            database (MenuDatabase|str): База или путь к её файлу (закрывается вместе с хранилищем)
+        """
+        self.database = MenuDatabase(database) if isinstance(database, str) else database
+        self.database.compact()
+        self._length = self.database.max_id()
+        # Прочитанные страницы: номер страницы -> блюда, в порядке последнего обращения
+        self._pages = OrderedDict()
+
+    def __len__(self) -> int:
+        """Получение количества блюд (включая помеченные удалёнными до уплотнения)"""
+        return self._length
+
+    def __getitem__(self, index):
+        """Получение блюда (или списка блюд для среза) из страницы базы"""
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("индекс блюда вне диапазона")
+        page_number, offset = divmod(index, self.PAGE_SIZE)
+        page = self._pages.get(page_number)
+        if page is None:
+            page = self.database.rows_from(page_number * self.PAGE_SIZE + 1, self.PAGE_SIZE)
+            self._pages[page_number] = page
+            if len(self._pages) > self.CACHED_PAGES:
+                self._pages.popitem(last=False)
+        else:
+            self._pages.move_to_end(page_number)
+        return page[offset]
+
+    def __iter__(self) -> Iterator[DishBase]:
+        """Перебор блюд всех слотов страницами по ключу, мимо кэша страниц"""
+        for first in range(0, len(self), self.PAGE_SIZE):
+            yield from self.database.rows_from(first + 1, self.PAGE_SIZE)
+
+    def append(self, dish: DishBase) -> None:
+        """Добавление блюда"""
+        self.extend([dish])
+
+    def extend(self, dishes: Iterable[DishBase]) -> None:
+        """Добавление нескольких блюд одной транзакцией"""
+        # Последняя страница могла быть прочитана неполной
+        self._pages.pop(self._length // self.PAGE_SIZE, None)
+        self._length += self.database.insert_many(dishes)
+
+    def sorted_slots(self, field: str) -> array:
+        """
+        Слоты оставшихся блюд по возрастанию поля (для MenuIndex.sorted_rows)
+
+        Args:
+            field (str): "name", "price" или "minutes"
+
+        Returns:
+            array: Номера слотов
+        """
+        return array('q', (dish_id - 1 for dish_id in self.database.ordered_ids(field)))
+
+    def search_slots(self, text: str, conditions: Sequence[tuple[str, str, float]], prefix: bool) -> list[int]:
+        """
+        Слоты оставшихся блюд, подходящих под условия (для MenuIndex.search)
+
+        Args:
+            text (str): Подстрока (или префикс) названия
+            conditions (Sequence[tuple[str, str, float]]): Условия на цену и время
+            prefix (bool): Искать названия, начинающиеся с text
+
+        Returns:
+            list[int]: Номера слотов по возрастанию
+        """
+        return [dish_id - 1 for dish_id in self.database.search_ids(text, conditions, prefix)]
+
+    def mark_removed(self, slots: Sequence[int]) -> None:
+        """
+        Пометка блюд удалёнными в базе (вызывается MenuManager при удалении)
+
+        Args:
+            slots (Sequence[int]): Слоты удалённых блюд
+        """
+        self.database.mark_removed(slot + 1 for slot in slots)
+
+    def compact(self, keep: Sequence[int]) -> None:
+        """
+        Уплотнение: в базе остаются только не помеченные удалёнными блюда
+
+        Args:
+            keep (Sequence[int]): Слоты сохраняемых блюд по возрастанию (те же, что не помечены)
+        """
+        self.database.compact()
+        self._length = len(keep)
+        self._pages.clear()
+
+    def close(self) -> None:
+        """Закрытие базы"""
+        self.database.close()
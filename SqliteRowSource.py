@@ -0,0 +1,46 @@
+from bisect import bisect_right
+from collections.abc import Sequence
+from DishBase import DishBase
+from MenuDatabase import MenuDatabase
+from MenuRowSource import MenuRowSource
+
+class SqliteRowSource(MenuRowSource):
+    """
+    Источник строк из базы SQLite (MenuDatabase)
+
+    Для каждой границы, до которой модель узнавала строки (count_more),
+    запоминается идентификатор последнего блюда перед ней; страница
+    читается запросом по ключу от ближайшей такой границы.
+    """
+
+    def __init__(self, database: MenuDatabase):
+        """
+        Инициализация источника
+
+        Args:
+            database (MenuDatabase): База меню (закрывается вместе с источником)
+        """
+        self.database = database
+        # Номера строк границ по возрастанию и идентификаторы блюд перед ними
+        self._starts = [0]
+        self._after_ids = [0]
+
+    def count_more(self, known: int, limit: int) -> int:
+        """Количество блюд базы после первых known (не больше limit)"""
+        boundary = bisect_right(self._starts, known) - 1
+        skip = known - self._starts[boundary]
+        count, last_id = self.database.count_after(self._after_ids[boundary], skip + limit)
+        count -= skip
+        if count > 0 and known + count > self._starts[-1]:
+            self._starts.append(known + count)
+            self._after_ids.append(last_id)
+        return max(count, 0)
+
+    def rows(self, start: int, count: int) -> Sequence[DishBase]:
+        """Блюда строк start..start + count - 1"""
+        boundary = bisect_right(self._starts, start) - 1
+        return self.database.page(self._after_ids[boundary], count, start - self._starts[boundary])
+
+    def close(self) -> None:
+        """Закрытие базы"""
+        self.database.close()
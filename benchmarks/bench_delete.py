@@ -0,0 +1,58 @@
+"""
+Бенчмарк удаления блюд: MenuManager.delete_many с моделью таблицы против удаления по одному
+
+Запуск: python benchmarks/bench_delete.py [количество блюд] [количество удаляемых]
+"""
+
+import random
+import sys
+import time
+
+from PyQt6.QtCore import QCoreApplication
+
+from common import make_dishes
+from main import MenuFilterProxyModel, MenuManager, MenuTableModel
+
+
+def make_manager(count: int) -> tuple[MenuManager, MenuTableModel]:
+    """Менеджер меню с моделью таблицы и прокси-моделью, как в окне"""
+    manager = MenuManager()
+    model = MenuTableModel(manager)
+    proxy = MenuFilterProxyModel(manager)
+    proxy.setSourceModel(model)
+    manager.add_dishes(make_dishes(count))
+    return manager, model
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    selected = int(sys.argv[2]) if len(sys.argv) > 2 else 50_000
+    app = QCoreApplication(sys.argv)
+    print(f"Блюд: {count}, удаляется: {selected}")
+
+    cases = (
+        ("подряд", lambda model: range(count // 3, count // 3 + selected)),
+        ("вразброс", lambda model: random.Random(1).sample(range(count), selected)),
+    )
+    for title, make_rows in cases:
+        manager, model = make_manager(count)
+        rows = make_rows(model)
+        start = time.perf_counter()
+        manager.delete_many(model.dish_ids(rows))
+        print(f"{'delete_many, ' + title:>24}: {(time.perf_counter() - start) * 1e3:8.2f} мс")
+
+    # Удаление по одному: сигнал модели и поиск строки на каждое блюдо
+    manager, model = make_manager(count)
+    sample = min(selected, 200)
+    rows = sorted(random.Random(1).sample(range(count), sample), reverse=True)
+    start = time.perf_counter()
+    for row in rows:
+        manager.delete_dish(row)
+    elapsed = time.perf_counter() - start
+    print(f"{'delete_dish по одному':>24}: {elapsed * 1e3:8.2f} мс на {sample} "
+          f"(~{elapsed / sample * selected:.1f} с на {selected})")
+    del app
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Бенчмарк памяти на одно блюдо: блюда с __dict__, с __slots__ и ColumnarDishStore
+
+Запуск: python benchmarks/bench_dish_memory.py [количество блюд]
+"""
+
+import datetime
+import sys
+import tracemalloc
+
+from common import make_dishes
+from ColumnarDishStore import ColumnarDishStore
+
+
+class LegacyDish:
+    """Блюдо с __dict__, как до перехода DishBase на __slots__"""
+    
+    def __init__(self, name: str, price: float, prep_time: datetime.time):
+        self.__name = name
+        self.__price = price
+        self.__prep_time = prep_time
+
+
+def bytes_per_dish(build, count: int) -> float:
+    """Объём Python-памяти, занятой меню, в пересчёте на одно блюдо"""
+    tracemalloc.start()
+    menu = build(count)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del menu
+    return size / count
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    variants = {
+        "__dict__": lambda n: [LegacyDish(d.name, d.price, d.prep_time) for d in make_dishes(n)],
+        "__slots__": make_dishes,
+        "столбцы": lambda n: ColumnarDishStore(make_dishes(n)),
+    }
+    print(f"Блюд: {count}")
+    for label, build in variants.items():
+        print(f"{label:>10}: {bytes_per_dish(build, count):7.1f} байт на блюдо")
+
+
+if __name__ == "__main__":
+    main()
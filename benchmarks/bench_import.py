@@ -0,0 +1,67 @@
+"""
+Бенчмарк времени импорта: слой данных должен загружаться быстро и без PyQt6
+
+Каждый модуль импортируется в новом интерпретаторе с -X importtime, берётся
+медиана нескольких запусков (время одного запуска заметно плавает). Код
+возврата 1, если импорт ядра дольше бюджета или тянет за собой PyQt6.
+
+Запуск: python benchmarks/bench_import.py [бюджет в мс]
+"""
+
+import statistics
+import subprocess
+import sys
+
+from common import ROOT_DIR
+
+# Бюджет на импорт ядра (в миллисекундах) и модули, которые в него входят
+IMPORT_BUDGET_MS = 80
+CORE_MODULES = ("main", "cli")
+# Для сравнения: модули интерфейса
+GUI_MODULES = ("MenuWindow",)
+REPEAT = 15
+
+
+def import_time(module: str) -> tuple[float, bool]:
+    """
+    Время импорта модуля в новом интерпретаторе
+
+    Args:
+        module (str): Имя модуля
+
+    Returns:
+        tuple[float, bool]: Медиана времени в миллисекундах и признак импорта PyQt6
+    """
+    times = []
+    imports_qt = False
+    for _ in range(REPEAT):
+        result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                                cwd=ROOT_DIR, capture_output=True, text=True, check=True)
+        # Строки вида "import time:   self [us] | cumulative | имя модуля"
+        for line in result.stderr.splitlines():
+            if not line.startswith("import time:") or "|" not in line:
+                continue
+            _, cumulative, name = line.split("|")
+            imports_qt = imports_qt or name.strip().startswith("PyQt6")
+            if name.strip() == module:
+                times.append(int(cumulative) / 1000)
+    return statistics.median(times), imports_qt
+
+
+def main() -> int:
+    budget = float(sys.argv[1]) if len(sys.argv) > 1 else IMPORT_BUDGET_MS
+    failed = False
+    for module in CORE_MODULES:
+        elapsed, imports_qt = import_time(module)
+        over = elapsed > budget or imports_qt
+        failed = failed or over
+        status = "ПРЕВЫШЕН БЮДЖЕТ" if elapsed > budget else "импортирует PyQt6" if imports_qt else "ok"
+        print(f"{module:>12}: {elapsed:8.2f} мс (бюджет {budget:.0f} мс) {status}")
+    for module in GUI_MODULES:
+        elapsed, _ = import_time(module)
+        print(f"{module:>12}: {elapsed:8.2f} мс (интерфейс, без бюджета)")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
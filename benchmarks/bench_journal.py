@@ -0,0 +1,48 @@
+"""
+Бенчмарк сохранения после одного изменения: полная перезапись файла (save_menu) против записи в журнал (MenuJournal)
+
+Запуск: python benchmarks/bench_journal.py [количество блюд ...]
+"""
+
+import datetime
+import os
+import sys
+import tempfile
+import time
+
+from common import SIZES, NullLogger, make_dishes, measure
+from ColumnarDishStore import ColumnarDishStore
+from Dish import Dish
+from MenuFileHandler import MenuFileHandler
+from MenuJournal import MenuJournal
+from MenuManager import MenuManager
+
+# Сколько изменений записывается в журнал для усреднения
+CHANGES = 1_000
+
+
+def main() -> None:
+    sizes = [int(arg) for arg in sys.argv[1:]] or SIZES
+    handler = MenuFileHandler(NullLogger())
+    dish = Dish("Новое блюдо", 500.0, datetime.time(0, 30))
+    print(f"{'блюд':>10} {'save_menu .menub':>18} {'журнал, add_dish':>18}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        for count in sizes:
+            manager = MenuManager(ColumnarDishStore)
+            manager.add_dishes(make_dishes(count))
+            snapshot = os.path.join(directory, f"full{count}.menub")
+            full = measure(lambda: handler.save_menu(manager.view(), snapshot), repeat=3)
+
+            journal = MenuJournal(os.path.join(directory, f"journal{count}.menub"))
+            journal.open(manager)
+            start = time.perf_counter()
+            for _ in range(CHANGES):
+                manager.add_dish(dish)
+            append = (time.perf_counter() - start) / CHANGES
+            journal.close()
+            print(f"{count:>10} {full * 1e3:15.2f} мс {append * 1e3:15.3f} мс")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Бенчмарк логгера: открытие файла на каждое сообщение против фоновой пакетной записи
+(и вызовы логгера без записи как нижняя граница)
+
+Запуск: python benchmarks/bench_logger.py [количество сообщений]
+"""
+
+import datetime
+import os
+import sys
+import tempfile
+import time
+
+from common import NullLogger
+from Logger import Logger
+
+
+class PerCallLogger:
+    """Прежняя схема: проверка существования, open, write и close на каждое сообщение"""
+    
+    def __init__(self, log_dir: str):
+        self.log_dir = log_dir
+        os.makedirs(log_dir, exist_ok=True)
+    
+    def log_message(self, level: str, message: str, filename: str) -> None:
+        path = os.path.join(self.log_dir, filename)
+        mode = "a" if os.path.exists(path) else "w"
+        with open(path, mode, encoding='utf-8') as file:
+            file.write(f"{datetime.datetime.now().strftime('%d-%m-%Y %H:%M:%S')} {level} {message}\n")
+
+
+def run(logger, count: int) -> tuple[float, float]:
+    """Время вызовов log_message и полное время до записи на диск"""
+    start = time.perf_counter()
+    for i in range(count):
+        logger.log_message("ОШИБКА", f"Не удалось разобрать строку {i}", "bench.log")
+    calls = time.perf_counter() - start
+    if hasattr(logger, "close"):
+        logger.close()
+    return calls, time.perf_counter() - start
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    print(f"Сообщений: {count}")
+    with tempfile.TemporaryDirectory() as directory:
+        for label, logger in (("без записи", NullLogger()),
+                              ("open на вызов", PerCallLogger(os.path.join(directory, "old"))),
+                              ("фоновый", Logger(os.path.join(directory, "new")))):
+            calls, total = run(logger, count)
+            print(f"{label:>14}: вызовы {calls:6.2f} с, до записи на диск {total:6.2f} с")
+
+
+if __name__ == "__main__":
+    main()
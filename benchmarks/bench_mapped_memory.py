@@ -0,0 +1,42 @@
+"""
+Бенчмарк памяти и времени открытия меню: полная загрузка против MappedDishStore
+
+Запуск: python benchmarks/bench_mapped_memory.py [количество строк]
+"""
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from common import NullLogger, write_menu_file
+from MenuFileHandler import MenuFileHandler
+
+
+def run(label: str, func) -> None:
+    """Замер времени и пика выделенной Python-памяти"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:>12}: {elapsed:6.2f} с, пик памяти {peak / 2**20:8.1f} МБ, блюд {len(result)}")
+    if hasattr(result, "close"):
+        result.close()
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    handler = MenuFileHandler(NullLogger(), engine="fast")
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "menu.txt")
+        write_menu_file(filename, count)
+        print(f"Строк: {count}, размер файла {os.path.getsize(filename) / 2**20:.1f} МБ")
+        run("load_menu", lambda: handler.load_menu(filename))
+        run("map_menu", lambda: handler.map_menu(filename))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""
+Бенчмарк доступа MenuTableModel к ячейкам при прокрутке и перерисовке
+
+Повторная перерисовка берёт текст из кэша ячеек; для сравнения кэш
+сбрасывается перед каждой перерисовкой (первый показ строк).
+
+Запуск: python benchmarks/bench_model_access.py
+"""
+
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from common import SIZES, make_dishes, measure
+from main import MenuManager, MenuTableModel
+
+VISIBLE_ROWS = 40
+
+
+def repaint(model: MenuTableModel, first_row: int) -> None:
+    """Имитация перерисовки видимой области таблицы"""
+    model.rowCount()
+    for row in range(first_row, first_row + VISIBLE_ROWS):
+        for column in range(model.columnCount()):
+            model.data(model.index(row, column))
+
+
+def main() -> None:
+    print(f"{'Блюд':>10} {'перерисовка, мкс':>18} {'на ячейку, мкс':>16} {'без кэша, мкс':>15}")
+    for size in SIZES:
+        manager = MenuManager()
+        manager.add_dishes(make_dishes(size))
+        model = MenuTableModel(manager)
+        # Прокрутка в начало, середину и конец таблицы
+        positions = (0, size // 2, size - VISIBLE_ROWS)
+        elapsed = measure(lambda: [repaint(model, row) for row in positions]) / len(positions)
+        cold = measure(lambda: [(model.invalidate(), repaint(model, row)) for row in positions]) / len(positions)
+        cells = VISIBLE_ROWS * model.columnCount()
+        print(f"{size:>10} {elapsed * 1e6:>18.1f} {elapsed * 1e6 / cells:>16.2f} {cold * 1e6:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
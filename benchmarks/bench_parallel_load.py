@@ -0,0 +1,39 @@
+"""
+Бенчмарк параллельной загрузки меню филиалов: MenuFileHandler.load_many с разным числом процессов
+
+Запуск: python benchmarks/bench_parallel_load.py [количество файлов] [блюд в файле]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from common import NullLogger, write_menu_file
+from MenuFileHandler import MenuFileHandler
+
+
+def main() -> None:
+    files = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    per_file = int(sys.argv[2]) if len(sys.argv) > 2 else 5_000
+    cores = os.cpu_count() or 1
+    handler = MenuFileHandler(NullLogger(), engine="fast")
+    print(f"Файлов: {files}, блюд в файле: {per_file}, ядер: {cores}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        filenames = [os.path.join(directory, f"branch{i}.txt") for i in range(files)]
+        for filename in filenames:
+            write_menu_file(filename, per_file)
+
+        baseline = None
+        for workers in sorted({1, 2, 4, cores}):
+            start = time.perf_counter()
+            store, _ = handler.load_many(filenames, "keep_first", workers=workers)
+            elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            print(f"{workers:>3} процесс(ов): {elapsed:7.2f} с, ускорение {baseline / elapsed:4.1f}x, "
+                  f"блюд после объединения {len(store)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""
+Бенчмарк загрузки меню построчным и блочным движками разбора, в том числе сильно повреждённого файла
+
+Запуск: python benchmarks/bench_parse.py [количество строк]
+"""
+
+import os
+import sys
+import tempfile
+
+from common import NullLogger, measure, write_corrupted_menu_file, write_menu_file
+from MenuFileHandler import MenuFileHandler
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "menu.txt")
+        write_menu_file(filename, count)
+        print(f"Строк: {count}")
+        results = {}
+        for engine in MenuFileHandler.PARSE_ENGINES:
+            handler = MenuFileHandler(NullLogger(), engine=engine)
+            results[engine] = measure(lambda: handler.load_menu(filename), repeat=3)
+            print(f"{engine:>8}: {results[engine]:.2f} с")
+        print(f"Ускорение: {results['python'] / results['fast']:.1f}x")
+
+        # Половина строк с ошибками: в лог попадают только первые ошибки каждого вида
+        write_corrupted_menu_file(filename, count)
+        for engine in MenuFileHandler.PARSE_ENGINES:
+            handler = MenuFileHandler(NullLogger(), engine=engine)
+            elapsed = measure(lambda: handler.load_menu(filename), repeat=3)
+            print(f"{engine:>8}, половина строк с ошибками: {elapsed:.2f} с "
+                  f"({elapsed / results[engine]:.2f} от чистого файла), {handler.parse_report.summary()[:60]}…")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Бенчмарк сохранения текстового меню: прежняя построчная запись против блочной атомарной записи save_menu
+
+Запуск: python benchmarks/bench_save.py [количество блюд]
+"""
+
+import os
+import sys
+import tempfile
+
+from common import NullLogger, make_dishes, measure
+from ColumnarDishStore import ColumnarDishStore
+from MenuFileHandler import MenuFileHandler
+from MenuManager import MenuManager
+
+
+def save_by_lines(dishes, filename: str) -> None:
+    """Прежний путь: отдельный file.write на каждую строку"""
+    temp_filename = f"{filename}.tmp"
+    with open(temp_filename, 'w', encoding='utf-8') as file:
+        for dish in dishes:
+            file.write(str(dish) + "\n")
+    os.replace(temp_filename, filename)
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    dishes = make_dishes(count)
+    manager = MenuManager(ColumnarDishStore)
+    manager.add_dishes(dishes)
+    print(f"Блюд: {count}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "menu.txt")
+        cases = [("построчно, список Dish", lambda: save_by_lines(dishes, filename))]
+        for fsync in ("never", "file", "full"):
+            handler = MenuFileHandler(NullLogger(), fsync=fsync)
+            cases.append((f"save_menu, список Dish, fsync={fsync}",
+                          lambda handler=handler: handler.save_menu(dishes, filename)))
+            cases.append((f"save_menu, столбцы, fsync={fsync}",
+                          lambda handler=handler: handler.save_menu(manager.view(), filename)))
+
+        baseline = None
+        for title, save in cases:
+            elapsed = measure(save, repeat=3)
+            baseline = baseline or elapsed
+            size = os.path.getsize(filename) / (1 << 20)
+            print(f"{title:>38}: {elapsed * 1e3:8.1f} мс, {size / elapsed:6.1f} МБ/с, "
+                  f"ускорение {baseline / elapsed:4.1f}x")
+
+
+if __name__ == "__main__":
+    main()
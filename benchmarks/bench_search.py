@@ -0,0 +1,44 @@
+"""
+Бенчмарк поиска по меню: MenuIndex против линейного просмотра
+
+Запуск: python benchmarks/bench_search.py [количество блюд]
+"""
+
+import sys
+import time
+
+from common import make_dishes, measure
+from MenuManager import MenuManager
+
+QUERIES = ("Блюдо 123", "Блюдо 42 цена<150", "цена=500 время<=0:10", "Блюдо 9999 время>=2:00")
+
+
+def linear_search(dishes, text: str, max_price: float|None = None) -> list[int]:
+    """Поиск полным просмотром меню"""
+    text = text.casefold()
+    return [row for row, dish in enumerate(dishes)
+            if text in dish.name.casefold() and (max_price is None or dish.price < max_price)]
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    manager = MenuManager()
+    manager.add_dishes(make_dishes(count))
+    print(f"Блюд: {count}")
+
+    start = time.perf_counter()
+    manager.index.search_text("")
+    manager.index.search("прогрев")
+    print(f"Построение индекса: {time.perf_counter() - start:.2f} с")
+
+    for query in QUERIES:
+        elapsed = measure(lambda: manager.index.search_text(query))
+        found = len(manager.index.search_text(query))
+        print(f"{query!r:>28}: {elapsed * 1e3:8.2f} мс, найдено {found}")
+
+    elapsed = measure(lambda: linear_search(manager.dishes, "Блюдо 42", 150.0), repeat=1)
+    print(f"{'линейный просмотр':>28}: {elapsed * 1e3:8.2f} мс")
+
+
+if __name__ == "__main__":
+    main()
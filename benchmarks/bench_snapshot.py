@@ -0,0 +1,33 @@
+"""
+Бенчмарк сохранения и загрузки меню: текстовый формат против двоичного снимка
+
+Запуск: python benchmarks/bench_snapshot.py [количество блюд]
+"""
+
+import os
+import sys
+import tempfile
+
+from common import NullLogger, make_dishes, measure
+from ColumnarDishStore import ColumnarDishStore
+from MenuFileHandler import MenuFileHandler
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    store = ColumnarDishStore(make_dishes(count))
+    handler = MenuFileHandler(NullLogger(), engine="fast")
+    print(f"Блюд: {count}")
+    with tempfile.TemporaryDirectory() as directory:
+        for label, filename, load in (
+            ("текст", os.path.join(directory, "menu.txt"), handler.load_menu),
+            ("снимок", os.path.join(directory, "menu.menub"), handler.load_snapshot),
+        ):
+            save_time = measure(lambda: handler.save_menu(store, filename), repeat=1)
+            load_time = measure(lambda: load(filename), repeat=3)
+            size = os.path.getsize(filename) / 2**20
+            print(f"{label:>7}: сохранение {save_time:6.2f} с, загрузка {load_time:6.2f} с, {size:6.1f} МБ")
+
+
+if __name__ == "__main__":
+    main()
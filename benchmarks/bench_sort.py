@@ -0,0 +1,54 @@
+"""
+Бенчмарк сортировки таблицы меню: MenuTableModel.sort против сортировки через data()
+
+Запуск: python benchmarks/bench_sort.py [количество блюд]
+"""
+
+import datetime
+import sys
+import time
+
+from PyQt6.QtCore import QCoreApplication, Qt
+
+from common import make_dishes, measure
+from Dish import Dish
+from main import MenuManager, MenuTableModel
+
+
+def sort_by_data(model: MenuTableModel, column: int) -> list[int]:
+    """Сортировка строк по отображаемому значению, как у QSortFilterProxyModel"""
+    return sorted(range(model.rowCount()), key=lambda row: model.data(model.index(row, column)))
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    app = QCoreApplication(sys.argv)
+    manager = MenuManager()
+    model = MenuTableModel(manager)
+    manager.add_dishes(make_dishes(count))
+    print(f"Блюд: {count}")
+
+    start = time.perf_counter()
+    manager.index.search_text("прогрев")
+    print(f"Построение индекса: {time.perf_counter() - start:.2f} с")
+
+    for column, header in enumerate(model.headers):
+        elapsed = measure(lambda: model.sort(column), repeat=3)
+        print(f"{header:>20}: {elapsed * 1e3:8.2f} мс")
+
+    # Вставка в отсортированную таблицу — двоичный поиск места вместо пересортировки
+    model.sort(1, Qt.SortOrder.DescendingOrder)
+    dishes = [Dish(f"Новое блюдо {i}", 100.0 + i, datetime.time(0, i % 60)) for i in range(100)]
+    start = time.perf_counter()
+    for dish in dishes:
+        manager.add_dish(dish)
+    print(f"{'вставка 100 блюд':>20}: {(time.perf_counter() - start) * 1e3:8.2f} мс")
+
+    model.sort(-1)
+    elapsed = measure(lambda: sort_by_data(model, 1), repeat=1)
+    print(f"{'через data()':>20}: {elapsed * 1e3:8.2f} мс")
+    del app
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,297 @@
+"""
+Набор бенчмарков горячих путей с сохранением базовых результатов и поиском регрессий
+
+Измеряются загрузка меню (чистый и повреждённый файл), сохранение (текст
+и снимок), перерисовка MenuTableModel (data/rowCount, offscreen Qt), открытие файла
+в MenuPagedTableModel,
+MenuManager.add_dish/delete_dish с подключённой моделью и Logger.log_message.
+Данные синтетические и детерминированные (common.make_store,
+write_menu_file, write_corrupted_menu_file), время — лучшее из нескольких
+запусков (common.measure), перед каждым случаем собирается мусор.
+
+Результаты сравниваются с базовыми из JSON-файла: случай, ставший
+медленнее базового больше чем на порог, отмечается как регрессия, и код
+возврата будет 1. Базовые результаты зависят от машины, поэтому
+сохраняются на той машине, где потом сравниваются (--save-baseline).
+
+Запуск:
+    python benchmarks/bench_suite.py --sizes 1k,10k,100k --save-baseline
+    python benchmarks/bench_suite.py --sizes 1k,10k,100k
+    python benchmarks/bench_suite.py --sizes 1M,10M --only load_menu,save_menu
+"""
+
+import argparse
+import datetime
+import gc
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from common import NullLogger, ROOT_DIR, make_store, measure, write_corrupted_menu_file, write_menu_file
+from ColumnarDishStore import ColumnarDishStore
+from Dish import Dish
+from Logger import Logger
+from MenuFileHandler import MenuFileHandler
+from MenuManager import MenuManager
+
+# Базовые результаты по умолчанию
+BASELINE_FILE = os.path.join(ROOT_DIR, "benchmarks", "baseline.json")
+# Случай медленнее базового больше чем на эту долю считается регрессией
+REGRESSION_THRESHOLD = 0.25
+# Размеры меню по умолчанию (до 10M — через --sizes)
+DEFAULT_SIZES = "1k,10k,100k"
+REPEAT = 3
+# Видимая область таблицы при перерисовке и число изменений в случаях MenuManager
+VISIBLE_ROWS = 40
+MANAGER_CALLS = 200
+LOG_MESSAGES = 10_000
+
+
+def parse_size(text: str) -> int:
+    """Размер вида 1k, 10M или 2500"""
+    multipliers = {"k": 1_000, "m": 1_000_000}
+    suffix = text[-1].lower()
+    return int(float(text[:-1]) * multipliers[suffix]) if suffix in multipliers else int(text)
+
+
+def make_manager(size: int, with_model: bool = False):
+    """Меню из size блюд (по столбцам), при необходимости с моделью таблицы"""
+    manager = MenuManager(ColumnarDishStore)
+    manager.use_storage(make_store(size))
+    model = None
+    if with_model:
+        from MenuTableModel import MenuTableModel
+        model = MenuTableModel(manager)
+    return manager, model
+
+
+def bench_load_clean(size: int, directory: str) -> float:
+    """MenuFileHandler.load_menu, файл без ошибок (fast)"""
+    filename = os.path.join(directory, f"clean{size}.txt")
+    write_menu_file(filename, size)
+    handler = MenuFileHandler(NullLogger(), engine="fast")
+    return measure(lambda: handler.load_menu(filename), REPEAT)
+
+
+def bench_load_corrupted(size: int, directory: str) -> float:
+    """MenuFileHandler.load_menu, ошибка в каждой второй строке (fast)"""
+    filename = os.path.join(directory, f"corrupted{size}.txt")
+    write_corrupted_menu_file(filename, size)
+    handler = MenuFileHandler(NullLogger(), engine="fast")
+    return measure(lambda: handler.load_menu(filename), REPEAT)
+
+
+def bench_save_text(size: int, directory: str) -> float:
+    """MenuFileHandler.save_menu в текст (fsync=never, чтобы мерить код, а не диск)"""
+    manager, _ = make_manager(size)
+    handler = MenuFileHandler(NullLogger(), fsync="never")
+    filename = os.path.join(directory, "save.txt")
+    return measure(lambda: handler.save_menu(manager.view(), filename), REPEAT)
+
+
+def bench_save_snapshot(size: int, directory: str) -> float:
+    """MenuFileHandler.save_menu в снимок .menub (fsync=never)"""
+    manager, _ = make_manager(size)
+    handler = MenuFileHandler(NullLogger(), fsync="never")
+    filename = os.path.join(directory, "save.menub")
+    return measure(lambda: handler.save_menu(manager.view(), filename), REPEAT)
+
+
+def bench_model_repaint(size: int, directory: str) -> float:
+    """Одна перерисовка видимой области: rowCount и data() всех её ячеек (в начале, середине, конце)"""
+    _, model = make_manager(size, with_model=True)
+    first_rows = (0, max(size // 2 - VISIBLE_ROWS, 0), max(size - VISIBLE_ROWS, 0))
+
+    def repaint():
+        for first_row in first_rows:
+            model.invalidate()
+            model.rowCount()
+            for row in range(first_row, min(first_row + VISIBLE_ROWS, size)):
+                for column in range(model.columnCount()):
+                    model.data(model.index(row, column))
+    return measure(repaint, REPEAT) / len(first_rows)
+
+
+def bench_paged_open(size: int, directory: str) -> float:
+    """Открытие файла в MenuPagedTableModel: первая страница и её видимая область"""
+    from FileRowSource import FileRowSource
+    from MenuPagedTableModel import MenuPagedTableModel
+    filename = os.path.join(directory, f"clean{size}.txt")
+    if not os.path.exists(filename):
+        write_menu_file(filename, size)
+
+    def open_file():
+        model = MenuPagedTableModel(FileRowSource(filename))
+        model.fetchMore()
+        for row in range(min(VISIBLE_ROWS, model.rowCount())):
+            for column in range(model.columnCount()):
+                model.data(model.index(row, column))
+        model.source.close()
+    return measure(open_file, REPEAT)
+
+
+def bench_add_dish(size: int, directory: str) -> float:
+    """MenuManager.add_dish с подключённой моделью таблицы (на вызов)"""
+    dish = Dish("Новое блюдо", 500.0, datetime.time(0, 30))
+
+    def add():
+        manager, _ = make_manager(size, with_model=True)
+        start = time.perf_counter()
+        for _ in range(MANAGER_CALLS):
+            manager.add_dish(dish)
+        return time.perf_counter() - start
+    return min(add() for _ in range(REPEAT)) / MANAGER_CALLS
+
+
+def bench_delete_dish(size: int, directory: str) -> float:
+    """MenuManager.delete_dish с подключённой моделью таблицы (на вызов, из середины меню)"""
+    calls = min(MANAGER_CALLS, size // 2)
+
+    def delete():
+        manager, _ = make_manager(size, with_model=True)
+        start = time.perf_counter()
+        for _ in range(calls):
+            manager.delete_dish(len(manager) // 2)
+        return time.perf_counter() - start
+    return min(delete() for _ in range(REPEAT)) / calls
+
+
+def bench_log_message(size: int, directory: str) -> float:
+    """Logger.log_message (на вызов; размер меню не влияет)"""
+    logger = Logger(os.path.join(directory, "logs"))
+
+    def log():
+        for i in range(LOG_MESSAGES):
+            logger.log_message("ОШИБКА", f"Не удалось разобрать строку {i}")
+    elapsed = measure(log, REPEAT) / LOG_MESSAGES
+    logger.close()
+    return elapsed
+
+
+# Случаи: имя -> (функция, зависит ли от размера меню)
+CASES = {
+    "load_menu/clean": (bench_load_clean, True),
+    "load_menu/corrupted": (bench_load_corrupted, True),
+    "save_menu/text": (bench_save_text, True),
+    "save_menu/snapshot": (bench_save_snapshot, True),
+    "model/repaint": (bench_model_repaint, True),
+    "model/paged_open": (bench_paged_open, True),
+    "manager/add_dish": (bench_add_dish, True),
+    "manager/delete_dish": (bench_delete_dish, True),
+    "logger/log_message": (bench_log_message, False),
+}
+
+
+def run(sizes: list[int], only: list[str]|None) -> dict[str, float]:
+    """
+    Запуск выбранных случаев
+
+    Args:
+        sizes (list[int]): Размеры меню
+        only (list[str]|None): Префиксы имён случаев (None — все)
+
+    Returns:
+        dict[str, float]: Время по ключам "случай@размер" (в секундах)
+    """
+    from PyQt6.QtCore import QCoreApplication
+    # Приложение Qt нужно модели таблицы; ссылка держит его до конца замеров
+    application = QCoreApplication.instance() or QCoreApplication(sys.argv)
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for name, (bench, sized) in CASES.items():
+            if only and not any(name.startswith(prefix) for prefix in only):
+                continue
+            for size in sizes if sized else sizes[:1]:
+                key = f"{name}@{size}" if sized else name
+                gc.collect()
+                results[key] = bench(size, directory)
+                print(f"  {key:<32} {format_time(results[key]):>12}", file=sys.stderr)
+    del application
+    return results
+
+
+def format_time(seconds: float) -> str:
+    """Время в удобных единицах"""
+    for unit, scale in (("с", 1), ("мс", 1e-3), ("мкс", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} нс"
+
+
+def environment() -> dict[str, str]:
+    """Описание машины, с которой сравнимы результаты"""
+    return {"python": platform.python_version(), "machine": platform.machine(),
+            "system": platform.system(), "processor": platform.processor(), "cpus": str(os.cpu_count())}
+
+
+def compare(results: dict[str, float], baseline: dict[str, float], threshold: float) -> list[str]:
+    """
+    Сравнение с базовыми результатами и печать таблицы
+
+    Returns:
+        list[str]: Случаи с регрессией
+    """
+    regressions = []
+    print(f"{'случай':<32} {'сейчас':>12} {'база':>12} {'отношение':>10}")
+    for key, elapsed in results.items():
+        base = baseline.get(key)
+        if base is None:
+            print(f"{key:<32} {format_time(elapsed):>12} {'—':>12}")
+            continue
+        ratio = elapsed / base
+        status = ""
+        if ratio > 1 + threshold:
+            status = "РЕГРЕССИЯ"
+            regressions.append(key)
+        elif ratio < 1 - threshold:
+            status = "быстрее"
+        print(f"{key:<32} {format_time(elapsed):>12} {format_time(base):>12} {ratio:>9.2f}x {status}")
+    return regressions
+
+
+def main(argv: list[str]|None = None) -> int:
+    parser = argparse.ArgumentParser(description="Набор бенчмарков горячих путей меню")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="размеры меню через запятую: 1k,10k,...,10M")
+    parser.add_argument("--only", help="префиксы случаев через запятую (load_menu,model,...)")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="файл базовых результатов")
+    parser.add_argument("--save-baseline", action="store_true", help="сохранить результаты как базовые")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD,
+                        help="допустимое замедление относительно базы (доля)")
+    args = parser.parse_args(argv)
+
+    sizes = [parse_size(size) for size in args.sizes.split(",")]
+    results = run(sizes, args.only.split(",") if args.only else None)
+
+    if args.save_baseline:
+        baseline = {"environment": environment(), "results": {}}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, encoding="utf-8") as file:
+                baseline["results"] = json.load(file).get("results", {})
+        baseline["results"].update(results)
+        with open(args.baseline, "w", encoding="utf-8") as file:
+            json.dump(baseline, file, ensure_ascii=False, indent=2, sort_keys=True)
+        print(f"Базовые результаты сохранены: {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        compare(results, {}, args.threshold)
+        print(f"Базовых результатов нет ({args.baseline}), сохраните их флагом --save-baseline")
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as file:
+        baseline = json.load(file)
+    if baseline.get("environment") != environment():
+        print(f"Внимание: базовые результаты сняты на другой машине: {baseline.get('environment')}")
+    regressions = compare(results, baseline.get("results", {}), args.threshold)
+    if regressions:
+        print(f"Регрессии ({len(regressions)}): {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
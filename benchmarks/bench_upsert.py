@@ -0,0 +1,56 @@
+"""
+Бенчмарк добавления без повторов: MenuManager.upsert_many и dedupe против удаления повторов попарным сравнением
+
+Запуск: python benchmarks/bench_upsert.py [количество блюд]
+"""
+
+import sys
+import time
+
+from common import make_dishes
+from ColumnarDishStore import ColumnarDishStore
+from MenuManager import UPSERT_POLICIES, MenuManager
+
+
+def quadratic_dedupe(dishes) -> list:
+    """Удаление повторов сравнением каждого блюда со всеми оставленными"""
+    kept = []
+    for dish in dishes:
+        if not any(dish.name.casefold() == other.name.casefold() for other in kept):
+            kept.append(dish)
+    return kept
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    dishes = make_dishes(count)
+    print(f"Блюд: {count}")
+
+    for policy in UPSERT_POLICIES:
+        manager = MenuManager(ColumnarDishStore)
+        start = time.perf_counter()
+        manager.upsert_many(dishes, policy)
+        print(f"{'upsert_many, ' + policy:>26}: {(time.perf_counter() - start) * 1e3:9.2f} мс, блюд {len(manager)}")
+
+    # Тот же файл загружен повторно: каждое название уже есть в меню
+    start = time.perf_counter()
+    added, replaced = manager.upsert_many(dishes, "keep_last")
+    print(f"{'повторная загрузка':>26}: {(time.perf_counter() - start) * 1e3:9.2f} мс, "
+          f"новых {added}, заменено {replaced}")
+
+    manager = MenuManager(ColumnarDishStore)
+    manager.add_dishes(dishes)
+    start = time.perf_counter()
+    removed = manager.dedupe()
+    print(f"{'dedupe после add_dishes':>26}: {(time.perf_counter() - start) * 1e3:9.2f} мс, удалено {removed}")
+
+    sample = min(count, 2_000)
+    start = time.perf_counter()
+    quadratic_dedupe(dishes[:sample])
+    elapsed = time.perf_counter() - start
+    print(f"{'попарное сравнение':>26}: {elapsed * 1e3:9.2f} мс на {sample} "
+          f"(~{elapsed * (count / sample) ** 2:.0f} с на {count})")
+
+
+if __name__ == "__main__":
+    main()
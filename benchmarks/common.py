@@ -0,0 +1,112 @@
+"""Общие утилиты для бенчмарков"""
+
+import datetime
+import os
+import sys
+import time
+
+# Бенчмарки запускаются из папки benchmarks, а модули проекта лежат в корне
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from Dish import Dish
+
+SIZES = (1_000, 10_000, 100_000, 1_000_000)
+NAME_POOL_SIZE = 10_000
+
+
+def make_dishes(count: int) -> list[Dish]:
+    """
+    Генерация синтетического списка блюд
+    
+    Args:
+        count (int): Количество блюд
+    
+    Returns:
+        list[Dish]: Список блюд
+    """
+    # Названия повторяются, как в сводном меню нескольких филиалов
+    names = [f"Блюдо {i}" for i in range(min(count, NAME_POOL_SIZE))]
+    return [
+        Dish(names[i % len(names)], 100.0 + i % 900, datetime.time(i % 3, i % 60))
+        for i in range(count)
+    ]
+
+
+def measure(func, repeat: int = 5) -> float:
+    """
+    Лучшее время выполнения функции из нескольких запусков
+    
+    Args:
+        func: Функция без аргументов
+        repeat (int): Количество запусков
+    
+    Returns:
+        float: Время в секундах
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+class NullLogger:
+    """Логгер, который ничего не записывает (чтобы не мерить запись на диск)"""
+    
+    def log_message(self, level: str, message: str, filename: str|None = None) -> None:
+        pass
+
+
+def write_menu_file(filename: str, count: int) -> None:
+    """
+    Запись синтетического файла меню
+    
+    Args:
+        filename (str): Путь к файлу
+        count (int): Количество строк
+    """
+    with open(filename, 'w', encoding='utf-8') as file:
+        for i in range(count):
+            file.write(f"Блюдо {i},{100.0 + i % 900},{i % 3:02d}:{i % 60:02d}\n")
+
+
+def write_corrupted_menu_file(filename: str, count: int, error_every: int = 2) -> None:
+    """
+    Запись синтетического файла меню с ошибками разбора разных видов
+    
+    Args:
+        filename (str): Путь к файлу
+        count (int): Количество строк
+        error_every (int): Испорчена каждая error_every-я строка (цена, время или число полей по очереди)
+    """
+    broken = ("Блюдо {i},-{i},00:10\n", "Блюдо {i},100.0,25:{i}\n", "Блюдо {i};100.0;00:10\n")
+    with open(filename, 'w', encoding='utf-8') as file:
+        for i in range(count):
+            if i % error_every == error_every - 1:
+                file.write(broken[i // error_every % len(broken)].format(i=i))
+            else:
+                file.write(f"Блюдо {i},{100.0 + i % 900},{i % 3:02d}:{i % 60:02d}\n")
+
+
+def make_store(count: int):
+    """
+    Синтетическое меню по столбцам (как make_dishes, но без объектов Dish, для миллионов блюд)
+    
+    Args:
+        count (int): Количество блюд
+    
+    Returns:
+        ColumnarDishStore: Хранилище блюд
+    """
+    from array import array
+    from ColumnarDishStore import ColumnarDishStore
+    names = [f"Блюдо {i}" for i in range(min(count, NAME_POOL_SIZE))]
+    return ColumnarDishStore.from_columns(
+        names,
+        array('I', (i % len(names) for i in range(count))),
+        array('d', (100.0 + i % 900 for i in range(count))),
+        array('H', ((i % 3) * 60 + i % 60 for i in range(count))),
+    )
@@ -0,0 +1,223 @@
+"""
+Пакетная обработка файлов меню из командной строки (без PyQt6)
+
+Примеры:
+    python cli.py validate menu1.txt menu2.txt
+    python cli.py merge -o all.menub menu1.txt menu2.txt --dedupe
+    python cli.py dedupe menu.txt -o clean.txt --policy min_price
+    python cli.py convert menu.txt menu.menub
+    python cli.py convert menu.txt menu.sqlite
+    python cli.py summary menus/*.txt
+    python cli.py --metrics validate big.txt
+
+Код возврата 1 означает, что в файлах нашлись ошибки разбора или файлы не удалось прочитать.
+"""
+
+import argparse
+import json
+import sys
+from collections.abc import Sequence
+from ColumnarDishStore import ColumnarDishStore
+from MenuFileHandler import MenuFileHandler
+from MenuIndex import MenuIndex
+from MenuManager import UPSERT_POLICIES, MenuManager
+from MenuMetrics import MenuMetrics
+
+
+class ReportLogger:
+    """Логгер командной строки: сообщения выводятся в stderr с именем текущего файла и подсчитываются"""
+
+    def __init__(self, quiet: bool = False):
+        """
+        Инициализация логгера
+
+        Args:
+            quiet (bool): Только считать сообщения, не выводя их
+        """
+        self.quiet = quiet
+        self.current_file = ""
+        self.errors = 0
+
+    def log_message(self, level: str, message: str, filename: str|None = None) -> None:
+        """
+        Вывод сообщения
+
+        Args:
+            level (str): Уровень сообщения
+            message (str): Текст сообщения
+            filename (str|None): Не используется (совместимость с Logger)
+        """
+        self.errors += 1
+        if not self.quiet:
+            print(f"{self.current_file}: {level}: {message}", file=sys.stderr)
+
+
+def load_files(handler: MenuFileHandler, logger: ReportLogger, filenames: Sequence[str]) -> MenuManager:
+    """
+    Загрузка нескольких файлов меню в один MenuManager
+
+    Файлы читаются сразу по столбцам (MenuFileHandler.load_store) и
+    объединяются без создания объектов блюд. Файлы, которые не удалось
+    прочитать, пропускаются и учитываются как ошибка.
+
+    Args:
+        handler (MenuFileHandler): Обработчик файлов
+        logger (ReportLogger): Логгер обработчика
+        filenames (Sequence[str]): Пути к файлам
+
+    Returns:
+        MenuManager: Меню со всеми блюдами по порядку файлов
+    """
+    manager = MenuManager(ColumnarDishStore, metrics=handler.metrics)
+    stores = []
+    for filename in filenames:
+        logger.current_file = filename
+        try:
+            stores.append(handler.load_store(filename))
+        except (OSError, ValueError) as e:
+            logger.log_message("ОШИБКА", f"Не удалось прочитать файл: {e}")
+    if stores:
+        manager.use_storage(stores[0] if len(stores) == 1 else MenuFileHandler.merge_stores(stores))
+    return manager
+
+
+def dedupe(manager: MenuManager, policy: str = "keep_first") -> int:
+    """
+    Удаление повторов по названию (без учёта регистра и «ё»)
+
+    Args:
+        manager (MenuManager): Меню
+        policy (str): Какое блюдо с названием остаётся (см. UPSERT_POLICIES)
+
+    Returns:
+        int: Количество удалённых блюд
+    """
+    return manager.dedupe(policy)
+
+
+def summarize(manager: MenuManager) -> str:
+    """
+    Сводка по меню: число блюд, уникальных названий, диапазоны цены и времени
+
+    Args:
+        manager (MenuManager): Меню
+
+    Returns:
+        str: Строка сводки
+    """
+    if not len(manager):
+        return "блюд 0"
+    storage, slots = manager.view().storage_slots()
+    if hasattr(storage, "columns"):
+        # Цены и время берутся прямо из столбцов ColumnarDishStore
+        _, _, price_column, minute_column = storage.columns()
+        prices = list(map(price_column.__getitem__, slots))
+        minutes = list(map(minute_column.__getitem__, slots))
+    else:
+        prices = [dish.price for dish in manager.dishes]
+        minutes = [MenuIndex.field_value(dish, "minutes") for dish in manager.dishes]
+    return (f"блюд {len(prices)}, названий {len(manager.names)}, "
+            f"цена {min(prices):.2f}..{max(prices):.2f} (средняя {sum(prices) / len(prices):.2f}), "
+            f"время {min(minutes)}..{max(minutes)} мин (среднее {sum(minutes) / len(minutes):.1f})")
+
+
+def run_validate(args: argparse.Namespace, handler: MenuFileHandler, logger: ReportLogger) -> None:
+    """Проверка файлов: по строке итога на файл и сводка ошибок разбора по видам"""
+    for filename in args.files:
+        errors = logger.errors
+        manager = load_files(handler, logger, [filename])
+        status = "OK" if logger.errors == errors else f"ошибок {handler.parse_report.total or logger.errors - errors}"
+        print(f"{filename}: {status}, блюд {len(manager)}")
+        if handler.parse_report:
+            print(f"    {handler.parse_report.summary()}")
+
+
+def run_merge(args: argparse.Namespace, handler: MenuFileHandler, logger: ReportLogger) -> None:
+    """Объединение файлов в один"""
+    manager = load_files(handler, logger, args.files)
+    removed = dedupe(manager, args.policy) if args.dedupe else 0
+    handler.save_menu(manager.dishes, args.output)
+    print(f"{args.output}: блюд {len(manager)}, удалено повторов {removed}")
+
+
+def run_dedupe(args: argparse.Namespace, handler: MenuFileHandler, logger: ReportLogger) -> None:
+    """Удаление повторов в файле"""
+    manager = load_files(handler, logger, [args.file])
+    removed = dedupe(manager, args.policy)
+    handler.save_menu(manager.dishes, args.output)
+    print(f"{args.output}: блюд {len(manager)}, удалено повторов {removed}")
+
+
+def run_convert(args: argparse.Namespace, handler: MenuFileHandler, logger: ReportLogger) -> None:
+    """Преобразование формата по расширениям файлов"""
+    manager = load_files(handler, logger, [args.source])
+    handler.save_menu(manager.dishes, args.target)
+    print(f"{args.target}: блюд {len(manager)}")
+
+
+def run_summary(args: argparse.Namespace, handler: MenuFileHandler, logger: ReportLogger) -> None:
+    """Сводка по каждому файлу"""
+    for filename in args.files:
+        print(f"{filename}: {summarize(load_files(handler, logger, [filename]))}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Разбор аргументов командной строки"""
+    parser = argparse.ArgumentParser(description="Пакетная обработка файлов меню (.txt и снимков .menub)")
+    parser.add_argument("--engine", choices=sorted(MenuFileHandler.PARSE_ENGINES), default="fast",
+                        help="движок разбора текстовых файлов")
+    parser.add_argument("-q", "--quiet", action="store_true", help="не выводить ошибки разбора строк")
+    parser.add_argument("--metrics", action="store_true", help="вывести в stderr метрики загрузки и сохранения (JSON)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    validate = commands.add_parser("validate", help="проверить файлы")
+    validate.add_argument("files", nargs="+")
+    validate.set_defaults(run=run_validate)
+
+    merge = commands.add_parser("merge", help="объединить файлы в один")
+    merge.add_argument("files", nargs="+")
+    merge.add_argument("-o", "--output", required=True)
+    merge.add_argument("--dedupe", action="store_true", help="удалить повторы по названию")
+    merge.add_argument("--policy", choices=UPSERT_POLICIES, default="keep_first",
+                       help="какое блюдо с названием оставить при --dedupe")
+    merge.set_defaults(run=run_merge)
+
+    dedupe_command = commands.add_parser("dedupe", help="удалить повторы по названию")
+    dedupe_command.add_argument("file")
+    dedupe_command.add_argument("-o", "--output", required=True)
+    dedupe_command.add_argument("--policy", choices=UPSERT_POLICIES, default="keep_first",
+                                help="какое блюдо с названием оставить")
+    dedupe_command.set_defaults(run=run_dedupe)
+
+    convert = commands.add_parser("convert", help="преобразовать формат (по расширению, .menub — снимок)")
+    convert.add_argument("source")
+    convert.add_argument("target")
+    convert.set_defaults(run=run_convert)
+
+    summary = commands.add_parser("summary", help="вывести сводку по файлам")
+    summary.add_argument("files", nargs="+")
+    summary.set_defaults(run=run_summary)
+    return parser
+
+
+def main(argv: Sequence[str]|None = None) -> int:
+    """
+    Точка входа командной строки
+
+    Args:
+        argv (Sequence[str]|None): Аргументы (по умолчанию sys.argv[1:])
+
+    Returns:
+        int: Код возврата: 0 — без ошибок, 1 — были ошибки разбора или чтения
+    """
+    args = build_parser().parse_args(argv)
+    logger = ReportLogger(args.quiet)
+    metrics = MenuMetrics() if args.metrics else None
+    args.run(args, MenuFileHandler(logger, engine=args.engine, metrics=metrics), logger)
+    if metrics is not None:
+        print(json.dumps(metrics.snapshot(), ensure_ascii=False, indent=2), file=sys.stderr)
+    return 1 if logger.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,21 +2,56 @@ import unittest
 import sys
 import os
 import datetime
+import gzip
+import io
+import pickle
+import shutil
+import sqlite3
+import subprocess
+import tempfile
+import threading
+import time
+from array import array
 from unittest.mock import patch, MagicMock
-from PyQt6.QtWidgets import QApplication, QMessageBox
-from PyQt6.QtCore import QTime, Qt
+from PyQt6.QtWidgets import QApplication, QMessageBox, QTableView
+from PyQt6.QtCore import QItemSelectionModel, QPersistentModelIndex, QTime, Qt
 from Dish import Dish
 from DishBase import DishBase
+from ColumnarDishStore import ColumnarDishStore
+from MenuBinaryFormat import MenuBinaryFormat
+from MenuBranchLoadWorker import MenuBranchLoadWorker
+from FileRowSource import FileRowSource
+from ManagerRowSource import ManagerRowSource
+from MenuDatabase import MenuDatabase
+from MenuFileHandler import write_atomic
+from MenuIndex import MenuIndex
+from MenuJournal import MenuJournal
+from MenuMetrics import MenuMetrics
+from ReadWriteLock import ReadWriteLock
+from SqliteDishStore import SqliteDishStore
+from SqliteRowSource import SqliteRowSource
+from MenuParser import FastMenuParser, MenuParser
+import cli
 from main import (
+    Logger,
+    MenuListener,
     MenuManager,
     MenuTableModel,
+    MenuPagedTableModel,
+    MenuFilterProxyModel,
     MenuFormManager,
     MenuFileHandler,
-    MenuWindow
+    MenuWindow,
+    MenuWriteQueue
 )
 
 app = QApplication(sys.argv)
 
+def temp_files_of(path):
+    """Оставшиеся временные файлы атомарной записи файла path"""
+    directory, name = os.path.split(os.path.abspath(path))
+    return [other for other in os.listdir(directory) if other.startswith(name + ".") and other.endswith(".tmp")]
+
 class TestDish(unittest.TestCase):
     def setUp(self):
         """Подготовка тестового окружения"""
@@ -26,6 +61,94 @@ class TestDish(unittest.TestCase):
         """Тестирование строкового представления блюда"""
         self.assertEqual(str(self.sample_dish), "Паста Карбонара,450.0,00:20")
 
+class TestLogger(unittest.TestCase):
+    def setUp(self):
+        """Подготовка тестового окружения"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.log_dir = os.path.join(self.temp_dir.name, "logs")
+
+    def tearDown(self):
+        """Очистка после тестов"""
+        self.temp_dir.cleanup()
+
+    def read_log(self, filename="test.log"):
+        """Чтение строк лог-файла"""
+        with open(os.path.join(self.log_dir, filename), encoding='utf-8') as file:
+            return file.readlines()
+
+    def test_flush_writes_all_messages(self):
+        """Тестирование записи всех сообщений при сбросе"""
+        logger = Logger(self.log_dir, flush_count=10_000, flush_interval=60.0)
+        for i in range(100):
+            logger.log_message("ОШИБКА", f"сообщение {i}", "test.log")
+        logger.flush()
+        lines = self.read_log()
+        self.assertEqual(len(lines), 100)
+        self.assertTrue(lines[-1].endswith("ОШИБКА сообщение 99\n"))
+        logger.close()
+
+    def test_interval_flush(self):
+        """Тестирование записи по истечении интервала"""
+        logger = Logger(self.log_dir, flush_count=10_000, flush_interval=0.05)
+        logger.log_message("ПРЕДУПРЕЖДЕНИЕ", "сообщение", "test.log")
+        deadline = time.monotonic() + 5
+        while not os.path.exists(os.path.join(self.log_dir, "test.log")) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(len(self.read_log()), 1)
+        logger.close()
+
+    def test_close_flushes(self):
+        """Тестирование записи оставшихся сообщений при закрытии"""
+        logger = Logger(self.log_dir, flush_count=10_000, flush_interval=60.0)
+        logger.log_message("ОШИБКА", "сообщение", "test.log")
+        logger.close()
+        self.assertEqual(len(self.read_log()), 1)
+
+    def test_default_filename_is_current_date(self):
+        """Тестирование имени лог-файла по текущей дате"""
+        logger = Logger(self.log_dir)
+        logger.log_message("ОШИБКА", "сообщение")
+        logger.close()
+        self.assertEqual(len(self.read_log(f"{datetime.date.today().strftime('%d-%m-%Y')}.log")), 1)
+
+    def test_size_rotation(self):
+        """Тестирование ротации по размеру со сжатием и ограничением числа копий"""
+        logger = Logger(self.log_dir, flush_count=1, max_bytes=300, backup_count=2, compress=True)
+        for i in range(50):
+            logger.log_message("ОШИБКА", f"сообщение {i}", "test.log")
+        logger.close()
+        self.assertEqual(sorted(os.listdir(self.log_dir)), ["test.log", "test.log.1.gz", "test.log.2.gz"])
+        self.assertLessEqual(os.path.getsize(os.path.join(self.log_dir, "test.log")), 300)
+        with gzip.open(os.path.join(self.log_dir, "test.log.1.gz"), "rt", encoding='utf-8') as file:
+            self.assertIn("ОШИБКА", file.read())
+
+    def test_retention_and_compression(self):
+        """Тестирование удаления старых и сжатия прошлых лог-файлов"""
+        os.makedirs(self.log_dir)
+        yesterday = (datetime.date.today() - datetime.timedelta(days=1)).strftime('%d-%m-%Y')
+        for filename in ("01-01-2000.log", "01-01-2000.log.1.gz", f"{yesterday}.log", "other.log"):
+            with open(os.path.join(self.log_dir, filename), "w", encoding='utf-8') as file:
+                file.write("старое сообщение\n")
+        logger = Logger(self.log_dir, retention_days=30, compress=True)
+        logger.log_message("ОШИБКА", "сообщение", "test.log")
+        logger.close()
+        self.assertEqual(sorted(os.listdir(self.log_dir)), sorted([f"{yesterday}.log.gz", "other.log", "test.log"]))
+
+    def test_write_error_keeps_writer(self):
+        """Тестирование продолжения записи после удаления папки логов"""
+        logger = Logger(self.log_dir, flush_count=10_000, flush_interval=60.0)
+        logger.log_message("ОШИБКА", "сообщение 1", "test.log")
+        self.assertTrue(logger.flush())
+        shutil.rmtree(self.log_dir)
+        with patch('sys.stderr', new_callable=io.StringIO), patch('os.makedirs', side_effect=OSError("нет доступа")):
+            logger.log_message("ОШИБКА", "сообщение 2", "test.log")
+            self.assertTrue(logger.flush())
+        logger.log_message("ОШИБКА", "сообщение 3", "test.log")
+        self.assertTrue(logger.flush())
+        logger.close()
+        self.assertEqual(len(self.read_log()), 1)
+        self.assertTrue(self.read_log()[0].endswith("сообщение 3\n"))
+
 class TestMenuManager(unittest.TestCase):
     def setUp(self):
         """Подготовка тестового окружения"""
@@ -57,6 +180,239 @@ class TestMenuManager(unittest.TestCase):
         self.assertEqual(len(dishes), 1)
         self.assertEqual(dishes[0].name, "Паста Карбонара")
 
+    def test_view_without_copy(self):
+        """Тестирование представления меню без копирования"""
+        view = self.manager.view()
+        self.assertEqual(len(view), 0)
+        self.manager.add_dish(self.sample_dish)
+        self.assertEqual(len(view), 1)
+        self.assertIs(view[0], self.sample_dish)
+        self.assertIs(self.manager.dish_at(0), self.sample_dish)
+
+    def test_version_counter(self):
+        """Тестирование счётчика версий меню"""
+        version = self.manager.version
+        self.manager.add_dish(self.sample_dish)
+        self.manager.delete_dish(0)
+        self.manager.delete_dish(0)
+        self.manager.clear_menu()
+        self.assertEqual(self.manager.version, version + 3)
+
+    def test_listener_notifications(self):
+        """Тестирование оповещений наблюдателей об изменениях"""
+        listener = MagicMock(spec=MenuListener)
+        self.manager.add_listener(listener)
+        self.manager.add_dishes([self.sample_dish] * 3)
+        listener.rows_about_to_be_inserted.assert_called_once_with(0, 2)
+        listener.rows_inserted.assert_called_once_with(0, 2)
+        self.manager.delete_dish(1)
+        listener.rows_removed.assert_called_once_with([1])
+        self.manager.clear_menu()
+        listener.menu_reset.assert_called_once()
+        self.assertEqual(len(self.manager), 0)
+
+    def test_stable_ids(self):
+        """Тестирование постоянных идентификаторов блюд"""
+        ids = self.manager.add_dishes(Dish(f"Блюдо {i}", 100.0 + i, datetime.time(0, i)) for i in range(5))
+        self.manager.delete_dish(1)
+        self.assertEqual(self.manager.dish_id(1), ids[2])
+        self.assertEqual(self.manager.dish_by_id(ids[4]).name, "Блюдо 4")
+        with self.assertRaises(KeyError):
+            self.manager.dish_by_id(ids[1])
+
+    def test_delete_many(self):
+        """Тестирование удаления блюд по идентификаторам"""
+        ids = self.manager.add_dishes(Dish(f"Блюдо {i}", 100.0 + i, datetime.time(0, i)) for i in range(5))
+        self.assertEqual(self.manager.delete_many([ids[0], ids[3], ids[3], -1]), 2)
+        self.assertEqual([dish.name for dish in self.manager.dishes], ["Блюдо 1", "Блюдо 2", "Блюдо 4"])
+        self.assertEqual(self.manager.index.search("Блюдо"), [1, 2, 4])
+        self.assertEqual(len(self.manager.storage), 5)
+
+    def test_compact(self):
+        """Тестирование уплотнения хранилища после удаления"""
+        listener = MagicMock(spec=MenuListener)
+        self.manager.add_listener(listener)
+        ids = self.manager.add_dishes(Dish(f"Блюдо {i}", 100.0 + i, datetime.time(0, i)) for i in range(5))
+        self.manager.delete_many([ids[1], ids[2]])
+        self.manager.compact()
+        listener.menu_compacted.assert_called_once_with(array('q', [0, 3, 4]))
+        self.assertEqual(len(self.manager.storage), 3)
+        self.assertEqual(self.manager.slot_of(ids[3]), 1)
+        self.assertEqual(self.manager.dish_by_id(ids[4]).name, "Блюдо 4")
+        self.assertEqual(self.manager.index.search("Блюдо 3"), [1])
+
+    def test_upsert_policies(self):
+        """Тестирование добавления без повторов названий по правилам"""
+        batch = [Dish("Борщ", 300.0, datetime.time(0, 40)), Dish("борщ", 250.0, datetime.time(0, 30)),
+                 Dish("Ёжики", 200.0, datetime.time(0, 25))]
+        expected = {
+            "keep_first": ["Паста Карбонара,450.0", "Борщ,300.0", "Ёжики,200.0"],
+            "keep_last": ["Паста Карбонара,450.0", "борщ,250.0", "ежики,180.0"],
+            "min_price": ["Паста Карбонара,450.0", "борщ,250.0", "ежики,180.0"],
+        }
+        for policy, dishes in expected.items():
+            manager = MenuManager()
+            manager.add_dish(self.sample_dish)
+            self.assertEqual(manager.upsert_many(batch, policy), (2, 0))
+            dish_id = manager.upsert_dish(Dish("ежики", 180.0, datetime.time(0, 20)), policy)
+            self.assertEqual(manager.dish_by_id(dish_id).name, dishes[2].split(",")[0])
+            self.assertEqual([str(dish).rsplit(",", 1)[0] for dish in manager.dishes], dishes)
+        with self.assertRaises(ValueError):
+            self.manager.upsert_many(batch, "keep_best")
+
+    def test_name_index_updates(self):
+        """Тестирование хеш-индекса названий при добавлении, удалении и уплотнении"""
+        ids = self.manager.add_dishes([self.sample_dish, Dish("Борщ", 300.0, datetime.time(0, 40)),
+                                       Dish("паста карбонара", 400.0, datetime.time(0, 25))])
+        self.assertEqual(self.manager.names.get("ПАСТА карбонара"), ids[0])
+        self.assertTrue(self.manager.names.has_duplicates())
+        self.manager.delete_many([ids[0]])
+        self.assertEqual(self.manager.names.get("Паста Карбонара"), ids[2])
+        self.manager.compact()
+        self.assertEqual(self.manager.upsert_many([Dish("Борщ", 350.0, datetime.time(0, 40))], "keep_first"), (0, 0))
+        self.manager.delete_many([ids[1]])
+        self.assertIsNone(self.manager.names.get("Борщ"))
+        self.assertEqual(len(self.manager.names), 1)
+
+    def test_name_keys_columnar(self):
+        """Тестирование ключей названий ColumnarDishStore: добавление блюда считает ключ только нового названия"""
+        manager = MenuManager(ColumnarDishStore)
+        manager.add_dishes(Dish(f"Блюдо {i}", 100.0, datetime.time(0, 10)) for i in range(1000))
+        self.assertEqual(len(manager.names), 1000)
+        with patch.object(MenuIndex, "name_key", wraps=MenuIndex.name_key) as name_key:
+            for i in range(1000, 1100):
+                manager.upsert_dish(Dish(f"Блюдо {i}", 200.0, datetime.time(0, 10)))
+            manager.delete_dish(0)
+            manager.use_storage(ColumnarDishStore([Dish("Борщ", 300.0, datetime.time(0, 40))]))
+            self.assertEqual(manager.names.get("борщ"), manager.dish_id(0))
+        self.assertLess(name_key.call_count, 500)
+
+    def test_dedupe(self):
+        """Тестирование удаления повторов названий за один проход"""
+        self.manager.add_dishes([self.sample_dish, Dish("Борщ", 300.0, datetime.time(0, 40)),
+                                 Dish("паста карбонара", 400.0, datetime.time(0, 25)),
+                                 Dish("Паста карбонара", 500.0, datetime.time(0, 30))])
+        self.assertEqual(self.manager.dedupe("min_price"), 2)
+        self.assertEqual([dish.name for dish in self.manager.dishes], ["Борщ", "паста карбонара"])
+        self.assertFalse(self.manager.names.has_duplicates())
+        self.assertEqual(self.manager.dedupe(), 0)
+
+class TestMenuManagerThreads(unittest.TestCase):
+    WRITERS = 4
+    BATCHES = 50
+
+    def setUp(self):
+        """Подготовка тестового окружения"""
+        self.manager = MenuManager()
+        self.dishes = [Dish(f"Блюдо {i}", 100.0 + i, datetime.time(0, i % 60)) for i in range(10)]
+
+    def run_writers(self, write):
+        """Запуск потоков-писателей и ожидание их завершения"""
+        threads = [threading.Thread(target=write, args=(number,)) for number in range(self.WRITERS)]
+        for thread in threads:
+            thread.start()
+        return threads
+
+    def test_lock_reentrancy(self):
+        """Тестирование повторного входа и запрета повышения чтения до записи"""
+        lock = ReadWriteLock()
+        with lock.write(), lock.write(), lock.read():
+            pass
+        with lock.read(), lock.read():
+            with self.assertRaises(RuntimeError):
+                lock.acquire_write()
+
+    def test_concurrent_writers_and_readers(self):
+        """Тестирование одновременных писателей, транзакций и согласованного чтения"""
+        inconsistent = []
+        done = threading.Event()
+
+        def write(number):
+            for _ in range(self.BATCHES):
+                with self.manager.transaction():
+                    ids = self.manager.add_dishes(self.dishes)
+                    self.manager.delete_many(ids[:5])
+
+        def read():
+            while not done.is_set():
+                with self.manager.read():
+                    count = len(self.manager)
+                    if count % 5 or len(list(self.manager.view())) != count:
+                        inconsistent.append(count)
+
+        readers = [threading.Thread(target=read) for _ in range(2)]
+        for reader in readers:
+            reader.start()
+        for writer in self.run_writers(write):
+            writer.join()
+        done.set()
+        for reader in readers:
+            reader.join()
+        self.assertEqual(inconsistent, [])
+        self.assertEqual(len(self.manager), self.WRITERS * self.BATCHES * 5)
+        self.assertEqual(len(self.manager.index.search_text("Блюдо 7")), self.WRITERS * self.BATCHES)
+
+    def test_write_queue_with_table_model(self):
+        """Тестирование изменений из фоновых потоков через очередь при чтении модели таблицы"""
+        model = MenuTableModel(self.manager)
+        queue = MenuWriteQueue(self.manager)
+        applied = []
+        queue.applied.connect(lambda: applied.append(True))
+
+        def write(number):
+            for _ in range(self.BATCHES):
+                queue.add_dishes(self.dishes)
+                queue.submit(lambda manager: manager.delete_many([manager.dish_id(0)]))
+
+        writers = self.run_writers(write)
+        while len(applied) < self.WRITERS * self.BATCHES * 2:
+            app.processEvents()
+            for row in range(0, model.rowCount(), 7):
+                self.assertIsNotNone(model.data(model.index(row, 1)))
+        for writer in writers:
+            writer.join()
+        self.assertEqual(model.rowCount(), len(self.manager))
+        self.assertEqual(len(self.manager), self.WRITERS * self.BATCHES * 9)
+        self.assertEqual([model.data(model.index(row, 0)) for row in range(model.rowCount())],
+                         [dish.name for dish in self.manager.dishes])
+
+class TestMenuIndex(unittest.TestCase):
+    def setUp(self):
+        """Подготовка тестового окружения"""
+        self.manager = MenuManager()
+        self.manager.add_dishes([
+            Dish("Паста Карбонара", 450.0, datetime.time(0, 20)),
+            Dish("Пицца Маргарита", 600.0, datetime.time(0, 30)),
+            Dish("паста болоньезе", 520.0, datetime.time(0, 25)),
+            Dish("Ёжики в томате", 300.0, datetime.time(0, 40)),
+        ])
+
+    def test_search_text(self):
+        """Тестирование поиска по подстроке названия и условиям"""
+        index = self.manager.index
+        self.assertEqual(index.search_text("ПАСТА"), [0, 2])
+        self.assertEqual(index.search_text("паста цена<500"), [0])
+        self.assertEqual(index.search_text("цена>=520"), [1, 2])
+        self.assertEqual(index.search_text("время<=0:25 а"), [0, 2])
+        self.assertEqual(index.search_text("ежики"), [3])
+        self.assertEqual(index.search_text("суп"), [])
+        self.assertIsNone(index.search_text("  "))
+
+    def test_prefix_search(self):
+        """Тестирование поиска по префиксу названия"""
+        self.assertEqual(self.manager.index.search("пи", prefix=True), [1])
+
+    def test_index_follows_changes(self):
+        """Тестирование обновления индекса при добавлении, удалении и очистке"""
+        index = self.manager.index
+        self.assertEqual(index.search_text("паста"), [0, 2])
+        self.manager.add_dish(Dish("Паста с грибами", 400.0, datetime.time(0, 15)))
+        self.assertEqual(index.search_text("паста"), [0, 2, 4])
+        self.manager.delete_dish(0)
+        self.assertEqual(index.search_text("паста"), [2, 4])
+        self.manager.clear_menu()
+        self.assertEqual(index.search_text("паста"), [])
+
 class TestMenuTableModel(unittest.TestCase):
     def setUp(self):
         """Подготовка тестового окружения"""
@@ -70,6 +426,51 @@ class TestMenuTableModel(unittest.TestCase):
         self.manager.add_dish(self.sample_dish)
         self.assertEqual(self.model.rowCount(), 1)
 
+    def test_bulk_insert_single_signal(self):
+        """Тестирование пакетной вставки с одним сигналом модели"""
+        inserted = []
+        self.model.rowsInserted.connect(lambda parent, first, last: inserted.append((first, last)))
+        self.manager.add_dishes([self.sample_dish] * 1000)
+        self.assertEqual(inserted, [(0, 999)])
+        self.assertEqual(self.model.rowCount(), 1000)
+
+    def test_replace_menu_resets_model(self):
+        """Тестирование сброса модели при замене меню"""
+        resets = []
+        self.model.modelReset.connect(lambda: resets.append(True))
+        self.manager.replace_menu([self.sample_dish] * 10)
+        self.assertEqual(resets, [True])
+        self.assertEqual(self.model.rowCount(), 10)
+
+    def test_display_cache(self):
+        """Тестирование кэша отформатированных ячеек и его сброса при удалении"""
+        self.manager.add_dishes([self.sample_dish, Dish("Салат Цезарь", 350.5, datetime.time(1, 5))])
+        index = self.model.index(1, 1)
+        with patch.object(self.manager, 'dish_in_slot', wraps=self.manager.dish_in_slot) as dish_in_slot:
+            self.assertEqual(self.model.data(index), "350.50")
+            self.assertEqual(self.model.data(index), "350.50")
+            self.assertEqual(dish_in_slot.call_count, 1)
+        self.manager.delete_dish(0)
+        self.assertNotIn((self.manager.dish_id(0), 1), self.model._display_cache)
+        self.assertEqual(self.model.data(self.model.index(0, 2)), "01:05")
+
+    def test_display_cache_is_bounded(self):
+        """Тестирование вытеснения давно не использованных ячеек"""
+        self.manager.add_dishes([self.sample_dish] * 20)
+        self.model.DISPLAY_CACHE_SIZE = 5
+        for row in range(20):
+            self.model.data(self.model.index(row, 0))
+        self.assertEqual(len(self.model._display_cache), 5)
+        self.assertIn((self.manager.dish_id(19), 0), self.model._display_cache)
+
+    def test_sort_and_raw_roles(self):
+        """Тестирование ролей ключа сортировки и значения без форматирования"""
+        self.manager.add_dish(Dish("Ёжики", 120.0, datetime.time(0, 45)))
+        self.assertEqual(self.model.data(self.model.index(0, 0), MenuTableModel.SORT_ROLE), "ежики")
+        self.assertEqual(self.model.data(self.model.index(0, 2), MenuTableModel.SORT_ROLE), 45)
+        self.assertEqual(self.model.data(self.model.index(0, 1), MenuTableModel.RAW_ROLE), 120.0)
+        self.assertEqual(self.model.data(self.model.index(0, 2), MenuTableModel.RAW_ROLE), datetime.time(0, 45))
+
     def test_column_count(self):
         """Тестирование количества столбцов"""
         self.assertEqual(self.model.columnCount(), 3)
@@ -86,12 +487,187 @@ class TestMenuTableModel(unittest.TestCase):
         index = self.model.index(0, 2)
         self.assertEqual(self.model.data(index), "00:20")
 
+    def column(self, column):
+        """Значения столбца в порядке строк таблицы"""
+        return [self.model.data(self.model.index(row, column)) for row in range(self.model.rowCount())]
+
+    def test_sort_by_name(self):
+        """Тестирование сортировки по названию без учёта регистра и «ё»"""
+        self.manager.add_dishes([
+            Dish("щи", 200.0, datetime.time(0, 40)),
+            Dish("Ёжики", 300.0, datetime.time(0, 30)),
+            Dish("Борщ", 350.0, datetime.time(1, 0)),
+            Dish("Жаркое", 500.0, datetime.time(0, 50)),
+        ])
+        self.model.sort(0)
+        self.assertEqual(self.column(0), ["Борщ", "Ёжики", "Жаркое", "щи"])
+        self.model.sort(0, Qt.SortOrder.DescendingOrder)
+        self.assertEqual(self.column(0), ["щи", "Жаркое", "Ёжики", "Борщ"])
+        self.model.sort(-1)
+        self.assertEqual(self.column(0), ["щи", "Ёжики", "Борщ", "Жаркое"])
+
+    def test_sort_keeps_persistent_index(self):
+        """Тестирование переноса сохранённых индексов при сортировке"""
+        self.manager.add_dishes([Dish("Б", 2.0, datetime.time(0, 2)), Dish("А", 1.0, datetime.time(0, 1))])
+        persistent = QPersistentModelIndex(self.model.index(0, 1))
+        self.model.sort(1)
+        self.assertEqual(persistent.row(), 1)
+        self.assertEqual(self.model.slot_at(persistent.row()), 0)
+
+    def test_sorted_insert_and_delete(self):
+        """Тестирование вставки и удаления в отсортированной таблице без пересортировки"""
+        self.manager.add_dishes([Dish(f"Блюдо {i}", float(i), datetime.time(0, i)) for i in (10, 30, 20)])
+        self.model.sort(2, Qt.SortOrder.DescendingOrder)
+        inserted = []
+        self.model.rowsInserted.connect(lambda parent, first, last: inserted.append((first, last)))
+        self.manager.add_dish(Dish("Новое", 1.0, datetime.time(0, 25)))
+        self.assertEqual(inserted, [(1, 1)])
+        self.assertEqual(self.column(2), ["00:30", "00:25", "00:20", "00:10"])
+
+        removed = []
+        self.model.rowsRemoved.connect(lambda parent, first, last: removed.append((first, last)))
+        self.manager.delete_dish(1)
+        self.assertEqual(removed, [(0, 0)])
+        self.assertEqual(self.column(2), ["00:25", "00:20", "00:10"])
+        self.assertEqual([self.model.slot_at(row) for row in range(3)], [3, 2, 0])
+
+    def test_delete_many_contiguous(self):
+        """Тестирование удаления непрерывного участка одним сигналом"""
+        ids = self.manager.add_dishes([self.sample_dish] * 10)
+        removed = []
+        self.model.rowsRemoved.connect(lambda parent, first, last: removed.append((first, last)))
+        self.manager.delete_many(ids[2:8])
+        self.assertEqual(removed, [(2, 7)])
+        self.assertEqual(self.model.rowCount(), 4)
+        self.assertEqual([self.model.slot_at(row) for row in range(4)], [0, 1, 8, 9])
+
     def test_header_data(self):
         """Тестирование заголовков таблицы"""
         self.assertEqual(self.model.headerData(0, Qt.Orientation.Horizontal), "Название")
         self.assertEqual(self.model.headerData(1, Qt.Orientation.Horizontal), "Цена")
         self.assertEqual(self.model.headerData(2, Qt.Orientation.Horizontal), "Время приготовления")
 
+class TestMenuPagedTableModel(unittest.TestCase):
+    def setUp(self):
+        """Подготовка тестового окружения"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.dishes = [Dish(f"Блюдо {i}", 100.0 + i, datetime.time(0, i % 60)) for i in range(25)]
+        self.page_size = patch.object(MenuPagedTableModel, "PAGE_SIZE", 10)
+        self.page_size.start()
+
+    def tearDown(self):
+        """Очистка после тестов"""
+        self.page_size.stop()
+        self.temp_dir.cleanup()
+
+    def check_model(self, source, dishes):
+        """Подгрузка страниц модели и сверка всех строк с блюдами"""
+        model = MenuPagedTableModel(source)
+        self.assertEqual(model.rowCount(), 0)
+        self.assertTrue(model.canFetchMore())
+        model.fetchMore()
+        self.assertEqual(model.rowCount(), 10)
+        model.fetch_until(len(dishes))
+        self.assertEqual(model.rowCount(), len(dishes))
+        self.assertFalse(model.canFetchMore())
+        self.assertEqual([str(model.dish_at(row)) for row in range(model.rowCount())], [str(dish) for dish in dishes])
+        self.assertEqual(model.data(model.index(1, 1)), f"{dishes[1].price:.2f}")
+        self.assertEqual(model.data(model.index(1, 0), MenuTableModel.RAW_ROLE), dishes[1].name)
+        source.close()
+
+    def test_manager_source(self):
+        """Тестирование источника строк из MenuManager"""
+        manager = MenuManager()
+        manager.add_dishes(self.dishes)
+        manager.delete_dish(3)
+        self.check_model(ManagerRowSource(manager), manager.get_menu())
+
+    def test_file_source(self):
+        """Тестирование источника строк из файла: индекс строится по мере подгрузки"""
+        filename = os.path.join(self.temp_dir.name, "menu.txt")
+        with open(filename, 'w', encoding='utf-8') as file:
+            file.writelines(f"{dish}\n" for dish in self.dishes[:5])
+            file.write("Ошибка,-1,00:20\n")
+            file.writelines(f"{dish}\n" for dish in self.dishes[5:])
+        source = FileRowSource(filename)
+        self.assertFalse(source.store.fully_indexed)
+        self.check_model(source, self.dishes)
+
+    def test_sqlite_source(self):
+        """Тестирование источника строк из базы SQLite с пропусками в идентификаторах"""
+        database = MenuDatabase(os.path.join(self.temp_dir.name, "menu.db"))
+        database.insert_many(self.dishes)
+        with database.connection:
+            database.connection.execute("DELETE FROM dishes WHERE id % 4 = 0")
+        self.check_model(SqliteRowSource(database), [dish for i, dish in enumerate(self.dishes) if (i + 1) % 4])
+
+    def test_page_cache_is_bounded(self):
+        """Тестирование ограничения числа прочитанных страниц в памяти"""
+        manager = MenuManager()
+        manager.add_dishes(self.dishes)
+        model = MenuPagedTableModel(ManagerRowSource(manager))
+        model.fetch_until(len(self.dishes))
+        with patch.object(MenuPagedTableModel, "CACHED_PAGES", 2):
+            for row in range(0, len(self.dishes), 10):
+                model.dish_at(row)
+            self.assertEqual(list(model._pages), [1, 2])
+
+class TestMenuFilterProxyModel(unittest.TestCase):
+    def setUp(self):
+        """Подготовка тестового окружения"""
+        self.manager = MenuManager()
+        self.model = MenuTableModel(self.manager)
+        self.proxy = MenuFilterProxyModel(self.manager)
+        self.proxy.setSourceModel(self.model)
+        self.manager.add_dishes([
+            Dish("Паста Карбонара", 450.0, datetime.time(0, 20)),
+            Dish("Пицца Маргарита", 600.0, datetime.time(0, 30)),
+            Dish("Паста Болоньезе", 520.0, datetime.time(0, 25)),
+        ])
+
+    def names(self):
+        """Названия блюд, видимых через прокси-модель"""
+        return [self.proxy.data(self.proxy.index(row, 0)) for row in range(self.proxy.rowCount())]
+
+    def test_without_query(self):
+        """Тестирование прозрачной работы без запроса"""
+        self.assertEqual(self.proxy.rowCount(), 3)
+        self.assertEqual(self.proxy.data(self.proxy.index(1, 1)), "600.00")
+
+    def test_query_and_mapping(self):
+        """Тестирование фильтрации и преобразования индексов"""
+        self.proxy.set_query("паста цена>500")
+        self.assertEqual(self.names(), ["Паста Болоньезе"])
+        self.assertEqual(self.proxy.mapToSource(self.proxy.index(0, 0)).row(), 2)
+        self.assertFalse(self.proxy.mapFromSource(self.model.index(0, 0)).isValid())
+
+    def test_query_follows_changes(self):
+        """Тестирование обновления результата при изменении меню"""
+        self.proxy.set_query("паста")
+        self.manager.add_dish(Dish("Паста с грибами", 400.0, datetime.time(0, 15)))
+        self.assertEqual(self.proxy.rowCount(), 3)
+        self.manager.delete_dish(0)
+        self.assertEqual(self.names(), ["Паста Болоньезе", "Паста с грибами"])
+
+    def test_changes_without_research(self):
+        """Тестирование изменений меню при активном запросе без повторного поиска по индексу"""
+        self.proxy.set_query("паста цена<500")
+        with patch.object(self.manager.index, 'search_text', wraps=self.manager.index.search_text) as search:
+            self.manager.add_dishes([Dish(f"Паста {i}", 100.0 + i * 100, datetime.time(0, 10)) for i in range(6)])
+            self.assertEqual(self.names(), ["Паста Карбонара", "Паста 0", "Паста 1", "Паста 2", "Паста 3"])
+            self.manager.delete_many([self.manager.dish_id(0), self.manager.dish_id(4)])
+            self.assertEqual(self.names(), ["Паста 0", "Паста 2", "Паста 3"])
+            self.assertEqual(self.proxy.mapToSource(self.proxy.index(0, 0)).row(), 2)
+            search.assert_not_called()
+
+    def test_sort_with_query(self):
+        """Тестирование сортировки результата поиска"""
+        self.proxy.set_query("паста")
+        self.proxy.sort(1, Qt.SortOrder.DescendingOrder)
+        self.assertEqual(self.names(), ["Паста Болоньезе", "Паста Карбонара"])
+        self.proxy.set_query("")
+        self.assertEqual(self.names(), ["Пицца Маргарита", "Паста Болоньезе", "Паста Карбонара"])
+
 class TestMenuFormManager(unittest.TestCase):
     def setUp(self):
         """Подготовка тестового окружения"""
@@ -138,6 +714,51 @@ class TestMenuFileHandler(unittest.TestCase):
         self.assertEqual(loaded_dishes[0].name, "Паста Карбонара")
         self.assertEqual(loaded_dishes[0].price, 450.0)
 
+    def test_save_menu_view_by_columns(self):
+        """Тестирование сохранения представления меню прямо из столбцов"""
+        menu_manager = MenuManager(ColumnarDishStore)
+        menu_manager.add_dishes([self.sample_dish, Dish("Салат Цезарь", 350.5, datetime.time(1, 5)),
+                                 Dish("Борщ", 300, datetime.time(0, 40))])
+        menu_manager.delete_dish(1)
+        MenuFileHandler(self.logger, fsync="full").save_menu(menu_manager.view(), self.temp_file)
+        with open(self.temp_file, encoding='utf-8') as file:
+            self.assertEqual(file.read(), "".join(f"{dish}\n" for dish in menu_manager.dishes))
+        self.assertEqual(temp_files_of(self.temp_file), [])
+
+    def test_interrupted_save_keeps_file(self):
+        """Тестирование прерванного сохранения: прежний файл не портится"""
+        file_handler = MenuFileHandler(self.logger, fsync="never")
+        file_handler.save_menu([self.sample_dish], self.temp_file)
+        broken = MagicMock()
+        broken.__str__.side_effect = OSError("Диск заполнен")
+        with self.assertRaises(OSError):
+            file_handler.save_menu([self.sample_dish, broken], self.temp_file)
+        self.assertEqual(len(file_handler.load_menu(self.temp_file)), 1)
+        self.assertEqual(temp_files_of(self.temp_file), [])
+
+    def test_concurrent_atomic_writes(self):
+        """Тестирование двух одновременных записей одного файла: временные файлы не пересекаются"""
+        with open(self.temp_file, 'w', encoding='utf-8') as file:
+            file.write("прежнее")
+        os.chmod(self.temp_file, 0o640)
+
+        def write_outer(file):
+            file.write(b"first")
+            write_atomic(self.temp_file, lambda inner: inner.write(b"second"), "never")
+            file.write(b" save")
+
+        write_atomic(self.temp_file, write_outer, "never")
+        with open(self.temp_file, 'rb') as file:
+            self.assertEqual(file.read(), b"first save")
+        self.assertEqual(temp_files_of(self.temp_file), [])
+        if os.name == "posix":
+            self.assertEqual(os.stat(self.temp_file).st_mode & 0o777, 0o640)
+
+    def test_unknown_fsync_policy(self):
+        """Тестирование неизвестной политики fsync"""
+        with self.assertRaises(ValueError):
+            MenuFileHandler(self.logger, fsync="sometimes")
+
     def test_load_empty_name(self):
         """Тестирование загрузки блюда с пустым названием"""
         file_handler = MenuFileHandler(self.logger)
@@ -165,6 +786,597 @@ class TestMenuFileHandler(unittest.TestCase):
         self.assertEqual(len(loaded_dishes), 0)
         self.logger.log_message.assert_called_once()
 
+    def test_iter_menu_batches(self):
+        """Тестирование потоковой загрузки меню пакетами"""
+        file_handler = MenuFileHandler(self.logger)
+        file_handler.save_menu([self.sample_dish] * 25, self.temp_file)
+        progress = []
+        batches = list(file_handler.iter_menu_batches(
+            self.temp_file, batch_size=10, progress=lambda done, total: progress.append((done, total))
+        ))
+        self.assertEqual([len(batch) for batch in batches], [10, 10, 5])
+        self.assertEqual(progress[-1][0], progress[-1][1])
+
+    def test_iter_menu_batches_cancel(self):
+        """Тестирование отмены потоковой загрузки"""
+        file_handler = MenuFileHandler(self.logger)
+        file_handler.save_menu([self.sample_dish] * 25, self.temp_file)
+        batches = list(file_handler.iter_menu_batches(self.temp_file, is_cancelled=lambda: True))
+        self.assertEqual(batches, [])
+
+    def write_branches(self, directory):
+        """Запись меню трёх филиалов"""
+        branches = [
+            "Паста Карбонара,450.0,00:20\nСалат Цезарь,350.0,00:15\n",
+            "паста карбонара,400.0,00:25\nОшибка,-1,00:20\n",
+            "Борщ,300.0,00:40\nСалат Цезарь,380.0,00:10\n",
+        ]
+        filenames = []
+        for number, text in enumerate(branches):
+            filenames.append(os.path.join(directory, f"branch{number}.txt"))
+            with open(filenames[-1], 'w', encoding='utf-8') as file:
+                file.write(text)
+        return filenames
+
+    def test_load_many_conflicts(self):
+        """Тестирование объединения меню филиалов по правилам для одинаковых названий"""
+        handler = MenuFileHandler(self.logger, engine="fast")
+        with tempfile.TemporaryDirectory() as directory:
+            filenames = self.write_branches(directory)
+            expected = {
+                "keep_all": ["Паста Карбонара,450.0", "Салат Цезарь,350.0", "паста карбонара,400.0",
+                             "Борщ,300.0", "Салат Цезарь,380.0"],
+                "keep_first": ["Паста Карбонара,450.0", "Салат Цезарь,350.0", "Борщ,300.0"],
+                "keep_last": ["паста карбонара,400.0", "Салат Цезарь,380.0", "Борщ,300.0"],
+                "min_price": ["паста карбонара,400.0", "Салат Цезарь,350.0", "Борщ,300.0"],
+            }
+            for conflict, dishes in expected.items():
+                store, failed = handler.load_many(filenames, conflict, workers=1)
+                self.assertEqual([str(dish).rsplit(",", 1)[0] for dish in store], dishes)
+                self.assertEqual(failed, [])
+        self.assertIn("branch1.txt: Не удалось разобрать строку 2", self.logger.log_message.call_args.args[1])
+        with self.assertRaises(ValueError):
+            handler.load_many(filenames, "keep_best")
+
+    def test_load_many_worker_crash(self):
+        """Тестирование объединения остальных файлов, когда загрузка одного падает с любой ошибкой"""
+        from concurrent.futures.process import BrokenProcessPool
+        import MenuFileHandler as file_handler_module
+        handler = MenuFileHandler(self.logger, engine="fast")
+        load_file = file_handler_module._load_file
+        errors = iter([BrokenProcessPool("процесс завершился"), RuntimeError("сбой разбора")])
+
+        def crashing(filename, *args):
+            if filename.endswith("branch1.txt"):
+                raise next(errors)
+            return load_file(filename, *args)
+
+        with tempfile.TemporaryDirectory() as directory:
+            filenames = self.write_branches(directory)
+            with patch.object(file_handler_module, "_load_file", crashing):
+                for _ in range(2):
+                    store, failed = handler.load_many(filenames, "keep_first", workers=1)
+                    self.assertEqual([dish.name for dish in store], ["Паста Карбонара", "Салат Цезарь", "Борщ"])
+                    self.assertEqual(failed, [filenames[1]])
+        messages = [call.args[1] for call in self.logger.log_message.call_args_list]
+        self.assertTrue(any("branch1.txt: сбой разбора" in message for message in messages))
+
+    def test_load_many_process_pool(self):
+        """Тестирование загрузки файлов в пуле процессов"""
+        handler = MenuFileHandler(self.logger)
+        progress = []
+        with tempfile.TemporaryDirectory() as directory:
+            filenames = self.write_branches(directory)
+            missing = os.path.join(directory, "missing.txt")
+            store, failed = handler.load_many([*filenames, missing], "keep_first", workers=2,
+                                              progress=lambda done, total: progress.append((done, total)))
+        self.assertEqual([dish.name for dish in store], ["Паста Карбонара", "Салат Цезарь", "Борщ"])
+        self.assertEqual(failed, [missing])
+        self.assertEqual(progress[-1], (4, 4))
+
+class TestMenuParser(unittest.TestCase):
+    LINES = [
+        "Паста Карбонара,450.0,00:20",
+        "  Салат Цезарь ,350,7:5  ",
+        "",
+        "Без цены,,00:20",
+        ",450.0,00:20",
+        "Бесплатно,0,00:20",
+        "Отрицательная,-450.0,00:20",
+        "Поздно,450.0,25:20",
+        "Минуты,450.0,00:60",
+        "Лишнее,поле,450.0,00:20",
+        "Мало полей,450.0",
+        "Экспонента,1e3,01:00",
+        "Длинное время,450.0,007:05",
+        "Буквы,450.0,ab:cd",
+    ]
+
+    def parse(self, parser):
+        """Разбор тестовых строк с записью ошибок"""
+        errors = []
+        raw_lines = [(line + "\n").encode('utf-8') for line in self.LINES]
+        dishes = parser.parse_chunk(raw_lines, 1, lambda number, line, e: errors.append((number, line, str(e))))
+        return [(dish.name, dish.price, dish.prep_time) for dish in dishes], errors
+
+    def test_fast_parser_matches_python_parser(self):
+        """Тестирование совпадения результатов быстрого и построчного разбора"""
+        dishes, errors = self.parse(MenuParser())
+        fast_dishes, fast_errors = self.parse(FastMenuParser())
+        self.assertEqual(fast_dishes, dishes)
+        self.assertEqual(fast_errors, errors)
+        self.assertEqual(len(dishes), 4)
+        self.assertEqual([number for number, _, _ in errors], [4, 5, 6, 7, 8, 9, 10, 11, 14])
+
+    def test_fast_engine_load(self):
+        """Тестирование загрузки файла быстрым движком"""
+        temp_file = "temp_test_file.txt"
+        logger = MagicMock()
+        try:
+            with open(temp_file, 'w', encoding='utf-8') as file:
+                file.write("\n".join(self.LINES))
+            dishes = MenuFileHandler(logger, engine="fast").load_menu(temp_file)
+        finally:
+            os.remove(temp_file)
+        self.assertEqual(len(dishes), 4)
+        self.assertEqual(logger.log_message.call_count, 9)
+        self.assertIn("строку 4", logger.log_message.call_args_list[0].args[1])
+
+    def test_error_kinds(self):
+        """Тестирование определения вида ошибки без исключений"""
+        parser = MenuParser()
+        kinds = {line: parser.read_line(line) for line in self.LINES}
+        self.assertEqual(kinds["Лишнее,поле,450.0,00:20"].kind, "fields")
+        self.assertEqual(kinds[",450.0,00:20"].kind, "name")
+        self.assertEqual(kinds["Минуты,450.0,00:60"].kind, "time")
+        self.assertEqual(kinds["Экспонента,1e3,01:00"], ("Экспонента", 1000.0, datetime.time(1, 0)))
+        errors = []
+        parser.parse_chunk([b"\xff\xfe,1,00:10\n"], 7, lambda number, line, error: errors.append((number, error.kind)))
+        self.assertEqual(errors, [(7, "encoding")])
+
+    def test_error_log_limit(self):
+        """Тестирование записи в лог только первых ошибок каждого вида и сводки"""
+        temp_file = "temp_test_file.txt"
+        logger = MagicMock()
+        try:
+            with open(temp_file, 'w', encoding='utf-8') as file:
+                file.write("Паста,-1,00:20\n" * 50 + "Паста,450.0,99:99\n" + "Паста,450.0,00:20\n")
+            handler = MenuFileHandler(logger, engine="fast", error_log_limit=3)
+            dishes = handler.load_menu(temp_file)
+        finally:
+            os.remove(temp_file)
+        self.assertEqual(len(dishes), 1)
+        self.assertEqual(handler.parse_report.counts, {"price": 50, "time": 1})
+        self.assertEqual(handler.parse_report.samples["price"][:3], [1, 2, 3])
+        self.assertEqual(logger.log_message.call_count, 5)
+        self.assertIn("цена: 50", logger.log_message.call_args.args[1])
+
+class TestColumnarDishStore(unittest.TestCase):
+    def test_extend_and_pickle(self):
+        """Тестирование добавления хранилища по столбцам и передачи между процессами"""
+        store = ColumnarDishStore([Dish("Паста Карбонара", 450.0, datetime.time(0, 20))])
+        other = ColumnarDishStore([Dish("Салат Цезарь", 350.0, datetime.time(0, 15)),
+                                   Dish("Паста Карбонара", 500.0, datetime.time(1, 5))])
+        store.extend(other)
+        copy = pickle.loads(pickle.dumps(store))
+        self.assertEqual([str(dish) for dish in copy],
+                         ["Паста Карбонара,450.0,00:20", "Салат Цезарь,350.0,00:15", "Паста Карбонара,500.0,01:05"])
+        self.assertEqual(len(copy._names), 2)
+
+    def test_columns_round_trip(self):
+        """Тестирование хранения блюд по столбцам"""
+        store = ColumnarDishStore([
+            Dish("Паста Карбонара", 450.0, datetime.time(0, 20)),
+            Dish("Паста Карбонара", 500.0, datetime.time(1, 5)),
+        ])
+        store.append(Dish("Салат Цезарь", 350.0, datetime.time(0, 15)))
+        del store[0]
+        self.assertEqual(len(store), 2)
+        self.assertIsInstance(store[0], Dish)
+        self.assertEqual(str(store[0]), "Паста Карбонара,500.0,01:05")
+        self.assertEqual(str(store[1]), "Салат Цезарь,350.0,00:15")
+        self.assertEqual(len(store._names), 2)
+
+    def test_manager_keeps_storage_type(self):
+        """Тестирование сохранения типа хранилища при замене меню"""
+        manager = MenuManager(ColumnarDishStore)
+        manager.replace_menu([Dish("Паста Карбонара", 450.0, datetime.time(0, 20))])
+        self.assertIsInstance(manager.storage, ColumnarDishStore)
+        self.assertEqual(manager.dish_at(0).name, "Паста Карбонара")
+
+    def test_dish_has_no_dict(self):
+        """Тестирование отсутствия __dict__ у блюд"""
+        self.assertFalse(hasattr(Dish("Паста Карбонара", 450.0, datetime.time(0, 20)), "__dict__"))
+
+class TestMenuBinaryFormat(unittest.TestCase):
+    def setUp(self):
+        """Подготовка тестового окружения"""
+        self.temp_file = "temp_test_file.menub"
+        self.dishes = [
+            Dish("Паста Карбонара", 450.0, datetime.time(0, 20)),
+            Dish("Салат Цезарь", 350.5, datetime.time(0, 15)),
+            Dish("Паста Карбонара", 500.0, datetime.time(23, 59)),
+        ]
+        self.file_handler = MenuFileHandler(MagicMock())
+
+    def tearDown(self):
+        """Очистка после тестов"""
+        if os.path.exists(self.temp_file):
+            os.remove(self.temp_file)
+
+    def test_save_and_load_snapshot(self):
+        """Тестирование сохранения и загрузки двоичного снимка по расширению"""
+        self.file_handler.save_menu(self.dishes, self.temp_file)
+        with open(self.temp_file, 'rb') as file:
+            self.assertEqual(file.read(8), MenuBinaryFormat.MAGIC)
+        store = self.file_handler.load_snapshot(self.temp_file)
+        self.assertIsInstance(store, ColumnarDishStore)
+        self.assertEqual([str(dish) for dish in store], [str(dish) for dish in self.dishes])
+        self.assertEqual([str(dish) for dish in self.file_handler.load_menu(self.temp_file)],
+                         [str(dish) for dish in self.dishes])
+
+    def test_empty_snapshot(self):
+        """Тестирование снимка пустого меню"""
+        self.file_handler.save_menu([], self.temp_file)
+        self.assertEqual(len(self.file_handler.load_snapshot(self.temp_file)), 0)
+
+    def test_corrupted_snapshot(self):
+        """Тестирование обнаружения повреждённого снимка"""
+        self.file_handler.save_menu(self.dishes, self.temp_file)
+        with open(self.temp_file, 'r+b') as file:
+            file.seek(-10, os.SEEK_END)
+            file.write(b"\xff")
+        with self.assertRaises(ValueError):
+            self.file_handler.load_snapshot(self.temp_file)
+        with open(self.temp_file, 'r+b') as file:
+            file.truncate(20)
+        with self.assertRaises(ValueError):
+            self.file_handler.load_snapshot(self.temp_file)
+
+class TestMappedDishStore(unittest.TestCase):
+    def setUp(self):
+        """Подготовка тестового окружения"""
+        self.temp_file = "temp_test_file.txt"
+        self.logger = MagicMock()
+        with open(self.temp_file, 'w', encoding='utf-8') as file:
+            file.write("Паста Карбонара,450.0,00:20\n\nОшибка,-1,00:20\nСалат Цезарь,350.0,00:15")
+        self.store = MenuFileHandler(self.logger, engine="fast").map_menu(self.temp_file)
+
+    def tearDown(self):
+        """Очистка после тестов"""
+        self.store.close()
+        os.remove(self.temp_file)
+
+    def test_index_and_lazy_rows(self):
+        """Тестирование индекса строк и создания блюд по обращению"""
+        self.assertEqual(len(self.store), 2)
+        self.logger.log_message.assert_called_once()
+        self.assertIn("строку 3", self.logger.log_message.call_args.args[1])
+        self.assertEqual(self.store[0].name, "Паста Карбонара")
+        self.assertEqual(self.store[-1].prep_time, datetime.time(0, 15))
+
+    def test_manager_storage(self):
+        """Тестирование MenuManager поверх отображённого файла"""
+        manager = MenuManager()
+        manager.use_storage(self.store)
+        manager.add_dish(Dish("Стейк Рибай", 1200.0, datetime.time(0, 45)))
+        manager.delete_dish(0)
+        self.assertEqual([dish.name for dish in manager.view()], ["Салат Цезарь", "Стейк Рибай"])
+
+    def test_save_over_mapped_file(self):
+        """Тестирование сохранения поверх открытого файла"""
+        MenuFileHandler(self.logger).save_menu(self.store, self.temp_file)
+        self.assertEqual(self.store[1].name, "Салат Цезарь")
+        with open(self.temp_file, encoding='utf-8') as file:
+            self.assertEqual(len(file.readlines()), 2)
+
+    def test_index_scans_file(self):
+        """Тестирование сортировки и поиска MenuIndex проходом по файлу без индекса в памяти"""
+        manager = MenuManager()
+        manager.use_storage(self.store)
+        manager.add_dish(Dish("Суп дня", 200.0, datetime.time(0, 10)))
+        manager.delete_dish(0)
+        self.assertEqual(list(manager.index.sorted_rows("price")), [2, 1])
+        self.assertEqual(list(manager.index.sorted_rows("name")), [1, 2])
+        self.assertEqual(manager.index.search_text("с цена<300"), [2])
+        self.assertEqual(manager.index.sort_key("minutes")(1), (15, 1))
+        self.assertTrue(manager.index._stale)
+
+class TestSqliteDishStore(unittest.TestCase):
+    def setUp(self):
+        """Подготовка тестового окружения"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "menu.sqlite")
+        self.dishes = [Dish(f"Блюдо {i}", 100.0 + i, datetime.time(0, i % 60)) for i in range(2500)]
+
+    def tearDown(self):
+        """Очистка после тестов"""
+        self.temp_dir.cleanup()
+
+    def test_manager_changes_persist(self):
+        """Тестирование сохранения добавлений и удалений MenuManager в базе без отдельного сохранения"""
+        manager = MenuManager()
+        manager.use_storage(SqliteDishStore(self.path))
+        manager.add_dishes(self.dishes)
+        manager.add_dish(Dish("Стейк Рибай", 1200.0, datetime.time(0, 45)))
+        manager.delete_many(range(0, 2500, 2))
+        self.assertEqual(manager.view()[0].name, "Блюдо 1")
+        manager.compact()
+        self.assertEqual(len(manager.storage), 1251)
+        manager.delete_dish(0)
+        expected = [dish.name for dish in manager.view()]
+        manager.storage.close()
+
+        store = SqliteDishStore(self.path)
+        self.assertEqual([dish.name for dish in store], expected)
+        self.assertEqual(store[-1].prep_time, datetime.time(0, 45))
+        self.assertTrue(store.database.is_compact())
+        store.close()
+
+    def test_index_queries_database(self):
+        """Тестирование сортировки и поиска MenuIndex запросами к базе без чтения блюд"""
+        in_memory = MenuManager()
+        manager = MenuManager()
+        manager.use_storage(SqliteDishStore(self.path))
+        for menu in (in_memory, manager):
+            menu.add_dishes(reversed(self.dishes))
+            menu.add_dish(Dish("Ёжики в томате", 300.0, datetime.time(0, 40)))
+            menu.delete_many(range(0, 2500, 3))
+        for field in MenuIndex.SORT_FIELDS:
+            self.assertEqual(manager.index.sorted_rows(field), in_memory.index.sorted_rows(field))
+        for query in ("ежик", "блюдо 12 цена<2000", "время>=0:50 цена<=1500", "время=7"):
+            self.assertEqual(manager.index.search_text(query), in_memory.index.search_text(query))
+        self.assertEqual(manager.index.search("блюдо 9", prefix=True), in_memory.index.search("блюдо 9", prefix=True))
+        self.assertEqual(manager.storage._pages, {})
+        manager.storage.close()
+
+    def test_read_only_open(self):
+        """Тестирование открытия базы только для чтения: чужой файл не изменяется"""
+        connection = sqlite3.connect(self.path)
+        connection.execute("CREATE TABLE orders (id INTEGER PRIMARY KEY)")
+        connection.commit()
+        connection.close()
+        with open(self.path, 'rb') as file:
+            data = file.read()
+        with self.assertRaises(ValueError):
+            MenuDatabase(self.path, read_only=True)
+        with self.assertRaises(ValueError):
+            MenuDatabase(os.path.join(self.temp_dir.name, "missing.sqlite"), read_only=True)
+        with open(self.path, 'rb') as file:
+            self.assertEqual(file.read(), data)
+        self.assertEqual(os.listdir(self.temp_dir.name), ["menu.sqlite"])
+
+        menu_path = os.path.join(self.temp_dir.name, "menu2.sqlite")
+        database = MenuDatabase(menu_path)
+        database.insert_many(self.dishes[:3])
+        database.close()
+        database = MenuDatabase(menu_path, read_only=True)
+        self.assertEqual([dish.name for dish in database.page(0, 10)], [dish.name for dish in self.dishes[:3]])
+        with self.assertRaises(sqlite3.OperationalError):
+            database.mark_removed([1])
+        database.close()
+
+    def test_find_uses_indexes(self):
+        """Тестирование поиска по индексам названия, цены и времени"""
+        database = MenuDatabase(self.path)
+        database.insert_many(self.dishes + [Dish("Ёжики в томате", 300.0, datetime.time(0, 40))])
+        self.assertEqual([dish.name for dish in database.find("ежик")], ["Ёжики в томате"])
+        self.assertEqual(len(database.find(min_price=2000.0, max_minutes=10)), 110)
+        self.assertEqual(len(database.find("блюдо 1", limit=5)), 5)
+        plan = database.connection.execute(
+            "EXPLAIN QUERY PLAN SELECT id FROM dishes WHERE name_key >= ? AND name_key < ?", ("а", "б")).fetchall()
+        self.assertIn("dishes_name_key", str(plan))
+        database.close()
+
+    def test_text_import_export(self):
+        """Тестирование переноса меню между текстовым файлом и базой"""
+        handler = MenuFileHandler(MagicMock())
+        text_path = os.path.join(self.temp_dir.name, "menu.txt")
+        handler.save_menu(self.dishes, text_path)
+        database = MenuDatabase(self.path)
+        self.assertEqual(database.import_text(handler, text_path), 2500)
+        database.mark_removed([1])
+        exported = os.path.join(self.temp_dir.name, "exported.txt")
+        database.export_text(handler, exported)
+        database.close()
+        self.assertEqual([str(dish) for dish in handler.load_menu(exported)], [str(dish) for dish in self.dishes[1:]])
+
+    def test_save_and_load_by_extension(self):
+        """Тестирование сохранения и загрузки базы через MenuFileHandler"""
+        handler = MenuFileHandler(MagicMock())
+        handler.save_menu(self.dishes[:10], self.path)
+        handler.save_menu(self.dishes[:3], self.path)
+        expected = [str(dish) for dish in self.dishes[:3]]
+        self.assertEqual([str(dish) for dish in handler.load_menu(self.path)], expected)
+        self.assertEqual([str(dish) for dish in handler.load_store(self.path)], expected)
+        self.assertEqual(temp_files_of(self.path), [])
+
+    def test_rejects_other_files(self):
+        """Тестирование отказа открывать не базу меню или базу другой версии"""
+        with open(self.path, 'w', encoding='utf-8') as file:
+            file.write("Паста Карбонара,450.0,00:20\n" * 100)
+        with self.assertRaises(ValueError):
+            MenuDatabase(self.path)
+        other = os.path.join(self.temp_dir.name, "other.db")
+        MenuDatabase(other).close()
+        connection = sqlite3.connect(other)
+        connection.execute("PRAGMA user_version = 99")
+        connection.close()
+        with self.assertRaises(ValueError):
+            MenuDatabase(other)
+
+class TestMenuJournal(unittest.TestCase):
+    def setUp(self):
+        """Подготовка тестового окружения"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "menu.menub")
+        self.menu_manager = MenuManager()
+        self.menu_manager.add_dishes([
+            Dish("Паста Карбонара", 450.0, datetime.time(0, 20)),
+            Dish("Салат Цезарь", 350.5, datetime.time(0, 15)),
+        ])
+        self.journal = MenuJournal(self.path)
+        self.journal.open(self.menu_manager)
+
+    def tearDown(self):
+        """Очистка после тестов"""
+        self.journal.close()
+        self.temp_dir.cleanup()
+
+    def reopen(self):
+        """Восстановление меню из снимка и журнала в новом менеджере"""
+        self.journal.close()
+        self.journal = MenuJournal(self.path)
+        manager = MenuManager()
+        self.journal.open(manager)
+        return [str(dish) for dish in manager.dishes]
+
+    def test_changes_are_appended(self):
+        """Тестирование дописывания изменений в журнал без перезаписи снимка"""
+        snapshot = os.path.getmtime(self.path), os.path.getsize(self.path)
+        self.menu_manager.add_dish(Dish("Борщ", 300.0, datetime.time(0, 40)))
+        size = os.path.getsize(self.journal.journal_path)
+        self.menu_manager.delete_many([self.menu_manager.dish_id(0)])
+        self.assertGreater(os.path.getsize(self.journal.journal_path), size)
+        self.assertEqual((os.path.getmtime(self.path), os.path.getsize(self.path)), snapshot)
+        self.assertEqual(self.reopen(), ["Салат Цезарь,350.5,00:15", "Борщ,300.0,00:40"])
+
+    def test_torn_record_is_ignored(self):
+        """Тестирование отбрасывания оборванной последней записи"""
+        self.menu_manager.add_dish(Dish("Борщ", 300.0, datetime.time(0, 40)))
+        self.menu_manager.add_dish(Dish("Пельмени", 380.0, datetime.time(0, 25)))
+        self.journal.close()
+        with open(self.journal.journal_path, 'r+b') as file:
+            file.truncate(os.path.getsize(self.journal.journal_path) - 3)
+        self.assertEqual(self.reopen()[-1], "Борщ,300.0,00:40")
+
+    def test_changes_after_torn_record(self):
+        """Тестирование изменений после оборванной записи: они не теряются за мусором в журнале"""
+        self.menu_manager.add_dish(Dish("Борщ", 300.0, datetime.time(0, 40)))
+        self.journal.close()
+        with open(self.journal.journal_path, 'r+b') as file:
+            file.truncate(os.path.getsize(self.journal.journal_path) - 3)
+        manager = MenuManager()
+        self.journal = MenuJournal(self.path)
+        self.journal.open(manager)
+        manager.add_dish(Dish("Пельмени", 380.0, datetime.time(0, 25)))
+        manager.add_dish(Dish("Солянка", 320.0, datetime.time(0, 30)))
+        expected = ["Паста Карбонара,450.0,00:20", "Салат Цезарь,350.5,00:15",
+                    "Пельмени,380.0,00:25", "Солянка,320.0,00:30"]
+        self.assertEqual(self.reopen(), expected)
+        self.assertEqual(self.reopen(), expected)
+
+    def test_compaction(self):
+        """Тестирование сворачивания длинного журнала в снимок"""
+        self.journal.compact_min_bytes = 0
+        self.menu_manager.add_dishes([Dish(f"Блюдо {i}", 100.0 + i, datetime.time(0, 10)) for i in range(20)])
+        self.assertEqual(os.path.getsize(self.journal.journal_path), MenuJournal.HEADER.size)
+        self.menu_manager.delete_many([self.menu_manager.dish_id(1)])
+        self.assertEqual(len(self.reopen()), 21)
+
+    def test_stale_journal_after_compaction(self):
+        """Тестирование сбоя между заменой снимка и журнала: старый журнал не применяется"""
+        self.menu_manager.add_dish(Dish("Борщ", 300.0, datetime.time(0, 40)))
+        with open(self.journal.journal_path, 'rb') as file:
+            stale = file.read()
+        self.journal.compact()
+        self.journal.close()
+        with open(self.journal.journal_path, 'wb') as file:
+            file.write(stale)
+        self.assertEqual(len(self.reopen()), 3)
+
+    def test_hold_during_load(self):
+        """Тестирование удержания журнала: замена меню пишется снимком только после release"""
+        self.journal.hold()
+        self.menu_manager.clear_menu()
+        self.menu_manager.add_dish(Dish("Борщ", 300.0, datetime.time(0, 40)))
+        self.assertEqual(self.reopen(), ["Паста Карбонара,450.0,00:20", "Салат Цезарь,350.5,00:15"])
+
+        manager = MenuManager()
+        self.journal.open(manager)
+        self.journal.hold()
+        manager.replace_menu([Dish("Борщ", 300.0, datetime.time(0, 40))])
+        self.journal.release()
+        self.assertEqual(self.reopen(), ["Борщ,300.0,00:40"])
+
+class TestMenuMetrics(unittest.TestCase):
+    def setUp(self):
+        """Подготовка тестового окружения"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.temp_dir.name, "menu.txt")
+        with open(self.filename, 'w', encoding='utf-8') as file:
+            file.write("Паста Карбонара,450.0,00:20\nОшибка,-1,00:20\nСалат Цезарь,350.0,00:15\n")
+        self.metrics = MenuMetrics()
+        self.logger = MagicMock()
+
+    def tearDown(self):
+        """Очистка после тестов"""
+        self.temp_dir.cleanup()
+
+    def test_disabled_by_default(self):
+        """Тестирование отключённого по умолчанию сбора метрик"""
+        self.assertIsNone(MenuFileHandler(self.logger).metrics)
+        self.assertIsNone(MenuManager().metrics)
+        self.assertIsNone(MenuTableModel(MenuManager()).metrics)
+
+    def test_load_save_and_manager(self):
+        """Тестирование счётчиков загрузки, сохранения и изменений меню"""
+        handler = MenuFileHandler(self.logger, engine="fast", metrics=self.metrics)
+        manager = MenuManager(ColumnarDishStore, metrics=self.metrics)
+        manager.add_dishes(handler.load_menu(self.filename))
+        manager.delete_dish(0)
+        manager.get_menu()
+        saved = os.path.join(self.temp_dir.name, "saved.txt")
+        handler.save_menu(manager.view(), saved)
+
+        snapshot = self.metrics.snapshot()
+        self.assertEqual(snapshot["counters"]["parse.lines"], 3)
+        self.assertEqual(snapshot["counters"]["parse.errors"], 1)
+        self.assertEqual(snapshot["counters"]["manager.added"], 2)
+        self.assertEqual(snapshot["counters"]["manager.deleted"], 1)
+        self.assertEqual(snapshot["counters"]["manager.copies"], 1)
+        self.assertEqual(snapshot["counters"]["file.saved_bytes"], os.path.getsize(saved))
+        self.assertEqual(snapshot["timers"]["file.load_menu"]["count"], 1)
+        self.assertEqual(snapshot["timers"]["manager.delete_many"]["count"], 1)
+        self.assertFalse(snapshot["profiling"])
+
+        self.metrics.reset()
+        self.assertEqual(self.metrics.snapshot()["counters"], {})
+
+    def test_model_data_calls(self):
+        """Тестирование счётчиков вызовов data() и промахов кэша ячеек"""
+        manager = MenuManager()
+        manager.add_dish(Dish("Паста Карбонара", 450.0, datetime.time(0, 20)))
+        model = MenuTableModel(manager, metrics=self.metrics)
+        model.data(model.index(0, 0))
+        model.data(model.index(0, 0))
+        counters = self.metrics.snapshot()["counters"]
+        self.assertEqual(counters["model.data_calls"], 2)
+        self.assertEqual(counters["model.cache_misses"], 1)
+
+    def test_profiling(self):
+        """Тестирование отчёта профилировщика и выделений памяти"""
+        self.metrics.start_profiling(memory=True)
+        self.assertTrue(self.metrics.is_profiling())
+        with self.assertRaises(RuntimeError):
+            self.metrics.start_profiling()
+        MenuFileHandler(self.logger).load_menu(self.filename)
+        report = self.metrics.stop_profiling()
+        self.assertFalse(self.metrics.is_profiling())
+        self.assertIn("load_menu", report)
+        self.assertIn("Наибольшие выделения памяти", report)
+
+    def test_window_panel(self):
+        """Тестирование панели метрик окна в режиме разработчика"""
+        self.assertIsNone(MenuWindow().metrics_panel)
+        window = MenuWindow(dev=True)
+        window.menu_manager.add_dish(Dish("Паста Карбонара", 450.0, datetime.time(0, 20)))
+        window.metrics_panel.refresh()
+        self.assertIn("manager.added: 1", window.metrics_panel.metrics_view.toPlainText())
+        window.metrics_panel.profile_button.setChecked(True)
+        window.metrics_panel.profile_button.setChecked(False)
+        self.assertIn("function calls", window.metrics_panel.profile_view.toPlainText())
+
 class TestMenuWindow(unittest.TestCase):
     def setUp(self):
         """Подготовка тестового окружения"""
@@ -207,11 +1419,23 @@ class TestMenuWindow(unittest.TestCase):
         test_dish = Dish("Паста Карбонара", 450.0, datetime.time(0, 20))
         self.window.menu_manager.add_dish(test_dish)
         self.window.table_view = MagicMock()
-        self.window.table_view.currentIndex.return_value.isValid.return_value = True
-        self.window.table_view.currentIndex.return_value.row.return_value = 0
+        self.window.table_view.currentIndex.return_value = self.window.proxy_model.index(0, 0)
         self.window.delete_dish()
         self.assertEqual(len(self.window.menu_manager.dishes), 0)
 
+    @patch.object(QMessageBox, 'question', return_value=QMessageBox.StandardButton.Yes)
+    def test_delete_selected_dishes(self, mock_question):
+        """Тестирование удаления нескольких выбранных блюд"""
+        self.window.menu_manager.add_dishes(
+            Dish(f"Блюдо {i}", 100.0 + i, datetime.time(0, i)) for i in range(6))
+        self.window.table_view.selectRow(1)
+        self.window.table_view.selectionModel().select(
+            self.window.proxy_model.index(4, 0),
+            QItemSelectionModel.SelectionFlag.Select | QItemSelectionModel.SelectionFlag.Rows)
+        self.window.delete_dish()
+        self.assertEqual([dish.name for dish in self.window.menu_manager.dishes],
+                         ["Блюдо 0", "Блюдо 2", "Блюдо 3", "Блюдо 5"])
+
     @patch.object(MenuFileHandler, 'save_menu')
     @patch('PyQt6.QtWidgets.QFileDialog.getSaveFileName', return_value=("test.txt", None))
     def test_save_menu(self, mock_dialog, mock_save):
@@ -219,24 +1443,222 @@ class TestMenuWindow(unittest.TestCase):
         self.window.save_menu()
         mock_save.assert_called_once()
 
-    @patch.object(MenuFileHandler, 'load_menu')
+    def test_open_journal(self):
+        """Тестирование журналируемого хранения меню из окна"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "menu.menub")
+            with patch('PyQt6.QtWidgets.QFileDialog.getSaveFileName', return_value=(path, None)):
+                self.window.open_journal()
+            self.window.menu_manager.add_dish(Dish("Паста Карбонара", 450.0, datetime.time(0, 20)))
+            self.window.journal.close()
+            manager = MenuManager()
+            journal = MenuJournal(path)
+            journal.open(manager)
+            journal.close()
+            self.assertEqual(manager.dishes[0].name, "Паста Карбонара")
+
+    @patch.object(MenuFileHandler, 'iter_menu_batches', side_effect=OSError("Нет файла"))
+    @patch('PyQt6.QtWidgets.QFileDialog.getOpenFileName', return_value=("missing.txt", None))
+    @patch.object(QMessageBox, 'critical')
+    def test_failed_load_keeps_journal(self, mock_critical, mock_dialog, mock_load):
+        """Тестирование неуспешной загрузки при открытом журнале: снимок не затирается"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "menu.menub")
+            self.window.menu_manager.add_dish(Dish("Паста Карбонара", 450.0, datetime.time(0, 20)))
+            with patch('PyQt6.QtWidgets.QFileDialog.getSaveFileName', return_value=(path, None)):
+                self.window.open_journal()
+            self.window.load_menu()
+            self.wait_for_load()
+            self.window.journal.close()
+            manager = MenuManager()
+            journal = MenuJournal(path)
+            journal.open(manager)
+            journal.close()
+            self.assertEqual(len(manager), 1)
+
+    def test_browse_file(self):
+        """Тестирование просмотра базы меню без загрузки в меню окна"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "menu.sqlite")
+            database = MenuDatabase(path)
+            database.insert_many([Dish("Паста Карбонара", 450.0, datetime.time(0, 20))])
+            database.close()
+            with patch('PyQt6.QtWidgets.QFileDialog.getOpenFileName', return_value=(path, None)):
+                self.window.browse_file()
+            view = self.window.findChild(QTableView, options=Qt.FindChildOption.FindDirectChildrenOnly)
+            model = view.model()
+            model.fetchMore()
+            self.assertEqual(model.data(model.index(0, 0)), "Паста Карбонара")
+            self.assertEqual(len(self.window.menu_manager), 0)
+            view.close()
+
+    @patch.object(QMessageBox, 'critical')
+    def test_browse_other_database(self, mock_critical):
+        """Тестирование просмотра базы SQLite не с меню: ошибка без изменения файла"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "orders.db")
+            connection = sqlite3.connect(path)
+            connection.execute("CREATE TABLE orders (id INTEGER PRIMARY KEY)")
+            connection.commit()
+            connection.close()
+            with open(path, 'rb') as file:
+                data = file.read()
+            with patch('PyQt6.QtWidgets.QFileDialog.getOpenFileName', return_value=(path, None)):
+                self.window.browse_file()
+            mock_critical.assert_called_once()
+            with open(path, 'rb') as file:
+                self.assertEqual(file.read(), data)
+            self.assertEqual(os.listdir(directory), ["orders.db"])
+
+    def wait_for_load(self):
+        """Ожидание завершения фоновой загрузки меню"""
+        while self.window.is_loading():
+            app.processEvents()
+
+    @patch.object(MenuFileHandler, 'iter_menu_batches')
     @patch('PyQt6.QtWidgets.QFileDialog.getOpenFileName', return_value=("test.txt", None))
     @patch.object(QMessageBox, 'information')
     def test_load_menu_success(self, mock_info, mock_dialog, mock_load):
         """Тестирование успешной загрузки меню"""
         test_dish = Dish("Паста Карбонара", 450.0, datetime.time(0, 20))
-        mock_load.return_value = [test_dish]
+        mock_load.return_value = [[test_dish], [test_dish]]
+        applied = []
+        self.window.write_queue.applied.connect(lambda: applied.append(True))
+        self.window.menu_manager.add_dish(Dish("Борщ", 300.0, datetime.time(0, 40)))
         self.window.load_menu()
-        self.assertEqual(len(self.window.menu_manager.dishes), 1)
+        self.wait_for_load()
+        self.assertEqual(len(self.window.menu_manager.dishes), 2)
+        self.assertEqual(len(applied), 2)
         mock_info.assert_called_once()
 
-    @patch.object(MenuFileHandler, 'load_menu', side_effect=Exception("Тестовая ошибка"))
+    @patch.object(MenuFileHandler, 'iter_menu_batches', side_effect=Exception("Тестовая ошибка"))
     @patch('PyQt6.QtWidgets.QFileDialog.getOpenFileName', return_value=("test.txt", None))
     @patch.object(QMessageBox, 'critical')
     def test_load_menu_failure(self, mock_critical, mock_dialog, mock_load):
-        """Тестирование неуспешной загрузки меню"""
+        """Тестирование неуспешной загрузки меню: прежнее меню остаётся"""
+        self.window.menu_manager.add_dish(Dish("Паста Карбонара", 450.0, datetime.time(0, 20)))
         self.window.load_menu()
+        self.wait_for_load()
         mock_critical.assert_called_once()
+        self.assertEqual(len(self.window.menu_manager.dishes), 1)
+
+    @patch.object(MenuFileHandler, 'load_many')
+    @patch('PyQt6.QtWidgets.QInputDialog.getItem', return_value=("Оставить последнее блюдо", True))
+    @patch('PyQt6.QtWidgets.QFileDialog.getOpenFileNames', return_value=(["a.txt", "b.txt"], None))
+    @patch.object(QMessageBox, 'information')
+    def test_load_branches(self, mock_info, mock_dialog, mock_item, mock_load):
+        """Тестирование загрузки меню филиалов"""
+        mock_load.return_value = (ColumnarDishStore([Dish("Паста Карбонара", 450.0, datetime.time(0, 20))]), [])
+        self.window.load_branches()
+        self.wait_for_load()
+        self.assertEqual(mock_load.call_args.args[:2], (["a.txt", "b.txt"], "keep_last"))
+        self.assertEqual(len(self.window.menu_manager.dishes), 1)
+        mock_info.assert_called_once()
+
+    def test_cancel_branch_load(self):
+        """Тестирование отмены загрузки меню филиалов: частично объединённое меню не заменяет прежнее"""
+        self.window.menu_manager.add_dish(Dish("Борщ", 300.0, datetime.time(0, 40)))
+        worker = MenuBranchLoadWorker(self.window.file_handler, self.window.write_queue, ["a.txt", "b.txt"])
+        finished = []
+        worker.finished.connect(finished.append)
+
+        def load_many(filenames, conflict, progress, is_cancelled):
+            worker.cancel()
+            return ColumnarDishStore([Dish("Паста Карбонара", 450.0, datetime.time(0, 20))]), []
+
+        with patch.object(self.window.file_handler, 'load_many', side_effect=load_many):
+            worker.run()
+        app.processEvents()
+        self.assertEqual(finished, [True])
+        self.assertEqual([dish.name for dish in self.window.menu_manager.dishes], ["Борщ"])
+
+class TestCli(unittest.TestCase):
+    def setUp(self):
+        """Подготовка тестового окружения"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.first = os.path.join(self.temp_dir.name, "first.txt")
+        self.second = os.path.join(self.temp_dir.name, "second.txt")
+        with open(self.first, 'w', encoding='utf-8') as file:
+            file.write("Паста Карбонара,450.0,00:20\nОшибка,-1,00:20\n")
+        with open(self.second, 'w', encoding='utf-8') as file:
+            file.write("паста карбонара,500.0,00:25\nСалат Цезарь,350.0,00:15\n")
+
+    def tearDown(self):
+        """Очистка после тестов"""
+        self.temp_dir.cleanup()
+
+    def run_cli(self, *args):
+        """Запуск командной строки с перехватом вывода"""
+        with patch('sys.stdout', new_callable=io.StringIO) as stdout, patch('sys.stderr', new_callable=io.StringIO):
+            code = cli.main(["--quiet", *args])
+        return code, stdout.getvalue()
+
+    def test_validate(self):
+        """Тестирование проверки файлов"""
+        code, output = self.run_cli("validate", self.first, self.second)
+        self.assertEqual(code, 1)
+        self.assertIn("first.txt: ошибок 1, блюд 1", output)
+        self.assertIn("second.txt: OK, блюд 2", output)
+
+    def test_load_files_by_columns(self):
+        """Тестирование загрузки файлов командной строкой по столбцам, без списка объектов блюд"""
+        with patch.object(MenuFileHandler, 'load_menu', side_effect=AssertionError("load_menu")):
+            manager = cli.load_files(MenuFileHandler(MagicMock()), cli.ReportLogger(quiet=True),
+                                     [self.first, self.second])
+        self.assertIsInstance(manager.storage, ColumnarDishStore)
+        self.assertEqual([dish.name for dish in manager.dishes], ["Паста Карбонара", "паста карбонара", "Салат Цезарь"])
+        self.assertEqual(cli.summarize(manager), "блюд 3, названий 2, цена 350.00..500.00 (средняя 433.33), "
+                                                 "время 15..25 мин (среднее 20.0)")
+
+    def test_merge_dedupe_and_convert(self):
+        """Тестирование объединения с удалением повторов и преобразования в снимок"""
+        merged = os.path.join(self.temp_dir.name, "merged.txt")
+        snapshot = os.path.join(self.temp_dir.name, "merged.menub")
+        self.run_cli("merge", self.first, self.second, "-o", merged, "--dedupe")
+        with open(merged, encoding='utf-8') as file:
+            self.assertEqual(file.read().splitlines(), ["Паста Карбонара,450.0,00:20", "Салат Цезарь,350.0,00:15"])
+        code, _ = self.run_cli("convert", merged, snapshot)
+        self.assertEqual(code, 0)
+        self.assertEqual(len(MenuFileHandler(MagicMock()).load_menu(snapshot)), 2)
+
+    def test_dedupe_policy(self):
+        """Тестирование удаления повторов с выбором оставляемого блюда"""
+        merged = os.path.join(self.temp_dir.name, "merged.txt")
+        cheapest = os.path.join(self.temp_dir.name, "cheapest.txt")
+        self.run_cli("merge", self.second, self.first, "-o", merged)
+        code, output = self.run_cli("dedupe", merged, "-o", cheapest, "--policy", "min_price")
+        self.assertEqual(code, 0)
+        self.assertIn("удалено повторов 1", output)
+        with open(cheapest, encoding='utf-8') as file:
+            self.assertEqual(file.read().splitlines(), ["Салат Цезарь,350.0,00:15", "Паста Карбонара,450.0,00:20"])
+
+    def test_summary(self):
+        """Тестирование сводки по файлу"""
+        code, output = self.run_cli("summary", self.second)
+        self.assertEqual(code, 0)
+        self.assertIn("блюд 2, названий 2, цена 350.00..500.00", output)
+
+    def test_no_qt_import(self):
+        """Тестирование работы без импорта PyQt6"""
+        check = "import sys, cli; sys.exit(any(name.startswith('PyQt6') for name in sys.modules))"
+        result = subprocess.run([sys.executable, "-c", check], cwd=os.path.dirname(os.path.abspath(cli.__file__)))
+        self.assertEqual(result.returncode, 0)
+
+class TestLazyImport(unittest.TestCase):
+    def test_core_without_qt(self):
+        """Тестирование импорта слоя данных из main без PyQt6"""
+        check = ("import sys, main; from main import Logger, MenuManager, MenuFileHandler, Dish; "
+                 "sys.exit(any(name.startswith('PyQt6') for name in sys.modules))")
+        result = subprocess.run([sys.executable, "-c", check], cwd=os.path.dirname(os.path.abspath(cli.__file__)))
+        self.assertEqual(result.returncode, 0)
+
+    def test_gui_on_demand(self):
+        """Тестирование ленивого импорта классов интерфейса"""
+        import main
+        from MenuWindow import MenuWindow as window_class
+        self.assertIs(main.MenuWindow, window_class)
+        with self.assertRaises(AttributeError):
+            main.MissingWindow
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file